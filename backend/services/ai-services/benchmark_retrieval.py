@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark for hybrid retrieval
+Builds a synthetic runbook/log corpus whose chunks carry exact tokens (error
+codes, instance IDs, CVE numbers) and compares dense, BM25, fused (RRF) and
+reranked retrieval: recall@k per retriever and latency per stage
+
+Uses the configured sentence-transformers model when installed, otherwise a
+hashed bag-of-words stand-in (dense numbers are then only indicative).
+The cross-encoder stage runs when sentence-transformers is installed.
+
+Usage: python benchmark_retrieval.py [--chunks 20000] [--queries 200] [--k 5]
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the rag directory to Python path (the indexes have no package dependencies)
+sys.path.insert(0, str(Path(__file__).parent / "src" / "rag"))
+
+from hybrid import CROSS_ENCODER_AVAILABLE, CrossEncoderReranker, reciprocal_rank_fusion  # noqa: E402
+from lexical_index import BM25Index  # noqa: E402
+from local_index import LocalVectorIndex  # noqa: E402
+
+TOPICS = {
+    "disk": ("Disk usage on the node is above the alert threshold",
+             "Free space by pruning old container images and rotating logs, then expand the volume"),
+    "memory": ("Pods are being OOMKilled and memory pressure is reported",
+               "Raise the memory limits or find the leak with a heap profile before restarting"),
+    "tls": ("Clients fail the TLS handshake because the certificate expired",
+            "Renew the certificate with the issuer and reload the ingress controller"),
+    "dns": ("Service names do not resolve and lookups time out",
+            "Check the resolver pods, the upstream forwarders and the network policy for port 53"),
+    "database": ("Database connections are exhausted and queries queue up",
+                 "Increase the pool size, kill idle sessions and look for long running transactions"),
+    "latency": ("API latency p99 regressed after the last deploy",
+                "Compare traces across versions, roll back if the regression is confirmed"),
+    "auth": ("Users are locked out after repeated failed logins",
+             "Verify the identity provider, unlock the accounts and review the brute force alerts"),
+    "cost": ("Monthly cloud spend spiked on compute instances",
+             "Find idle instances, right size them and buy reservations for the steady workload"),
+}
+
+PARAPHRASES = {
+    "disk": "node running out of storage space",
+    "memory": "containers killed for using too much RAM",
+    "tls": "expired SSL cert breaks https connections",
+    "dns": "hostname resolution failing inside the cluster",
+    "database": "too many open connections to postgres",
+    "latency": "requests got slower after release",
+    "auth": "accounts blocked by failed sign in attempts",
+    "cost": "cloud bill went up because of VMs",
+}
+
+
+def build_corpus(chunks: int, seed: int = 11):
+    """Runbook/log chunks, each tagged with one error code, one instance ID and one CVE"""
+    rng = random.Random(seed)
+    names = list(TOPICS)
+    corpus = []
+    for i in range(chunks):
+        topic = names[i % len(names)]
+        symptom, fix = TOPICS[topic]
+        error_code = f"ERR-{topic[:3].upper()}-{i:05d}"
+        instance_id = "i-0" + hashlib.md5(str(i).encode()).hexdigest()[:16]
+        cve = f"CVE-{rng.randint(2015, 2025)}-{rng.randint(1000, 99999)}"
+        text = (f"{symptom}. Seen as {error_code} on {instance_id}. "
+                f"Related advisory {cve}. {fix}.")
+        corpus.append({"id": str(i), "topic": topic, "error_code": error_code,
+                       "instance_id": instance_id, "cve": cve, "text": text})
+    return corpus
+
+
+def build_queries(corpus, count: int, seed: int = 13):
+    """Half exact-token lookups (one relevant chunk), half paraphrased topic questions"""
+    rng = random.Random(seed)
+    by_topic = {}
+    for chunk in corpus:
+        by_topic.setdefault(chunk["topic"], set()).add(chunk["id"])
+    queries = []
+    for i in range(count):
+        if i % 2 == 0:
+            chunk = rng.choice(corpus)
+            field, template = rng.choice([
+                ("error_code", "what does {} mean"),
+                ("instance_id", "why is {} alerting"),
+                ("cve", "remediation for {}"),
+            ])
+            queries.append(("exact", template.format(chunk[field]), {chunk["id"]}))
+        else:
+            topic = rng.choice(list(PARAPHRASES))
+            queries.append(("semantic", PARAPHRASES[topic], by_topic[topic]))
+    return queries
+
+
+class HashingEmbedder:
+    """Hashed bag-of-words vectors, used when sentence-transformers is not installed"""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(self, texts, batch_size: int = 64, show_progress_bar: bool = False):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z]+|\d+", text.lower()):
+                digest = int(hashlib.md5(word.encode()).hexdigest()[:8], 16)
+                vectors[row, digest % self.dim] += 1.0 if digest & 1 << 31 else -1.0
+        return vectors
+
+
+def load_embedder(model_name: str):
+    try:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name), model_name
+    except ImportError:
+        return HashingEmbedder(), "hashed bag-of-words (sentence-transformers not installed)"
+
+
+def recall(found, relevant, k):
+    return len(set(found[:k]) & relevant) / min(k, len(relevant))
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000 if samples else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--rrf-k", type=int, default=60)
+    parser.add_argument("--rerank-candidates", type=int, default=20)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--rerank-model", default="cross-encoder/ms-marco-MiniLM-L-6-v2")
+    parser.add_argument("--no-rerank", action="store_true")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.chunks)
+    queries = build_queries(corpus, args.queries)
+    embedder, embedder_name = load_embedder(args.model)
+
+    started = time.perf_counter()
+    vectors = np.asarray(embedder.encode([c["text"] for c in corpus], batch_size=64), dtype=np.float32)
+    dense = LocalVectorIndex(vectors.shape[1], mode="exact")
+    dense.upsert([
+        {"id": c["id"], "vector": vectors[i], "payload": {"content": c["text"]}} for i, c in enumerate(corpus)
+    ])
+    embed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    lexical = BM25Index()
+    lexical.add({"id": c["id"], "payload": {"content": c["text"], "content_hash": c["id"]}} for c in corpus)
+    lexical_seconds = time.perf_counter() - started
+
+    reranker = None
+    if CROSS_ENCODER_AVAILABLE and not args.no_rerank:
+        reranker = CrossEncoderReranker(args.rerank_model)
+    texts = {c["id"]: c["text"] for c in corpus}
+
+    print(f"Hybrid retrieval benchmark: {args.chunks:,} chunks, {args.queries} queries, k={args.k}")
+    print(f"embedder: {embedder_name}")
+    print(f"ingest: embed + vector index {embed_seconds:.2f}s, BM25 index {lexical_seconds:.2f}s")
+    print()
+
+    stages = {"embed": [], "dense": [], "lexical": [], "fusion": [], "rerank": []}
+    recalls = {name: {"exact": [], "semantic": []} for name in ("dense", "bm25", "hybrid", "hybrid+rerank")}
+
+    for kind, query, relevant in queries:
+        started = time.perf_counter()
+        query_vector = np.asarray(embedder.encode([query]), dtype=np.float32)[0]
+        stages["embed"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        dense_ids = [hit["id"] for hit in dense.search(query_vector, limit=args.candidates)]
+        stages["dense"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        lexical_ids = [hit["id"] for hit in lexical.search(query, limit=args.candidates)]
+        stages["lexical"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        fused_ids = [point_id for point_id, _ in reciprocal_rank_fusion([dense_ids, lexical_ids], k=args.rrf_k)]
+        stages["fusion"].append(time.perf_counter() - started)
+
+        recalls["dense"][kind].append(recall(dense_ids, relevant, args.k))
+        recalls["bm25"][kind].append(recall(lexical_ids, relevant, args.k))
+        recalls["hybrid"][kind].append(recall(fused_ids, relevant, args.k))
+
+        if reranker is not None:
+            candidates = fused_ids[:args.rerank_candidates]
+            started = time.perf_counter()
+            scores = reranker.score(query, [(point_id, texts[point_id]) for point_id in candidates])
+            stages["rerank"].append(time.perf_counter() - started)
+            reranked = [point_id for _, point_id in sorted(zip(scores, candidates), reverse=True)]
+            recalls["hybrid+rerank"][kind].append(recall(reranked, relevant, args.k))
+
+    print(f"{'retriever':<16} {'recall@k exact':>15} {'recall@k semantic':>18} {'recall@k all':>13}")
+    for name, by_kind in recalls.items():
+        everything = by_kind["exact"] + by_kind["semantic"]
+        if not everything:
+            continue
+        print(f"{name:<16} {np.mean(by_kind['exact']):>15.3f} {np.mean(by_kind['semantic']):>18.3f} "
+              f"{np.mean(everything):>13.3f}")
+    print()
+    print(f"{'stage':<16} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, samples in stages.items():
+        if samples:
+            print(f"{name:<16} {percentile_ms(samples, 50):>9.2f} {percentile_ms(samples, 95):>9.2f}")
+    if reranker is None:
+        print("rerank           skipped (sentence-transformers not installed or --no-rerank)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for threat detection rules
+Compares per-rule evaluation (json.dumps + uncompiled re.search per rule, as
+AdvancedThreatIntelligence did before the compiled rule set) with the compiled,
+batched CompiledRuleSet on synthetic CloudTrail-like events
+
+Usage: python benchmark_threat_detection.py [--events 100000] [--batch-size 5000]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from security.detection_engine import CompiledRuleSet  # noqa: E402
+
+# Same patterns and thresholds as AdvancedThreatIntelligence._initialize_detection_rules
+RULES = {
+    "brute_force_detection": {"pattern": r"Failed password for .* from (\d+\.\d+\.\d+\.\d+)", "threshold": 10, "active": True},
+    "sql_injection_detection": {"pattern": r"(union|select|insert|update|delete|drop|exec).*(from|into|where)", "threshold": 1, "active": True},
+    "data_exfiltration_detection": {"pattern": "data_transfer_size", "threshold": 1073741824, "active": True},
+    "privilege_escalation_detection": {"pattern": r"(sudo|su|runas).*(root|administrator)", "threshold": 5, "active": True},
+    "lateral_movement_detection": {"pattern": "multiple_host_access", "threshold": 5, "active": True},
+    # Regex-marked ("r" prefix) custom rules; the shipped regex patterns are unmarked and match nothing
+    "custom_ssh_failure": {"pattern": r"rFailed password for \w+ from (\d+\.\d+\.\d+\.\d+)", "active": True},
+    "custom_union_select": {"pattern": r"r\bunion\s+select\b", "active": True},
+    "custom_console_login": {"pattern": r"r\"eventName\": \"ConsoleLogin\"", "active": True},
+}
+
+EVENT_NAMES = ["DescribeInstances", "GetObject", "PutObject", "AssumeRole", "ListBuckets", "ConsoleLogin"]
+
+
+def generate_events(count: int, seed: int = 42):
+    """Synthetic CloudTrail-like events, roughly 1% of them suspicious"""
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        event = {
+            "eventID": f"evt-{i}",
+            "eventName": rng.choice(EVENT_NAMES),
+            "eventSource": "ec2.amazonaws.com",
+            "awsRegion": rng.choice(["us-east-1", "eu-west-1", "ap-south-1"]),
+            "source_ip": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            "target_resource": f"i-{rng.getrandbits(32):08x}",
+            "userIdentity": {"type": "IAMUser", "userName": f"user{rng.randint(1, 500)}"},
+            "data_size": rng.randint(0, 10_000_000),
+            "accessed_hosts": [f"host-{n}" for n in range(rng.randint(0, 3))],
+            "message": "request completed",
+        }
+        roll = rng.random()
+        if roll < 0.003:
+            event["message"] = f"Failed password for admin from {event['source_ip']} port 22"
+        elif roll < 0.006:
+            event["message"] = "q=1 UNION SELECT password FROM users"
+        elif roll < 0.008:
+            event["data_size"] = 2 * 1073741824
+        elif roll < 0.010:
+            event["accessed_hosts"] = [f"host-{n}" for n in range(8)]
+        events.append(event)
+    return events
+
+
+def legacy_apply_rule(event, rule):
+    """AdvancedThreatIntelligence._apply_detection_rule before the compiled rule set"""
+    try:
+        pattern = rule["pattern"]
+        if isinstance(pattern, str) and pattern.startswith("r"):
+            text_data = json.dumps(event)
+            return bool(re.search(pattern[1:], text_data, re.IGNORECASE))
+        elif pattern == "data_transfer_size":
+            return event.get("data_size", 0) > rule["threshold"]
+        elif pattern == "multiple_host_access":
+            return len(event.get("accessed_hosts", [])) > rule["threshold"]
+        elif pattern == "failed_login_attempts":
+            return event.get("failed_logins", 0) > rule["threshold"]
+        return False
+    except Exception:
+        return False
+
+
+def legacy_detect(events):
+    """Per-event, per-rule evaluation as done before the compiled rule set"""
+    hits = []
+    for event in events:
+        hits.append([name for name, rule in RULES.items() if rule["active"] and legacy_apply_rule(event, rule)])
+    return hits
+
+
+def compiled_detect(events, batch_size: int):
+    compiled = CompiledRuleSet(RULES)
+    hits = []
+    for start in range(0, len(events), batch_size):
+        hits.extend(compiled.match_batch(events[start:start + batch_size]))
+    return hits
+
+
+def run(name, fn, *args):
+    started = time.perf_counter()
+    hits = fn(*args)
+    elapsed = time.perf_counter() - started
+    flagged = sum(1 for h in hits if h)
+    print(f"{name:<10} {elapsed:8.2f}s  {len(hits) / elapsed:12,.0f} events/sec  flagged={flagged}")
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    events = generate_events(args.events)
+    print(f"Threat detection benchmark: {args.events:,} events, {len(RULES)} rules")
+
+    legacy = run("legacy", legacy_detect, events)
+    compiled = run("compiled", compiled_detect, events, args.batch_size)
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if set(a) != set(b))
+    if mismatches:
+        print(f"WARNING: {mismatches} events matched differently")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
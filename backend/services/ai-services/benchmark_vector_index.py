@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the embedded local vector index
+Compares IVF approximate search with exact brute force on synthetic
+clustered embeddings: recall@k against the exact results and query latency
+
+Topic clusters overlap (``--spread`` is the spread of topic centers relative
+to the within-topic noise) and queries fall between two topics, so nearest
+neighbours often sit in other IVF lists and recall depends on nprobe.
+
+Usage: python benchmark_vector_index.py [--points 100000] [--dim 384] [--queries 200] [--spread 0.5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the rag directory to Python path (the index has no package dependencies)
+sys.path.insert(0, str(Path(__file__).parent / "src" / "rag"))
+
+from local_index import LocalVectorIndex  # noqa: E402
+
+
+def generate_corpus(points: int, dim: int, clusters: int, spread: float, seed: int = 7):
+    """Vectors drawn around overlapping topic centers, like chunk embeddings of a knowledge base"""
+    rng = np.random.default_rng(seed)
+    centers = (spread * rng.normal(size=(clusters, dim))).astype(np.float32)
+    labels = rng.integers(0, clusters, size=points)
+    vectors = centers[labels] + rng.normal(size=(points, dim)).astype(np.float32)
+    return vectors, labels, centers, rng
+
+
+def generate_queries(count: int, centers, rng):
+    """Queries mixing two random topics, so they are not centered on any corpus cluster"""
+    first = centers[rng.integers(0, len(centers), size=count)]
+    second = centers[rng.integers(0, len(centers), size=count)]
+    weight = rng.random((count, 1)).astype(np.float32)
+    noise = rng.normal(size=(count, centers.shape[1])).astype(np.float32)
+    return weight * first + (1 - weight) * second + noise
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def run_queries(index, queries, k, filters=None):
+    latencies = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = index.search(query, limit=k, filters=filters)
+        latencies.append(time.perf_counter() - started)
+        results.append({hit["id"] for hit in hits})
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--spread", type=float, default=0.5)
+    args = parser.parse_args()
+
+    vectors, labels, centers, rng = generate_corpus(args.points, args.dim, args.clusters, args.spread)
+    queries = generate_queries(args.queries, centers, rng)
+
+    exact = LocalVectorIndex(args.dim, mode="exact")
+    ivf = LocalVectorIndex(args.dim, mode="ivf", ivf_min_points=1)
+
+    started = time.perf_counter()
+    for start in range(0, args.points, 10_000):
+        batch = [
+            {"id": str(i), "vector": vectors[i], "payload": {"document_type": "log" if i % 4 == 0 else "runbook"}}
+            for i in range(start, min(start + 10_000, args.points))
+        ]
+        exact.upsert(batch)
+        ivf.upsert(batch)
+    print(f"Local vector index benchmark: {args.points:,} x {args.dim} vectors, {args.queries} queries, k={args.k}")
+    print(f"ingest (both indexes)  {time.perf_counter() - started:8.2f}s")
+
+    started = time.perf_counter()
+    ivf.search(queries[0], limit=args.k)  # trains the IVF lists
+    print(f"ivf training           {time.perf_counter() - started:8.2f}s  ({ivf.stats()['ivf_lists']} lists)")
+    print()
+    print(f"{'mode':<22} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9}")
+
+    truth, latencies = run_queries(exact, queries, args.k)
+    print(f"{'exact':<22} {1.0:>9.3f} {percentile_ms(latencies, 50):>9.2f} {percentile_ms(latencies, 95):>9.2f}")
+
+    for nprobe in (1, 4, 8, 16, 32):
+        ivf.nprobe = nprobe
+        found, latencies = run_queries(ivf, queries, args.k)
+        recall = np.mean([len(f & t) / max(1, len(t)) for f, t in zip(found, truth)])
+        label = f"ivf nprobe={nprobe}"
+        print(f"{label:<22} {recall:>9.3f} {percentile_ms(latencies, 50):>9.2f} {percentile_ms(latencies, 95):>9.2f}")
+
+    filters = {"document_type": "log"}
+    truth, latencies = run_queries(exact, queries, args.k, filters)
+    print(f"{'exact, filtered':<22} {1.0:>9.3f} {percentile_ms(latencies, 50):>9.2f} {percentile_ms(latencies, 95):>9.2f}")
+    ivf.nprobe = 8
+    found, latencies = run_queries(ivf, queries, args.k, filters)
+    recall = np.mean([len(f & t) / max(1, len(t)) for f, t in zip(found, truth)])
+    print(f"{'ivf nprobe=8, filtered':<22} {recall:>9.3f} {percentile_ms(latencies, 50):>9.2f} {percentile_ms(latencies, 95):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
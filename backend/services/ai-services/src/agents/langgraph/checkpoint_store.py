@@ -0,0 +1,257 @@
+"""
+Checkpoint stores for LangGraph workflow executions
+Per-node state snapshots and memoized tool results, keyed by execution id
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    MOTOR_AVAILABLE = True
+except ImportError:
+    MOTOR_AVAILABLE = False
+
+
+def _json_round_trip(value: Any) -> Any:
+    """``value`` as it reads back from a JSON store, so every backend returns the same types"""
+    return json.loads(json.dumps(value, default=str))
+
+
+class CheckpointStore(ABC):
+    """
+    Interface for checkpoint persistence.
+
+    A checkpoint is a JSON-serializable dict with ``execution_id``, ``seq``,
+    ``node`` and ``state``; the highest ``seq`` for an execution is where a
+    resume picks up. Tool results are memoized per execution and read back
+    after a JSON round trip, whichever store holds them.
+    """
+
+    @abstractmethod
+    async def save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        """Persist a checkpoint"""
+        pass
+
+    @abstractmethod
+    async def load_latest(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint with the highest seq for an execution, or None"""
+        pass
+
+    @abstractmethod
+    async def list_checkpoints(self, execution_id: str) -> List[Dict[str, Any]]:
+        """All checkpoints of an execution in seq order"""
+        pass
+
+    @abstractmethod
+    async def get_tool_result(self, execution_id: str, key: str) -> Tuple[bool, Any]:
+        """(found, result) of a memoized tool call; a memoized None is still found"""
+        pass
+
+    @abstractmethod
+    async def put_tool_result(self, execution_id: str, key: str, result: Any) -> None:
+        """Memoize a tool result"""
+        pass
+
+    @abstractmethod
+    async def delete_execution(self, execution_id: str) -> None:
+        """Drop every checkpoint and tool result of an execution"""
+        pass
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """Process-local store; checkpoints survive node failures but not restarts"""
+
+    def __init__(self, max_executions: int = 1000):
+        self.max_executions = max_executions
+        self._checkpoints: Dict[str, List[Dict[str, Any]]] = {}
+        self._tool_results: Dict[str, Dict[str, Any]] = {}
+
+    async def save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        execution_id = checkpoint["execution_id"]
+        if execution_id not in self._checkpoints and len(self._checkpoints) >= self.max_executions:
+            # dicts keep insertion order, so the first key is the oldest execution
+            oldest = next(iter(self._checkpoints))
+            await self.delete_execution(oldest)
+        # round-trip through JSON so later state mutation cannot alter the snapshot
+        self._checkpoints.setdefault(execution_id, []).append(_json_round_trip(checkpoint))
+
+    async def load_latest(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        checkpoints = self._checkpoints.get(execution_id)
+        return checkpoints[-1] if checkpoints else None
+
+    async def list_checkpoints(self, execution_id: str) -> List[Dict[str, Any]]:
+        return list(self._checkpoints.get(execution_id, []))
+
+    async def get_tool_result(self, execution_id: str, key: str) -> Tuple[bool, Any]:
+        results = self._tool_results.get(execution_id, {})
+        return (True, results[key]) if key in results else (False, None)
+
+    async def put_tool_result(self, execution_id: str, key: str, result: Any) -> None:
+        self._tool_results.setdefault(execution_id, {})[key] = _json_round_trip(result)
+
+    async def delete_execution(self, execution_id: str) -> None:
+        self._checkpoints.pop(execution_id, None)
+        self._tool_results.pop(execution_id, None)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Single-node durable store backed by a local SQLite file"""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " execution_id TEXT NOT NULL, seq INTEGER NOT NULL, node TEXT NOT NULL,"
+            " data TEXT NOT NULL, created_at TEXT NOT NULL,"
+            " PRIMARY KEY (execution_id, seq))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_results ("
+            " execution_id TEXT NOT NULL, key TEXT NOT NULL, result TEXT NOT NULL,"
+            " PRIMARY KEY (execution_id, key))"
+        )
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = (), fetch: bool = False):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            if fetch:
+                return cursor.fetchall()
+            self._conn.commit()
+            return None
+
+    async def save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO checkpoints (execution_id, seq, node, data, created_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                checkpoint["execution_id"],
+                checkpoint["seq"],
+                checkpoint["node"],
+                json.dumps(checkpoint, default=str),
+                datetime.now().isoformat()
+            )
+        )
+
+    async def load_latest(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT data FROM checkpoints WHERE execution_id = ? ORDER BY seq DESC LIMIT 1",
+            (execution_id,),
+            True
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def list_checkpoints(self, execution_id: str) -> List[Dict[str, Any]]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT data FROM checkpoints WHERE execution_id = ? ORDER BY seq",
+            (execution_id,),
+            True
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    async def get_tool_result(self, execution_id: str, key: str) -> Tuple[bool, Any]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT result FROM tool_results WHERE execution_id = ? AND key = ?",
+            (execution_id, key),
+            True
+        )
+        return (True, json.loads(rows[0][0])) if rows else (False, None)
+
+    async def put_tool_result(self, execution_id: str, key: str, result: Any) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO tool_results (execution_id, key, result) VALUES (?, ?, ?)",
+            (execution_id, key, json.dumps(result, default=str))
+        )
+
+    async def delete_execution(self, execution_id: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM checkpoints WHERE execution_id = ?", (execution_id,))
+        await asyncio.to_thread(self._execute, "DELETE FROM tool_results WHERE execution_id = ?", (execution_id,))
+
+
+class MongoCheckpointStore(CheckpointStore):
+    """Shared store so any replica can resume an execution"""
+
+    def __init__(self, mongo_uri: str, database: str):
+        self.client = AsyncIOMotorClient(mongo_uri)
+        self.db = self.client[database]
+        self.checkpoints = self.db.langgraph_checkpoints
+        self.tool_results = self.db.langgraph_tool_results
+        self._indexes_created = False
+
+    async def _ensure_indexes(self):
+        if self._indexes_created:
+            return
+        await self.checkpoints.create_index([("execution_id", 1), ("seq", -1)], unique=True)
+        await self.tool_results.create_index([("execution_id", 1), ("key", 1)], unique=True)
+        self._indexes_created = True
+
+    async def save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        await self._ensure_indexes()
+        doc = _json_round_trip(checkpoint)
+        await self.checkpoints.replace_one(
+            {"execution_id": doc["execution_id"], "seq": doc["seq"]},
+            doc,
+            upsert=True
+        )
+
+    async def load_latest(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        doc = await self.checkpoints.find_one(
+            {"execution_id": execution_id},
+            {"_id": 0},
+            sort=[("seq", -1)]
+        )
+        return doc
+
+    async def list_checkpoints(self, execution_id: str) -> List[Dict[str, Any]]:
+        cursor = self.checkpoints.find({"execution_id": execution_id}, {"_id": 0}).sort("seq", 1)
+        return [doc async for doc in cursor]
+
+    async def get_tool_result(self, execution_id: str, key: str) -> Tuple[bool, Any]:
+        doc = await self.tool_results.find_one({"execution_id": execution_id, "key": key})
+        return (True, doc["result"]) if doc else (False, None)
+
+    async def put_tool_result(self, execution_id: str, key: str, result: Any) -> None:
+        await self._ensure_indexes()
+        await self.tool_results.replace_one(
+            {"execution_id": execution_id, "key": key},
+            {"execution_id": execution_id, "key": key, "result": _json_round_trip(result)},
+            upsert=True
+        )
+
+    async def delete_execution(self, execution_id: str) -> None:
+        await self.checkpoints.delete_many({"execution_id": execution_id})
+        await self.tool_results.delete_many({"execution_id": execution_id})
+
+
+def build_checkpoint_store(settings) -> CheckpointStore:
+    """Create the store selected by ``settings.langgraph_checkpoint_backend`` (memory, sqlite or mongo)"""
+    logger = logging.getLogger(__name__)
+    backend = getattr(settings, "langgraph_checkpoint_backend", "memory").lower()
+    try:
+        if backend == "sqlite":
+            return SQLiteCheckpointStore(
+                getattr(settings, "langgraph_checkpoint_path", "data/langgraph_checkpoints.sqlite3")
+            )
+        if backend == "mongo":
+            if not MOTOR_AVAILABLE:
+                raise RuntimeError("motor is not installed")
+            return MongoCheckpointStore(settings.mongodb_uri, settings.mongodb_database)
+    except Exception as e:
+        logger.warning(f"Checkpoint backend '{backend}' unavailable, using in-memory store: {e}")
+    return InMemoryCheckpointStore()
@@ -6,6 +6,7 @@ Advanced AI assistant workflows with RCA, remediation, and IaC capabilities
 import asyncio
 import json
 import logging
+import uuid
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -37,6 +38,24 @@ except ImportError:
             self.content = content
 
 from ...config.settings import settings
+from .checkpoint_store import build_checkpoint_store
+
+
+# Tools whose output only depends on their input; memoized within an execution
+MEMOIZABLE_TOOLS = {
+    "analyze_logs",
+    "check_metrics",
+    "scan_infrastructure",
+    "validate_iac_code",
+    "estimate_costs",
+    "security_scan"
+}
+
+_MESSAGE_TYPES = {
+    "human": HumanMessage,
+    "ai": AIMessage,
+    "system": SystemMessage
+}
 
 
 class WorkflowType(str, Enum):
@@ -61,6 +80,37 @@ class WorkflowState:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def _serialize_state(state: WorkflowState) -> Dict[str, Any]:
+    """JSON-safe snapshot of a workflow state"""
+    messages = []
+    for msg in state.messages:
+        msg_type = "ai" if isinstance(msg, AIMessage) else "system" if isinstance(msg, SystemMessage) else "human"
+        messages.append({"type": msg_type, "content": getattr(msg, "content", str(msg))})
+    return json.loads(json.dumps({
+        "messages": messages,
+        "current_step": state.current_step,
+        "workflow_type": state.workflow_type.value,
+        "context": state.context,
+        "tools_used": state.tools_used,
+        "results": state.results,
+        "errors": state.errors,
+        "metadata": state.metadata
+    }, default=str))
+
+
+def _restore_state(state: WorkflowState, data: Dict[str, Any]) -> WorkflowState:
+    """Overwrite ``state`` in place with a snapshot from _serialize_state"""
+    state.messages = [_MESSAGE_TYPES.get(m["type"], HumanMessage)(content=m["content"]) for m in data["messages"]]
+    state.current_step = data["current_step"]
+    state.workflow_type = WorkflowType(data["workflow_type"])
+    state.context = data["context"]
+    state.tools_used = data["tools_used"]
+    state.results = data["results"]
+    state.errors = data["errors"]
+    state.metadata = data["metadata"]
+    return state
+
+
 class LangGraphOrchestrator:
     """Production-grade LangGraph orchestrator for AI workflows"""
     
@@ -71,6 +121,10 @@ class LangGraphOrchestrator:
             self.logger.error("LangGraph not available. Install required dependencies.")
             return
         
+        # Per-node checkpoints and tool memoization
+        self.checkpoint_store = build_checkpoint_store(settings)
+        self.node_retry_attempts = max(1, settings.retry_attempts)
+        
         # Initialize LLM
         self.llm = ChatOpenAI(
             model=settings.default_model,
@@ -160,11 +214,11 @@ class LangGraphOrchestrator:
         workflow = StateGraph(WorkflowState)
         
         # Define nodes
-        workflow.add_node("analyze_incident", self._analyze_incident_node)
-        workflow.add_node("gather_evidence", self._gather_evidence_node)
-        workflow.add_node("identify_patterns", self._identify_patterns_node)
-        workflow.add_node("determine_root_cause", self._determine_root_cause_node)
-        workflow.add_node("generate_report", self._generate_report_node)
+        workflow.add_node("analyze_incident", self._checkpointed("analyze_incident", self._analyze_incident_node))
+        workflow.add_node("gather_evidence", self._checkpointed("gather_evidence", self._gather_evidence_node))
+        workflow.add_node("identify_patterns", self._checkpointed("identify_patterns", self._identify_patterns_node))
+        workflow.add_node("determine_root_cause", self._checkpointed("determine_root_cause", self._determine_root_cause_node))
+        workflow.add_node("generate_report", self._checkpointed("generate_report", self._generate_report_node))
         
         # Define edges
         workflow.set_entry_point("analyze_incident")
@@ -182,11 +236,11 @@ class LangGraphOrchestrator:
         workflow = StateGraph(WorkflowState)
         
         # Define nodes
-        workflow.add_node("assess_issue", self._assess_issue_node)
-        workflow.add_node("plan_remediation", self._plan_remediation_node)
-        workflow.add_node("validate_plan", self._validate_plan_node)
-        workflow.add_node("execute_remediation", self._execute_remediation_node)
-        workflow.add_node("verify_fix", self._verify_fix_node)
+        workflow.add_node("assess_issue", self._checkpointed("assess_issue", self._assess_issue_node))
+        workflow.add_node("plan_remediation", self._checkpointed("plan_remediation", self._plan_remediation_node))
+        workflow.add_node("validate_plan", self._checkpointed("validate_plan", self._validate_plan_node))
+        workflow.add_node("execute_remediation", self._checkpointed("execute_remediation", self._execute_remediation_node))
+        workflow.add_node("verify_fix", self._checkpointed("verify_fix", self._verify_fix_node))
         
         # Define edges
         workflow.set_entry_point("assess_issue")
@@ -204,11 +258,11 @@ class LangGraphOrchestrator:
         workflow = StateGraph(WorkflowState)
         
         # Define nodes
-        workflow.add_node("analyze_requirements", self._analyze_requirements_node)
-        workflow.add_node("generate_iac", self._generate_iac_node)
-        workflow.add_node("validate_iac", self._validate_iac_node)
-        workflow.add_node("estimate_costs", self._estimate_costs_node)
-        workflow.add_node("create_deployment_plan", self._create_deployment_plan_node)
+        workflow.add_node("analyze_requirements", self._checkpointed("analyze_requirements", self._analyze_requirements_node))
+        workflow.add_node("generate_iac", self._checkpointed("generate_iac", self._generate_iac_node))
+        workflow.add_node("validate_iac", self._checkpointed("validate_iac", self._validate_iac_node))
+        workflow.add_node("estimate_costs", self._checkpointed("estimate_costs", self._estimate_costs_node))
+        workflow.add_node("create_deployment_plan", self._checkpointed("create_deployment_plan", self._create_deployment_plan_node))
         
         # Define edges
         workflow.set_entry_point("analyze_requirements")
@@ -226,12 +280,12 @@ class LangGraphOrchestrator:
         workflow = StateGraph(WorkflowState)
         
         # Define nodes
-        workflow.add_node("detect_incident", self._detect_incident_node)
-        workflow.add_node("assess_impact", self._assess_impact_node)
-        workflow.add_node("contain_incident", self._contain_incident_node)
-        workflow.add_node("investigate_cause", self._investigate_cause_node)
-        workflow.add_node("resolve_incident", self._resolve_incident_node)
-        workflow.add_node("document_incident", self._document_incident_node)
+        workflow.add_node("detect_incident", self._checkpointed("detect_incident", self._detect_incident_node))
+        workflow.add_node("assess_impact", self._checkpointed("assess_impact", self._assess_impact_node))
+        workflow.add_node("contain_incident", self._checkpointed("contain_incident", self._contain_incident_node))
+        workflow.add_node("investigate_cause", self._checkpointed("investigate_cause", self._investigate_cause_node))
+        workflow.add_node("resolve_incident", self._checkpointed("resolve_incident", self._resolve_incident_node))
+        workflow.add_node("document_incident", self._checkpointed("document_incident", self._document_incident_node))
         
         # Define edges
         workflow.set_entry_point("detect_incident")
@@ -250,11 +304,11 @@ class LangGraphOrchestrator:
         workflow = StateGraph(WorkflowState)
         
         # Define nodes
-        workflow.add_node("analyze_costs", self._analyze_costs_node)
-        workflow.add_node("identify_optimizations", self._identify_optimizations_node)
-        workflow.add_node("generate_recommendations", self._generate_recommendations_node)
-        workflow.add_node("estimate_savings", self._estimate_savings_node)
-        workflow.add_node("create_optimization_plan", self._create_optimization_plan_node)
+        workflow.add_node("analyze_costs", self._checkpointed("analyze_costs", self._analyze_costs_node))
+        workflow.add_node("identify_optimizations", self._checkpointed("identify_optimizations", self._identify_optimizations_node))
+        workflow.add_node("generate_recommendations", self._checkpointed("generate_recommendations", self._generate_recommendations_node))
+        workflow.add_node("estimate_savings", self._checkpointed("estimate_savings", self._estimate_savings_node))
+        workflow.add_node("create_optimization_plan", self._checkpointed("create_optimization_plan", self._create_optimization_plan_node))
         
         # Define edges
         workflow.set_entry_point("analyze_costs")
@@ -272,11 +326,11 @@ class LangGraphOrchestrator:
         workflow = StateGraph(WorkflowState)
         
         # Define nodes
-        workflow.add_node("scan_vulnerabilities", self._scan_vulnerabilities_node)
-        workflow.add_node("assess_compliance", self._assess_compliance_node)
-        workflow.add_node("analyze_threats", self._analyze_threats_node)
-        workflow.add_node("generate_security_report", self._generate_security_report_node)
-        workflow.add_node("recommend_actions", self._recommend_actions_node)
+        workflow.add_node("scan_vulnerabilities", self._checkpointed("scan_vulnerabilities", self._scan_vulnerabilities_node))
+        workflow.add_node("assess_compliance", self._checkpointed("assess_compliance", self._assess_compliance_node))
+        workflow.add_node("analyze_threats", self._checkpointed("analyze_threats", self._analyze_threats_node))
+        workflow.add_node("generate_security_report", self._checkpointed("generate_security_report", self._generate_security_report_node))
+        workflow.add_node("recommend_actions", self._checkpointed("recommend_actions", self._recommend_actions_node))
         
         # Define edges
         workflow.set_entry_point("scan_vulnerabilities")
@@ -317,7 +371,7 @@ class LangGraphOrchestrator:
         state.current_step = "gather_evidence"
         
         # Use tools to gather evidence
-        evidence = await self.tool_executor.ainvoke({
+        evidence = await self._invoke_tools(state, {
             "analyze_logs": "Recent application logs",
             "check_metrics": "system_metrics",
             "scan_infrastructure": "all"
@@ -410,7 +464,7 @@ class LangGraphOrchestrator:
         """Plan remediation steps"""
         state.current_step = "plan_remediation"
         
-        plan = await self.tool_executor.ainvoke({
+        plan = await self._invoke_tools(state, {
             "generate_remediation_plan": "system_issue",
             "severity": "medium"
         })
@@ -438,7 +492,7 @@ class LangGraphOrchestrator:
         """Execute remediation"""
         state.current_step = "execute_remediation"
         
-        execution = await self.tool_executor.ainvoke({
+        execution = await self._invoke_tools(state, {
             "execute_remediation": "plan_123",
             "auto_approve": True
         })
@@ -481,7 +535,7 @@ class LangGraphOrchestrator:
         """Generate IaC code"""
         state.current_step = "generate_iac"
         
-        iac_code = await self.tool_executor.ainvoke({
+        iac_code = await self._invoke_tools(state, {
             "generate_iac_code": state.context.get('requirements', ''),
             "provider": "terraform"
         })
@@ -495,7 +549,7 @@ class LangGraphOrchestrator:
         """Validate IaC code"""
         state.current_step = "validate_iac"
         
-        validation = await self.tool_executor.ainvoke({
+        validation = await self._invoke_tools(state, {
             "validate_iac_code": state.results.get("iac_code", "")
         })
         
@@ -508,7 +562,7 @@ class LangGraphOrchestrator:
         """Estimate infrastructure costs"""
         state.current_step = "estimate_costs"
         
-        cost_estimate = await self.tool_executor.ainvoke({
+        cost_estimate = await self._invoke_tools(state, {
             "estimate_costs": state.results.get("iac_code", "")
         })
         
@@ -602,7 +656,7 @@ class LangGraphOrchestrator:
         """Scan vulnerabilities"""
         state.current_step = "scan_vulnerabilities"
         
-        scan_result = await self.tool_executor.ainvoke({
+        scan_result = await self._invoke_tools(state, {
             "security_scan": "all_services"
         })
         
@@ -635,45 +689,208 @@ class LangGraphOrchestrator:
         state.results["security_recommendations"] = "Update SSL certificates, patch vulnerabilities"
         return state
     
+    def _checkpointed(self, node_name: str, node_fn):
+        """
+        Wrap a node so it checkpoints state after completing.
+        
+        Nodes already completed in this execution (i.e. when resuming) are
+        skipped; a failing node is retried from its pre-node snapshot. When
+        the last attempt fails, the pre-node state is checkpointed as failed
+        here, since LangGraph hands nodes a state rebuilt from its channels
+        and the caller's state object never sees these updates.
+        """
+        async def node(state: WorkflowState) -> WorkflowState:
+            if node_name in state.metadata.get("completed_nodes", []):
+                return state
+            
+            snapshot = _serialize_state(state)
+            for attempt in range(1, self.node_retry_attempts + 1):
+                try:
+                    await node_fn(state)
+                    break
+                except Exception as e:
+                    if attempt >= self.node_retry_attempts:
+                        _restore_state(state, snapshot)
+                        state.metadata["status"] = "failed"
+                        state.metadata["failed_node"] = node_name
+                        state.errors.append(f"{node_name}: {str(e)}")
+                        await self._save_checkpoint(state, f"{node_name}:failed")
+                        raise
+                    self.logger.warning(
+                        f"Node {node_name} failed (attempt {attempt}/{self.node_retry_attempts}): {str(e)}"
+                    )
+                    _restore_state(state, snapshot)
+            
+            state.metadata.setdefault("completed_nodes", []).append(node_name)
+            await self._save_checkpoint(state, node_name)
+            return state
+        
+        return node
+    
+    async def _save_checkpoint(self, state: WorkflowState, node_name: str):
+        """Persist the state reached after ``node_name``"""
+        execution_id = state.metadata.get("execution_id")
+        if not execution_id:
+            return
+        state.metadata["checkpoint_seq"] = state.metadata.get("checkpoint_seq", -1) + 1
+        try:
+            await self.checkpoint_store.save_checkpoint({
+                "execution_id": execution_id,
+                "seq": state.metadata["checkpoint_seq"],
+                "node": node_name,
+                "workflow_type": state.workflow_type.value,
+                "state": _serialize_state(state),
+                "created_at": datetime.now().isoformat()
+            })
+        except Exception as e:
+            self.logger.error(f"Failed to save checkpoint {execution_id}/{node_name}: {str(e)}")
+    
+    async def _invoke_tools(self, state: WorkflowState, tool_input: Dict[str, Any]) -> Any:
+        """Run tools, reusing results of deterministic tools already called in this execution"""
+        execution_id = state.metadata.get("execution_id")
+        memoizable = bool(execution_id) and isinstance(tool_input, dict) and set(tool_input) <= MEMOIZABLE_TOOLS
+        
+        if memoizable:
+            key = json.dumps(tool_input, sort_keys=True, default=str)
+            found, cached = await self.checkpoint_store.get_tool_result(execution_id, key)
+            if found:
+                state.metadata["tool_cache_hits"] = state.metadata.get("tool_cache_hits", 0) + 1
+                return cached
+        
+        result = await self.tool_executor.ainvoke(tool_input)
+        
+        if memoizable:
+            try:
+                await self.checkpoint_store.put_tool_result(execution_id, key, result)
+            except Exception as e:
+                self.logger.error(f"Failed to memoize tool result: {str(e)}")
+        return result
+    
     async def execute_workflow(
         self,
         workflow_type: WorkflowType,
         initial_context: Dict[str, Any],
-        user_message: str
+        user_message: str,
+        execution_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Execute a LangGraph workflow"""
+        """Execute a LangGraph workflow (resumes if ``execution_id`` already has checkpoints)"""
         
         if not LANGGRAPH_AVAILABLE:
             return {"error": "LangGraph not available"}
         
         try:
+            if execution_id and await self.checkpoint_store.load_latest(execution_id):
+                return await self.resume_workflow(execution_id)
+            
             # Create initial state
             state = WorkflowState(
                 workflow_type=workflow_type,
                 context=initial_context,
                 messages=[HumanMessage(content=user_message)]
             )
+            state.metadata.update({
+                "execution_id": execution_id or str(uuid.uuid4()),
+                "completed_nodes": [],
+                "status": "running"
+            })
+            await self._save_checkpoint(state, "__start__")
             
-            # Get workflow
-            workflow = self.workflows.get(workflow_type)
-            if not workflow:
-                return {"error": f"Workflow {workflow_type} not found"}
+            return await self._run_workflow(state)
             
+        except Exception as e:
+            self.logger.error(f"Workflow execution failed: {str(e)}")
+            return {"error": str(e)}
+    
+    async def resume_workflow(self, execution_id: str) -> Dict[str, Any]:
+        """Continue an execution from its last checkpoint; completed nodes are not re-run"""
+        
+        if not LANGGRAPH_AVAILABLE:
+            return {"error": "LangGraph not available"}
+        
+        try:
+            checkpoint = await self.checkpoint_store.load_latest(execution_id)
+            if not checkpoint:
+                return {"error": f"No checkpoints found for execution {execution_id}"}
+            
+            state = _restore_state(WorkflowState(), checkpoint["state"])
+            if state.metadata.get("status") == "completed":
+                return self._workflow_result(state)
+            
+            self.logger.info(f"Resuming execution {execution_id} after node {checkpoint['node']}")
+            state.metadata["status"] = "running"
+            state.metadata.pop("failed_node", None)
+            return await self._run_workflow(state, resumed_from=checkpoint["node"])
+            
+        except Exception as e:
+            self.logger.error(f"Workflow resume failed: {str(e)}")
+            return {"error": str(e), "execution_id": execution_id}
+    
+    async def get_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Checkpoint history for an execution"""
+        checkpoints = await self.checkpoint_store.list_checkpoints(execution_id)
+        if not checkpoints:
+            return {"error": f"Execution {execution_id} not found"}
+        latest = checkpoints[-1]["state"]["metadata"]
+        return {
+            "execution_id": execution_id,
+            "workflow_type": checkpoints[-1]["workflow_type"],
+            "status": latest.get("status"),
+            "completed_nodes": latest.get("completed_nodes", []),
+            "failed_node": latest.get("failed_node"),
+            "checkpoints": [
+                {"seq": cp["seq"], "node": cp["node"], "created_at": cp["created_at"]}
+                for cp in checkpoints
+            ]
+        }
+    
+    async def _run_workflow(self, state: WorkflowState, resumed_from: Optional[str] = None) -> Dict[str, Any]:
+        """Invoke the graph for ``state`` and record the outcome"""
+        execution_id = state.metadata["execution_id"]
+        
+        # Get workflow
+        workflow = self.workflows.get(state.workflow_type)
+        if not workflow:
+            return {"error": f"Workflow {state.workflow_type} not found"}
+        
+        try:
             # Execute workflow
             final_state = await workflow.ainvoke(state)
-            
+        except Exception as e:
+            # the failing node checkpointed its own state; ``state`` is stale here
+            checkpoint = await self.checkpoint_store.load_latest(execution_id)
+            metadata = checkpoint["state"]["metadata"] if checkpoint else state.metadata
+            failed_node = metadata.get("failed_node")
+            self.logger.error(f"Workflow {execution_id} failed at {failed_node}: {str(e)}")
             return {
-                "success": True,
-                "workflow_type": workflow_type.value,
-                "final_state": final_state,
-                "results": final_state.results,
-                "tools_used": final_state.tools_used,
-                "messages": [msg.content for msg in final_state.messages if hasattr(msg, 'content')]
+                "error": str(e),
+                "execution_id": execution_id,
+                "failed_node": failed_node,
+                "completed_nodes": metadata.get("completed_nodes", []),
+                "resumable": True
             }
-            
-        except Exception as e:
-            self.logger.error(f"Workflow execution failed: {str(e)}")
-            return {"error": str(e)}
+        
+        if isinstance(final_state, dict):
+            # LangGraph returns the channel values rather than the state object
+            final_state = WorkflowState(**final_state)
+        final_state.metadata["status"] = "completed"
+        await self._save_checkpoint(final_state, "__end__")
+        
+        result = self._workflow_result(final_state)
+        result["final_state"] = final_state
+        if resumed_from:
+            result["resumed_from"] = resumed_from
+        return result
+    
+    def _workflow_result(self, state: WorkflowState) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "execution_id": state.metadata.get("execution_id"),
+            "workflow_type": state.workflow_type.value,
+            "results": state.results,
+            "tools_used": state.tools_used,
+            "messages": [msg.content for msg in state.messages if hasattr(msg, 'content')],
+            "tool_cache_hits": state.metadata.get("tool_cache_hits", 0)
+        }
     
     async def get_workflow_status(self, workflow_type: WorkflowType) -> Dict[str, Any]:
         """Get workflow status and capabilities"""
@@ -10,7 +10,11 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import boto3
-import openai
+
+try:
+    from ...utils.llm_gateway import llm_gateway
+except ImportError:  # imported as the top-level ``agents`` package
+    from utils.llm_gateway import llm_gateway
 
 @dataclass
 class IncidentData:
@@ -67,7 +71,7 @@ class RCAAgent:
         self.description = "Performs intelligent root cause analysis for incidents"
         self.cloudwatch_client = boto3.client('cloudwatch')
         self.logs_client = boto3.client('logs')
-        self.openai_client = openai.OpenAI()
+        self.openai_client = llm_gateway.client('rca_agent')
         
     async def analyze_incident(self, incident: IncidentData, logs: List[LogEntry], metrics: List[MetricData]) -> RCAResult:
         """Perform comprehensive RCA analysis"""
@@ -336,7 +340,9 @@ Format the response as JSON with the following structure:
 }}
 """
             
-            response = self.openai_client.chat.completions.create(
+            if not self.openai_client:
+                raise RuntimeError("LLM gateway is not configured")
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-4",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3
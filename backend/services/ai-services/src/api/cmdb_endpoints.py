@@ -1,4 +1,7 @@
+import json
+
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 
@@ -222,11 +225,12 @@ async def get_untagged_resources(
 async def get_resource_graph(
     tenant_id: str,
     max_depth: int = Query(3, ge=1, le=10),
+    root_id: Optional[List[str]] = Query(None),
     cmdb_store: CMDBStore = Depends(get_cmdb_store)
 ):
-    """Get resource graph for a tenant"""
+    """Get resource graph for a tenant (optionally only what is within max_depth hops of root_id)"""
     try:
-        graph = await cmdb_store.build_resource_graph(tenant_id, max_depth=max_depth)
+        graph = await cmdb_store.build_resource_graph(tenant_id, max_depth=max_depth, root_ids=root_id)
         
         return ResourceGraphResponse(
             success=True,
@@ -237,6 +241,21 @@ async def get_resource_graph(
         raise HTTPException(status_code=500, detail=f"Error generating resource graph: {str(e)}")
 
 
+@router.get("/{tenant_id}/graph/stream")
+async def stream_resource_graph(
+    tenant_id: str,
+    max_depth: int = Query(3, ge=1, le=10),
+    root_id: Optional[List[str]] = Query(None),
+    cmdb_store: CMDBStore = Depends(get_cmdb_store)
+):
+    """Stream the resource graph as NDJSON lines of {"type": "node"|"edge", "data": {...}}"""
+    async def generate():
+        async for kind, item in cmdb_store.stream_resource_graph(tenant_id, max_depth=max_depth, root_ids=root_id):
+            yield json.dumps({"type": kind, "data": item.dict()}, default=str) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/{tenant_id}/stats", response_model=CMDBStatsResponse)
 async def get_cmdb_stats(
     tenant_id: str,
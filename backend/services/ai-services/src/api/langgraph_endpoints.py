@@ -23,6 +23,7 @@ class WorkflowRequest(BaseModel):
     user_message: str = Field(..., description="User message/query")
     context: Dict[str, Any] = Field(default_factory=dict, description="Additional context")
     auto_approve: bool = Field(default=False, description="Auto-approve actions")
+    execution_id: Optional[str] = Field(default=None, description="Execution id; an existing id resumes from its last checkpoint")
 
 
 class WorkflowResponse(BaseModel):
@@ -34,6 +35,7 @@ class WorkflowResponse(BaseModel):
     messages: List[str]
     execution_time: float
     timestamp: datetime
+    execution_id: Optional[str] = None
 
 
 class WorkflowStatusResponse(BaseModel):
@@ -51,6 +53,20 @@ class WorkflowListResponse(BaseModel):
     total_workflows: int
 
 
+def _workflow_error(result: Dict[str, Any]) -> HTTPException:
+    """500 carrying what a caller needs to resume a failed execution"""
+    return HTTPException(
+        status_code=500,
+        detail={
+            "error": result["error"],
+            "execution_id": result.get("execution_id"),
+            "failed_node": result.get("failed_node"),
+            "completed_nodes": result.get("completed_nodes", []),
+            "resumable": result.get("resumable", False)
+        }
+    )
+
+
 @router.post("/execute", response_model=WorkflowResponse)
 async def execute_workflow(request: WorkflowRequest) -> WorkflowResponse:
     """
@@ -81,11 +97,12 @@ async def execute_workflow(request: WorkflowRequest) -> WorkflowResponse:
         result = await langgraph_orchestrator.execute_workflow(
             workflow_type=workflow_type,
             initial_context=context,
-            user_message=request.user_message
+            user_message=request.user_message,
+            execution_id=request.execution_id
         )
         
         if "error" in result:
-            raise HTTPException(status_code=500, detail=result["error"])
+            raise _workflow_error(result)
         
         execution_time = (datetime.now() - start_time).total_seconds()
         
@@ -96,14 +113,63 @@ async def execute_workflow(request: WorkflowRequest) -> WorkflowResponse:
             tools_used=result["tools_used"],
             messages=result["messages"],
             execution_time=execution_time,
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            execution_id=result.get("execution_id")
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Workflow execution failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
 
 
+@router.post("/executions/{execution_id}/resume", response_model=WorkflowResponse)
+async def resume_workflow(execution_id: str) -> WorkflowResponse:
+    """
+    Resume a failed or interrupted workflow from its last checkpoint
+    
+    - **execution_id**: Id returned by the original execution
+    """
+    try:
+        start_time = datetime.now()
+        
+        result = await langgraph_orchestrator.resume_workflow(execution_id)
+        
+        if "error" in result:
+            raise _workflow_error({"execution_id": execution_id, **result})
+        
+        execution_time = (datetime.now() - start_time).total_seconds()
+        
+        return WorkflowResponse(
+            success=result["success"],
+            workflow_type=result["workflow_type"],
+            results=result["results"],
+            tools_used=result["tools_used"],
+            messages=result["messages"],
+            execution_time=execution_time,
+            timestamp=datetime.now(),
+            execution_id=execution_id
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Workflow resume failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Workflow resume failed: {str(e)}")
+
+
+@router.get("/executions/{execution_id}")
+async def get_execution(execution_id: str) -> Dict[str, Any]:
+    """
+    Get checkpoint history for a workflow execution
+    """
+    result = await langgraph_orchestrator.get_execution(execution_id)
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
+
+
 @router.get("/workflows", response_model=WorkflowListResponse)
 async def list_workflows() -> WorkflowListResponse:
     """
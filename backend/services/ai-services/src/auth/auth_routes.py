@@ -107,7 +107,7 @@ async def login(request: LoginRequest, http_request: Request):
         user_agent = http_request.headers.get("User-Agent", "unknown")
         
         # Authenticate user
-        is_authenticated, auth_user, error_message = auth_manager.authenticate_user(
+        is_authenticated, auth_user, error_message = await auth_manager.authenticate_user_async(
             username_or_email=request.username_or_email,
             password=request.password,
             ip_address=client_ip,
@@ -247,7 +247,7 @@ async def register(request: RegisterRequest, http_request: Request):
             "user_id": user_id,
             "email": request.email,
             "username": request.username,
-            "password_hash": auth_manager._hash_password(request.password),
+            "password_hash": await auth_manager.hash_password_async(request.password),
             "org_id": org_id,
             "team_id": None,
             "roles": ["user"],
@@ -261,7 +261,7 @@ async def register(request: RegisterRequest, http_request: Request):
             "full_name": request.full_name
         }
         
-        auth_manager.users[user_id] = new_user
+        auth_manager.add_user(new_user)
         
         return RegisterResponse(
             user_id=user_id,
@@ -287,7 +287,7 @@ async def change_password(request: ChangePasswordRequest, current_user: AuthUser
             raise HTTPException(status_code=404, detail="User not found")
         
         # Verify current password
-        if not auth_manager._verify_password(request.current_password, user_data["password_hash"]):
+        if not await auth_manager.verify_password_async(request.current_password, user_data["password_hash"]):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
         
         # Validate new password confirmation
@@ -300,7 +300,7 @@ async def change_password(request: ChangePasswordRequest, current_user: AuthUser
             raise HTTPException(status_code=400, detail=f"Password policy violation: {', '.join(password_errors)}")
         
         # Update password
-        user_data["password_hash"] = auth_manager._hash_password(request.new_password)
+        user_data["password_hash"] = await auth_manager.hash_password_async(request.new_password)
         user_data["password_changed_at"] = datetime.utcnow()
         
         # Revoke all other sessions for security
@@ -388,7 +388,7 @@ async def disable_mfa(request: ChangePasswordRequest, current_user: AuthUser = D
             raise HTTPException(status_code=404, detail="User not found")
         
         # Verify password for security
-        if not auth_manager._verify_password(request.current_password, user_data["password_hash"]):
+        if not await auth_manager.verify_password_async(request.current_password, user_data["password_hash"]):
             raise HTTPException(status_code=400, detail="Password verification required")
         
         # Disable MFA
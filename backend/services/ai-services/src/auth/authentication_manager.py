@@ -14,9 +14,14 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import json
 import logging
-from functools import wraps
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps, partial
 import re
 
+from ..utils.ttl_cache import TTLCache
+
 # Email and SMS simulation (replace with real providers in production)
 # import smtplib
 # from email.mime.text import MimeText
@@ -88,6 +93,11 @@ class SecurityConfig:
     # Rate Limiting
     RATE_LIMIT_REQUESTS_PER_MINUTE = 60
     AUTH_RATE_LIMIT_REQUESTS_PER_MINUTE = 10
+    
+    # Performance
+    VERIFIED_TOKEN_CACHE_SIZE = 10000   # Verified JWT claims kept in memory
+    VERIFIED_TOKEN_CACHE_TTL_SECONDS = 300  # Upper bound; entries never outlive the token's exp
+    PASSWORD_HASH_WORKERS = 4  # Max concurrent bcrypt operations
 
 @dataclass
 class LoginAttempt:
@@ -137,6 +147,23 @@ class AuthenticationManager:
         self.mfa_codes: Dict[str, Dict] = {}  # Temporary MFA code storage
         self.oauth_providers = self._initialize_oauth_providers()
         
+        # Lookup indexes over self.users (email/username -> user_id)
+        self._users_by_email: Dict[str, str] = {}
+        self._users_by_username: Dict[str, str] = {}
+        self._indexed_user_count = 0
+        
+        # Verified token claims keyed by token digest
+        self._verified_tokens = TTLCache(
+            max_size=SecurityConfig.VERIFIED_TOKEN_CACHE_SIZE,
+            ttl_sec=SecurityConfig.VERIFIED_TOKEN_CACHE_TTL_SECONDS
+        )
+        
+        # bcrypt is deliberately slow; keep it off the event loop with a bounded pool
+        self._password_executor = ThreadPoolExecutor(
+            max_workers=SecurityConfig.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+        
         # Initialize demo users for testing
         self._initialize_demo_users()
         
@@ -247,7 +274,7 @@ class AuthenticationManager:
                     "full_name": f"Demo {provider.value.title()} User"
                 }
                 
-                self.users[demo_user["user_id"]] = demo_user
+                self.add_user(demo_user)
                 auth_user = self._create_auth_user(demo_user, ip_address, user_agent)
                 logger.info(f"Created demo user for {provider.value}: {demo_user['email']}")
                 return True, auth_user, None
@@ -372,7 +399,7 @@ class AuthenticationManager:
                         "full_name": full_name
                     }
                     
-                    self.users[new_user["user_id"]] = new_user
+                    self.add_user(new_user)
                     auth_user = self._create_auth_user(new_user, ip_address, user_agent)
                     
                     logger.info(f"Successfully created new user via {provider.value}: {email}")
@@ -424,7 +451,7 @@ class AuthenticationManager:
         ]
         
         for user in demo_users:
-            self.users[user["user_id"]] = user
+            self.add_user(user)
     
     # =============================================================================
     # CORE AUTHENTICATION METHODS
@@ -440,20 +467,55 @@ class AuthenticationManager:
             Tuple[success, auth_user, error_message]
         """
         try:
-            # Find user by username or email
-            user_data = self._find_user_by_credentials(username_or_email)
-            if not user_data:
-                self._log_login_attempt(username_or_email, ip_address, user_agent, False, "User not found")
-                return False, None, "Invalid credentials"
+            user_data, error = self._begin_authentication(username_or_email, ip_address, user_agent)
+            if error:
+                return False, None, error
             
-            user_id = user_data["user_id"]
+            password_ok = self._verify_password(password, user_data["password_hash"])
+            return self._finish_authentication(user_data, password_ok, ip_address, user_agent, mfa_code)
+            
+        except Exception as e:
+            logger.error(f"Authentication error: {e}")
+            return False, None, "Authentication failed"
+    
+    async def authenticate_user_async(self, username_or_email: str, password: str,
+                                      ip_address: str, user_agent: str,
+                                      mfa_code: Optional[str] = None) -> Tuple[bool, Optional[AuthUser], Optional[str]]:
+        """authenticate_user for async callers: bcrypt runs on the password pool, not the event loop"""
+        try:
+            user_data, error = self._begin_authentication(username_or_email, ip_address, user_agent)
+            if error:
+                return False, None, error
             
-            # Check if user is locked out
-            if self._is_user_locked_out(user_id):
-                return False, None, f"Account locked due to multiple failed attempts. Try again in {SecurityConfig.LOCKOUT_DURATION_MINUTES} minutes."
+            password_ok = await self.verify_password_async(password, user_data["password_hash"])
+            return self._finish_authentication(user_data, password_ok, ip_address, user_agent, mfa_code)
+            
+        except Exception as e:
+            logger.error(f"Authentication error: {e}")
+            return False, None, "Authentication failed"
+    
+    def _begin_authentication(self, username_or_email: str, ip_address: str,
+                              user_agent: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """User lookup and lockout check that precede password verification"""
+        # Find user by username or email
+        user_data = self._find_user_by_credentials(username_or_email)
+        if not user_data:
+            self._log_login_attempt(username_or_email, ip_address, user_agent, False, "User not found")
+            return None, "Invalid credentials"
+        
+        # Check if user is locked out
+        if self._is_user_locked_out(user_data["user_id"]):
+            return None, f"Account locked due to multiple failed attempts. Try again in {SecurityConfig.LOCKOUT_DURATION_MINUTES} minutes."
+        
+        return user_data, None
+    
+    def _finish_authentication(self, user_data: Dict, password_ok: bool, ip_address: str,
+                               user_agent: str, mfa_code: Optional[str]) -> Tuple[bool, Optional[AuthUser], Optional[str]]:
+        """MFA check and session creation once the password has been verified"""
+        try:
+            user_id = user_data["user_id"]
             
-            # Verify password
-            if not self._verify_password(password, user_data["password_hash"]):
+            if not password_ok:
                 self._record_failed_login(user_id, ip_address, user_agent, "Invalid password")
                 return False, None, "Invalid credentials"
             
@@ -521,22 +583,39 @@ class AuthenticationManager:
             if token in self.token_blacklist:
                 return False, None, "Token has been revoked"
             
-            payload = jwt.decode(token, SecurityConfig.JWT_SECRET_KEY, algorithms=[SecurityConfig.JWT_ALGORITHM])
+            # Signature and claims were already verified for this exact token
+            digest = self._token_digest(token)
+            cached = self._verified_tokens.get(digest)
+            if cached is not None:
+                payload, expires_at = cached
+                if expires_at <= time.time():
+                    self._verified_tokens.pop(digest)
+                    return False, None, "Token has expired"
+            else:
+                payload = jwt.decode(token, SecurityConfig.JWT_SECRET_KEY, algorithms=[SecurityConfig.JWT_ALGORITHM])
+                expires_at = float(payload.get("exp", 0))
+                ttl = min(SecurityConfig.VERIFIED_TOKEN_CACHE_TTL_SECONDS, expires_at - time.time())
+                if ttl > 0:
+                    self._verified_tokens.set(digest, (payload, expires_at), ttl_sec=ttl)
             
-            # Verify session is still valid
+            # Verify session is still valid (checked on every call so revocation is immediate)
             session_id = payload.get("session_id")
             if session_id and session_id in self.sessions:
                 session = self.sessions[session_id]
                 if session.status != SessionStatus.ACTIVE or session.expires_at < datetime.utcnow():
                     return False, None, "Session expired or invalid"
             
-            return True, payload, None
+            return True, dict(payload), None
             
         except jwt.ExpiredSignatureError:
             return False, None, "Token has expired"
         except jwt.InvalidTokenError as e:
             return False, None, f"Invalid token: {str(e)}"
     
+    @staticmethod
+    def _token_digest(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+    
     def refresh_access_token(self, refresh_token: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
         """Refresh access token using refresh token"""
         try:
@@ -743,6 +822,7 @@ class AuthenticationManager:
         
         # Blacklist token
         self.token_blacklist.add(token)
+        self._verified_tokens.pop(self._token_digest(token))
     
     def get_security_summary(self, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Get security summary for monitoring"""
@@ -808,6 +888,18 @@ class AuthenticationManager:
             salt = secrets.token_hex(16)
             return hashlib.pbkdf2_hex(password.encode(), salt.encode(), 100000, 32) + ":" + salt
     
+    async def hash_password_async(self, password: str) -> str:
+        """_hash_password on the bounded password pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._password_executor, self._hash_password, password)
+    
+    async def verify_password_async(self, password: str, password_hash: str) -> bool:
+        """_verify_password on the bounded password pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._password_executor, partial(self._verify_password, password, password_hash)
+        )
+    
     def _verify_password(self, password: str, password_hash: str) -> bool:
         """Verify password against hash"""
         try:
@@ -825,14 +917,42 @@ class AuthenticationManager:
     # USER MANAGEMENT HELPERS
     # =============================================================================
     
-    def _find_user_by_credentials(self, username_or_email: str) -> Optional[Dict]:
-        """Find user by username or email"""
+    def add_user(self, user_data: Dict):
+        """Store a user and index it by email and username"""
+        self.users[user_data["user_id"]] = user_data
+        self._index_user(user_data)
+        self._indexed_user_count = len(self.users)
+    
+    def _index_user(self, user_data: Dict):
+        if user_data.get("email"):
+            self._users_by_email[user_data["email"]] = user_data["user_id"]
+        if user_data.get("username"):
+            self._users_by_username[user_data["username"]] = user_data["user_id"]
+    
+    def _rebuild_user_indexes(self):
+        """Re-index after users were written to self.users directly"""
+        self._users_by_email.clear()
+        self._users_by_username.clear()
         for user_data in self.users.values():
-            if (user_data.get("username") == username_or_email or 
-                user_data.get("email") == username_or_email):
+            self._index_user(user_data)
+        self._indexed_user_count = len(self.users)
+    
+    def _lookup_user(self, username_or_email: str) -> Optional[Dict]:
+        for index, field_name in ((self._users_by_username, "username"), (self._users_by_email, "email")):
+            user_id = index.get(username_or_email)
+            user_data = self.users.get(user_id) if user_id else None
+            if user_data and user_data.get(field_name) == username_or_email:
                 return user_data
         return None
     
+    def _find_user_by_credentials(self, username_or_email: str) -> Optional[Dict]:
+        """Find user by username or email"""
+        user_data = self._lookup_user(username_or_email)
+        if user_data is None and self._indexed_user_count != len(self.users):
+            self._rebuild_user_indexes()
+            user_data = self._lookup_user(username_or_email)
+        return user_data
+    
     def _create_auth_user(self, user_data: Dict, ip_address: str, user_agent: str) -> AuthUser:
         """Create AuthUser object from user data"""
         session_id = self.create_session(
@@ -1,9 +1,9 @@
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator, Iterable
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import ASCENDING, DESCENDING
-from pymongo.errors import DuplicateKeyError
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, ReplaceOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 
 from .models import (
     Resource, ResourceRelationship, ResourceSearch, ResourceGraph, 
@@ -11,6 +11,17 @@ from .models import (
 )
 
 
+# Max ids per $in query when walking the resource graph
+GRAPH_IN_CHUNK = 1000
+# Cursor batch size for large tenant scans
+CURSOR_BATCH_SIZE = 1000
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
 class CMDBStore:
     """CMDB data store using MongoDB"""
     
@@ -20,6 +31,8 @@ class CMDBStore:
         self.resources = self.db.resources
         self.relationships = self.db.relationships
         self.discovery_logs = self.db.discovery_logs
+        # Materialized per-tenant stats (one document per tenant, _id = tenant_id)
+        self.stats = self.db.cmdb_stats
         
         # Create indexes for performance
         self._create_indexes()
@@ -27,6 +40,8 @@ class CMDBStore:
     def _create_indexes(self):
         """Create database indexes for optimal query performance"""
         # Resource indexes
+        self.resources.create_index([("id", ASCENDING)])
+        self.resources.create_index([("tenant_id", ASCENDING), ("id", ASCENDING)])
         self.resources.create_index([("tenant_id", ASCENDING)])
         self.resources.create_index([("cloud_provider", ASCENDING)])
         self.resources.create_index([("resource_type", ASCENDING)])
@@ -56,11 +71,13 @@ class CMDBStore:
             resource_dict = resource.dict()
             resource_dict["last_updated"] = datetime.utcnow()
             
-            result = await self.resources.replace_one(
+            previous = await self.resources.find_one_and_replace(
                 {"id": resource.id},
                 resource_dict,
-                upsert=True
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
             )
+            await self._apply_stats_change(previous, resource_dict)
             return True
         except Exception as e:
             print(f"Error upserting resource {resource.id}: {e}")
@@ -77,46 +94,50 @@ class CMDBStore:
             print(f"Error getting resource {resource_id}: {e}")
             return None
     
+    @staticmethod
+    def _build_search_filter(search: ResourceSearch) -> Dict[str, Any]:
+        """Translate a ResourceSearch into a MongoDB filter"""
+        filter_query = {}
+        
+        if search.tenant_id:
+            filter_query["tenant_id"] = search.tenant_id
+        if search.cloud_provider:
+            filter_query["cloud_provider"] = search.cloud_provider
+        if search.resource_type:
+            filter_query["resource_type"] = search.resource_type
+        if search.region:
+            filter_query["region"] = search.region
+        if search.account_id:
+            filter_query["account_id"] = search.account_id
+        if search.owner:
+            filter_query["owner"] = search.owner
+        if search.team:
+            filter_query["team"] = search.team
+        if search.project:
+            filter_query["project"] = search.project
+        if search.public_exposure is not None:
+            filter_query["public_exposure"] = search.public_exposure
+        if search.compliance_status:
+            filter_query["compliance_status"] = search.compliance_status
+        if search.tags:
+            for key, value in search.tags.items():
+                filter_query[f"tags.{key}"] = value
+        
+        # Cost range filter
+        if search.cost_min is not None or search.cost_max is not None:
+            cost_filter = {}
+            if search.cost_min is not None:
+                cost_filter["$gte"] = search.cost_min
+            if search.cost_max is not None:
+                cost_filter["$lte"] = search.cost_max
+            filter_query["monthly_cost"] = cost_filter
+        
+        return filter_query
+
     async def search_resources(self, search: ResourceSearch, limit: int = 100) -> List[Resource]:
         """Search resources based on criteria"""
         try:
-            # Build query filter
-            filter_query = {}
-            
-            if search.tenant_id:
-                filter_query["tenant_id"] = search.tenant_id
-            if search.cloud_provider:
-                filter_query["cloud_provider"] = search.cloud_provider
-            if search.resource_type:
-                filter_query["resource_type"] = search.resource_type
-            if search.region:
-                filter_query["region"] = search.region
-            if search.account_id:
-                filter_query["account_id"] = search.account_id
-            if search.owner:
-                filter_query["owner"] = search.owner
-            if search.team:
-                filter_query["team"] = search.team
-            if search.project:
-                filter_query["project"] = search.project
-            if search.public_exposure is not None:
-                filter_query["public_exposure"] = search.public_exposure
-            if search.compliance_status:
-                filter_query["compliance_status"] = search.compliance_status
-            if search.tags:
-                for key, value in search.tags.items():
-                    filter_query[f"tags.{key}"] = value
-            
-            # Cost range filter
-            if search.cost_min is not None or search.cost_max is not None:
-                cost_filter = {}
-                if search.cost_min is not None:
-                    cost_filter["$gte"] = search.cost_min
-                if search.cost_max is not None:
-                    cost_filter["$lte"] = search.cost_max
-                filter_query["monthly_cost"] = cost_filter
-            
-            cursor = self.resources.find(filter_query).limit(limit)
+            cursor = self.resources.find(self._build_search_filter(search)).limit(limit)
             resources = []
             async for doc in cursor:
                 resources.append(Resource(**doc))
@@ -125,6 +146,100 @@ class CMDBStore:
         except Exception as e:
             print(f"Error searching resources: {e}")
             return []
+
+    async def search_resources_iter(
+        self,
+        search: ResourceSearch,
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: int = CURSOR_BATCH_SIZE,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """Stream matching resources without materializing the result set.
+
+        Yields ``Resource`` models, or raw dicts when a ``projection`` is given
+        (partial documents would not validate). Memory use is bounded by the
+        cursor ``batch_size`` regardless of how many resources match.
+        """
+        cursor = self.resources.find(self._build_search_filter(search), projection).batch_size(batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+        async for doc in cursor:
+            if projection is not None:
+                doc.pop("_id", None)
+                yield doc
+                continue
+            try:
+                yield Resource(**doc)
+            except Exception as e:
+                print(f"Skipping invalid resource {doc.get('id')}: {e}")
+
+    async def _bulk_replace(self, collection, items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                            batch_size: int) -> Dict[str, Any]:
+        """Unordered ReplaceOne(upsert) batches; errors are reported per input index"""
+        result: Dict[str, Any] = {"matched": 0, "modified": 0, "upserted": 0, "errors": []}
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            ops = [ReplaceOne(key, doc, upsert=True) for key, doc in batch]
+            try:
+                res = await collection.bulk_write(ops, ordered=False)
+                details = {
+                    "nMatched": res.matched_count,
+                    "nModified": res.modified_count,
+                    "nUpserted": res.upserted_count,
+                    "writeErrors": []
+                }
+            except BulkWriteError as e:
+                details = e.details
+            except Exception as e:
+                details = {"writeErrors": [{"index": i, "errmsg": str(e)} for i in range(len(batch))]}
+            result["matched"] += details.get("nMatched", 0)
+            result["modified"] += details.get("nModified", 0)
+            result["upserted"] += details.get("nUpserted", 0)
+            for err in details.get("writeErrors", []):
+                idx = start + err.get("index", 0)
+                result["errors"].append({
+                    "index": idx,
+                    "key": items[idx][0],
+                    "error": err.get("errmsg", "unknown error")
+                })
+        return result
+
+    async def bulk_upsert_resources(self, resources: List[Resource], batch_size: int = 1000) -> Dict[str, Any]:
+        """Upsert many resources with unordered bulk writes.
+
+        Returns matched/modified/upserted counts and an ``errors`` list of
+        ``{"index", "key", "error"}`` entries for the items that failed.
+        Materialized stats of every touched tenant are rebuilt once afterwards.
+        """
+        now = datetime.utcnow()
+        items = []
+        for resource in resources:
+            doc = resource.dict()
+            doc["last_updated"] = now
+            items.append(({"id": resource.id}, doc))
+        result = await self._bulk_replace(self.resources, items, batch_size)
+        for tenant_id in {r.tenant_id for r in resources}:
+            try:
+                await self.refresh_tenant_stats(tenant_id)
+            except Exception as e:
+                print(f"Error refreshing CMDB stats for {tenant_id}: {e}")
+        return result
+
+    async def bulk_upsert_relationships(self, relationships: List[ResourceRelationship],
+                                        batch_size: int = 1000) -> Dict[str, Any]:
+        """Upsert many relationships with unordered bulk writes (same result shape as bulk_upsert_resources)"""
+        items = [
+            (
+                {
+                    "source_id": rel.source_id,
+                    "target_id": rel.target_id,
+                    "relationship_type": rel.relationship_type
+                },
+                rel.dict()
+            )
+            for rel in relationships
+        ]
+        return await self._bulk_replace(self.relationships, items, batch_size)
     
     async def get_resources_by_tenant(self, tenant_id: str, limit: int = 1000) -> List[Resource]:
         """Get all resources for a tenant"""
@@ -206,33 +321,114 @@ class CMDBStore:
             print(f"Error getting relationships for {resource_id}: {e}")
             return []
     
-    async def build_resource_graph(self, tenant_id: str, max_depth: int = 3) -> ResourceGraph:
+    async def stream_resource_graph(
+        self,
+        tenant_id: str,
+        max_depth: int = 3,
+        root_ids: Optional[List[str]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream a tenant's resource graph as ("node", Resource) / ("edge", ResourceRelationship) items.
+
+        Breadth-first from ``root_ids`` (or from every tenant resource when no
+        roots are given), one batched ``$in`` relationship query per frontier
+        chunk and one ``$in`` resource fetch for newly reached nodes, up to
+        ``max_depth`` hops. Each edge is emitted once, and only when both
+        endpoints belong to the tenant.
+        """
+        visited: set = set()
+        seen_edges: set = set()
+        frontier: List[str] = []
+        all_tenant = not root_ids
+
+        root_filter: Dict[str, Any] = {"tenant_id": tenant_id}
+        if root_ids:
+            root_filter["id"] = {"$in": list(root_ids)}
+        async for doc in self.resources.find(root_filter).batch_size(CURSOR_BATCH_SIZE):
+            try:
+                resource = Resource(**doc)
+            except Exception as e:
+                print(f"Skipping invalid resource {doc.get('id')}: {e}")
+                continue
+            visited.add(resource.id)
+            frontier.append(resource.id)
+            yield "node", resource
+
+        depth = 0
+        while frontier and depth < max_depth:
+            frontier_set = set(frontier)
+            pending_edges: List[ResourceRelationship] = []
+            reached: set = set()
+            for chunk in _chunks(frontier, GRAPH_IN_CHUNK):
+                cursor = self.relationships.find({
+                    "$or": [
+                        {"source_id": {"$in": chunk}},
+                        {"target_id": {"$in": chunk}}
+                    ]
+                }).batch_size(CURSOR_BATCH_SIZE)
+                async for doc in cursor:
+                    key = (doc.get("source_id"), doc.get("target_id"), doc.get("relationship_type"))
+                    if key in seen_edges:
+                        continue
+                    seen_edges.add(key)
+                    try:
+                        rel = ResourceRelationship(**doc)
+                    except Exception:
+                        continue
+                    pending_edges.append(rel)
+                    for endpoint in (rel.source_id, rel.target_id):
+                        if endpoint not in visited and endpoint not in frontier_set:
+                            reached.add(endpoint)
+
+            next_frontier: List[str] = []
+            # every tenant resource is already a node when walking the whole tenant
+            if reached and not all_tenant:
+                for chunk in _chunks(list(reached), GRAPH_IN_CHUNK):
+                    cursor = self.resources.find(
+                        {"tenant_id": tenant_id, "id": {"$in": chunk}}
+                    ).batch_size(CURSOR_BATCH_SIZE)
+                    async for doc in cursor:
+                        try:
+                            resource = Resource(**doc)
+                        except Exception:
+                            continue
+                        if resource.id in visited:
+                            continue
+                        visited.add(resource.id)
+                        next_frontier.append(resource.id)
+                        yield "node", resource
+
+            for rel in pending_edges:
+                if rel.source_id in visited and rel.target_id in visited:
+                    yield "edge", rel
+
+            frontier = next_frontier
+            depth += 1
+
+    async def build_resource_graph(
+        self,
+        tenant_id: str,
+        max_depth: int = 3,
+        root_ids: Optional[List[str]] = None
+    ) -> ResourceGraph:
         """Build a resource graph for a tenant"""
         try:
-            # Get all resources for the tenant
-            resources = await self.get_resources_by_tenant(tenant_id)
-            resource_map = {r.id: r for r in resources}
-            
-            # Get all relationships
-            all_relationships = []
-            for resource in resources:
-                relationships = await self.get_resource_relationships(resource.id)
-                all_relationships.extend(relationships)
-            
-            # Filter relationships to only include resources in our tenant
-            filtered_relationships = [
-                rel for rel in all_relationships
-                if rel.source_id in resource_map and rel.target_id in resource_map
-            ]
-            
+            nodes: List[Resource] = []
+            edges: List[ResourceRelationship] = []
+            async for kind, item in self.stream_resource_graph(tenant_id, max_depth=max_depth, root_ids=root_ids):
+                if kind == "node":
+                    nodes.append(item)
+                else:
+                    edges.append(item)
+
             return ResourceGraph(
-                nodes=resources,
-                edges=filtered_relationships,
+                nodes=nodes,
+                edges=edges,
                 metadata={
                     "tenant_id": tenant_id,
                     "max_depth": max_depth,
-                    "total_nodes": len(resources),
-                    "total_edges": len(filtered_relationships),
+                    "root_ids": root_ids or [],
+                    "total_nodes": len(nodes),
+                    "total_edges": len(edges),
                     "generated_at": datetime.utcnow().isoformat()
                 }
             )
@@ -240,111 +436,196 @@ class CMDBStore:
             print(f"Error building resource graph: {e}")
             return ResourceGraph(nodes=[], edges=[], metadata={})
     
-    async def get_cmdb_stats(self, tenant_id: Optional[str] = None) -> CMDBStats:
-        """Get CMDB statistics"""
-        try:
-            # Build aggregation pipeline
-            match_stage = {}
-            if tenant_id:
-                match_stage["tenant_id"] = tenant_id
-            
-            pipeline = [
-                {"$match": match_stage} if match_stage else {"$match": {}},
-                {
-                    "$group": {
-                        "_id": None,
-                        "total_resources": {"$sum": 1},
-                        "resources_by_provider": {
-                            "$push": "$cloud_provider"
-                        },
-                        "resources_by_type": {
-                            "$push": "$resource_type"
-                        },
-                        "resources_by_tenant": {
-                            "$push": "$tenant_id"
-                        },
-                        "public_resources": {
-                            "$sum": {"$cond": ["$public_exposure", 1, 0]}
-                        },
-                        "compliance_issues": {
-                            "$sum": {
-                                "$cond": [
-                                    {"$ne": ["$compliance_status", "compliant"]},
-                                    1,
-                                    0
-                                ]
-                            }
-                        },
-                        "total_monthly_cost": {
-                            "$sum": {"$ifNull": ["$monthly_cost", 0]}
-                        },
-                        "untagged_resources": {
-                            "$sum": {
-                                "$cond": [
-                                    {
-                                        "$or": [
-                                            {"$eq": ["$tags", {}]},
-                                            {"$eq": ["$tags", None]},
-                                            {"$eq": ["$owner", None]},
-                                            {"$eq": ["$team", None]},
-                                            {"$eq": ["$project", None]}
+    @staticmethod
+    def _stats_match(tenant_id: Optional[str]) -> Dict[str, Any]:
+        return {"tenant_id": tenant_id} if tenant_id else {}
+
+    @staticmethod
+    def _stats_pipeline(match_stage: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """$facet pipeline that returns only aggregate counts, never per-resource values"""
+        def is_null(field: str) -> Dict[str, Any]:
+            return {"$eq": [{"$ifNull": [field, None]}, None]}
+
+        return [
+            {"$match": match_stage},
+            {
+                "$facet": {
+                    "totals": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "total_resources": {"$sum": 1},
+                                "public_resources": {
+                                    "$sum": {"$cond": ["$public_exposure", 1, 0]}
+                                },
+                                "compliance_issues": {
+                                    "$sum": {
+                                        "$cond": [
+                                            {"$ne": ["$compliance_status", "compliant"]},
+                                            1,
+                                            0
+                                        ]
+                                    }
+                                },
+                                "total_monthly_cost": {
+                                    "$sum": {"$ifNull": ["$monthly_cost", 0]}
+                                },
+                                "untagged_resources": {
+                                    "$sum": {
+                                        "$cond": [
+                                            {
+                                                "$or": [
+                                                    {"$eq": ["$tags", {}]},
+                                                    is_null("$tags"),
+                                                    is_null("$owner"),
+                                                    is_null("$team"),
+                                                    is_null("$project")
+                                                ]
+                                            },
+                                            1,
+                                            0
                                         ]
-                                    },
-                                    1,
-                                    0
-                                ]
+                                    }
+                                }
                             }
                         }
-                    }
+                    ],
+                    "by_provider": [{"$group": {"_id": "$cloud_provider", "count": {"$sum": 1}}}],
+                    "by_type": [{"$group": {"_id": "$resource_type", "count": {"$sum": 1}}}],
+                    "by_tenant": [{"$group": {"_id": "$tenant_id", "count": {"$sum": 1}}}]
                 }
-            ]
-            
-            result = await self.resources.aggregate(pipeline).to_list(1)
-            
-            if result:
-                stats = result[0]
-                return CMDBStats(
-                    total_resources=stats["total_resources"],
-                    resources_by_provider=self._count_values(stats["resources_by_provider"]),
-                    resources_by_type=self._count_values(stats["resources_by_type"]),
-                    resources_by_tenant=self._count_values(stats["resources_by_tenant"]),
-                    public_resources=stats["public_resources"],
-                    compliance_issues=stats["compliance_issues"],
-                    total_monthly_cost=stats["total_monthly_cost"],
-                    untagged_resources=stats["untagged_resources"]
+            }
+        ]
+
+    @staticmethod
+    def _empty_stats() -> CMDBStats:
+        return CMDBStats(
+            total_resources=0,
+            resources_by_provider={},
+            resources_by_type={},
+            resources_by_tenant={},
+            public_resources=0,
+            compliance_issues=0,
+            total_monthly_cost=0.0,
+            untagged_resources=0
+        )
+
+    async def _aggregate_stats(self, tenant_id: Optional[str]) -> Dict[str, Any]:
+        """Compute raw stats for a tenant (or globally) with the $facet pipeline"""
+        result = await self.resources.aggregate(self._stats_pipeline(self._stats_match(tenant_id))).to_list(1)
+        facets = result[0] if result else {}
+        totals = (facets.get("totals") or [{}])[0]
+
+        def bucket(name: str) -> Dict[str, int]:
+            return {row["_id"]: row["count"] for row in facets.get(name, []) if row.get("_id") is not None}
+
+        return {
+            "total_resources": totals.get("total_resources", 0),
+            "by_provider": bucket("by_provider"),
+            "by_type": bucket("by_type"),
+            "by_tenant": bucket("by_tenant"),
+            "public_resources": totals.get("public_resources", 0),
+            "compliance_issues": totals.get("compliance_issues", 0),
+            "total_monthly_cost": totals.get("total_monthly_cost", 0.0),
+            "untagged_resources": totals.get("untagged_resources", 0)
+        }
+
+    async def refresh_tenant_stats(self, tenant_id: str) -> Dict[str, Any]:
+        """Recompute and store the materialized stats document for a tenant"""
+        raw = await self._aggregate_stats(tenant_id)
+        doc = {k: v for k, v in raw.items() if k != "by_tenant"}
+        doc["updated_at"] = datetime.utcnow()
+        await self.stats.replace_one({"_id": tenant_id}, doc, upsert=True)
+        return doc
+
+    @staticmethod
+    def _stats_contribution(doc: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        """Counter paths a single resource document contributes to its tenant's stats"""
+        if not doc:
+            return {}
+        tags = doc.get("tags")
+        untagged = (not tags) or any(doc.get(f) is None for f in ("owner", "team", "project"))
+        provider = getattr(doc.get("cloud_provider"), "value", doc.get("cloud_provider"))
+        resource_type = getattr(doc.get("resource_type"), "value", doc.get("resource_type"))
+        return {
+            "total_resources": 1,
+            f"by_provider.{provider}": 1,
+            f"by_type.{resource_type}": 1,
+            "public_resources": 1 if doc.get("public_exposure") else 0,
+            "compliance_issues": 1 if doc.get("compliance_status") != "compliant" else 0,
+            "total_monthly_cost": doc.get("monthly_cost") or 0.0,
+            "untagged_resources": 1 if untagged else 0
+        }
+
+    async def _apply_stats_change(self, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        """Apply the delta between two versions of a resource to the materialized stats.
+
+        Only tenants whose stats document already exists are updated; a missing
+        document is built from scratch by the next get_cmdb_stats call.
+        """
+        deltas: Dict[str, Dict[str, float]] = {}
+        for doc, sign in ((before, -1), (after, 1)):
+            if not doc or not doc.get("tenant_id"):
+                continue
+            tenant_delta = deltas.setdefault(doc["tenant_id"], {})
+            for path, value in self._stats_contribution(doc).items():
+                tenant_delta[path] = tenant_delta.get(path, 0) + sign * value
+        for tenant_id, delta in deltas.items():
+            delta = {k: v for k, v in delta.items() if v}
+            if not delta:
+                continue
+            try:
+                await self.stats.update_one(
+                    {"_id": tenant_id},
+                    {"$inc": delta, "$set": {"updated_at": datetime.utcnow()}}
                 )
-            
+            except Exception as e:
+                print(f"Error updating CMDB stats for {tenant_id}: {e}")
+
+    async def get_cmdb_stats(self, tenant_id: Optional[str] = None) -> CMDBStats:
+        """Get CMDB statistics.
+
+        A tenant's stats are a single read of its materialized document. Global
+        stats run the $facet pipeline, since tenants only get a stats document
+        once their stats are first requested.
+        """
+        try:
+            if tenant_id:
+                doc = await self.stats.find_one({"_id": tenant_id})
+                if doc is None:
+                    doc = await self.refresh_tenant_stats(tenant_id)
+                by_tenant = {tenant_id: doc["total_resources"]} if doc.get("total_resources") else {}
+            else:
+                doc = await self._aggregate_stats(None)
+                by_tenant = doc["by_tenant"]
+
             return CMDBStats(
-                total_resources=0,
-                resources_by_provider={},
-                resources_by_type={},
-                resources_by_tenant={},
-                public_resources=0,
-                compliance_issues=0,
-                total_monthly_cost=0.0,
-                untagged_resources=0
+                total_resources=doc.get("total_resources", 0) or 0,
+                resources_by_provider={k: v for k, v in (doc.get("by_provider") or {}).items() if v},
+                resources_by_type={k: v for k, v in (doc.get("by_type") or {}).items() if v},
+                resources_by_tenant=by_tenant,
+                public_resources=doc.get("public_resources", 0) or 0,
+                compliance_issues=doc.get("compliance_issues", 0) or 0,
+                total_monthly_cost=doc.get("total_monthly_cost", 0.0) or 0.0,
+                untagged_resources=doc.get("untagged_resources", 0) or 0
             )
             
         except Exception as e:
             print(f"Error getting CMDB stats: {e}")
-            return CMDBStats(
-                total_resources=0,
-                resources_by_provider={},
-                resources_by_type={},
-                resources_by_tenant={},
-                public_resources=0,
-                compliance_issues=0,
-                total_monthly_cost=0.0,
-                untagged_resources=0
-            )
-    
-    def _count_values(self, values: List[str]) -> Dict[str, int]:
-        """Count occurrences of values in a list"""
-        counts = {}
-        for value in values:
-            counts[value] = counts.get(value, 0) + 1
-        return counts
+            return self._empty_stats()
     
+    async def delete_resource(self, resource_id: str) -> bool:
+        """Delete a resource and remove it from the tenant stats"""
+        try:
+            previous = await self.resources.find_one_and_delete({"id": resource_id})
+            if previous is None:
+                return False
+            await self._apply_stats_change(previous, None)
+            return True
+        except Exception as e:
+            print(f"Error deleting resource {resource_id}: {e}")
+            return False
+
     async def log_discovery(self, tenant_id: str, cloud_provider: CloudProvider, 
                            status: str, details: Dict[str, Any]) -> bool:
         """Log discovery operation"""
@@ -372,6 +653,8 @@ class CMDBStore:
                 "tenant_id": tenant_id,
                 "last_updated": {"$lt": cutoff_date}
             })
+            if result.deleted_count:
+                await self.refresh_tenant_stats(tenant_id)
             
             return result.deleted_count
         except Exception as e:
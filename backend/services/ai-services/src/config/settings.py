@@ -200,6 +200,11 @@ class Settings(BaseSettings):
     plugin_marketplace_enabled: bool = True
     plugin_auto_update: bool = False
     plugin_scan_interval: int = 3600
+    plugin_execution_mode: str = "thread"  # in_loop, thread or subprocess for marketplace plugins
+    plugin_max_concurrency: int = 4
+    plugin_timeout_seconds: float = 30.0
+    plugin_circuit_failure_threshold: int = 5
+    plugin_circuit_reset_seconds: float = 60.0
 
     # RAG Settings
     rag_enabled: bool = True
@@ -207,12 +212,44 @@ class Settings(BaseSettings):
     rag_chunk_overlap: int = 200
     rag_max_results: int = 10
     rag_similarity_threshold: float = 0.7
+    rag_embedding_model: str = "all-MiniLM-L6-v2"
+    rag_embedding_batch_size: int = 64
+    rag_embedding_workers: int = 0  # >0 encodes large batches on a process pool
+    rag_embedding_cache_path: str = "data/embedding_cache.sqlite3"  # empty disables the cache
+    rag_upsert_batch_size: int = 256
+    rag_query_embedding_cache_size: int = 2048
+    rag_result_cache_size: int = 1024
+    rag_result_cache_ttl_seconds: float = 30.0  # 0 disables the result cache
+    rag_vector_backend: str = "qdrant"  # qdrant or local; local is also used when qdrant-client is missing
+    rag_local_index_path: str = ""  # directory to persist the local index in; empty keeps it in memory
+    rag_local_index_mode: str = "exact"  # exact or ivf
+    rag_local_ivf_nprobe: int = 8
+    rag_local_ivf_min_points: int = 20000
+    rag_retrieval_mode: str = "hybrid"  # hybrid (dense + BM25 fused) or dense
+    rag_lexical_index_path: str = ""  # BM25 index file for the qdrant backend; empty rebuilds it from qdrant on startup
+    rag_hybrid_candidates: int = 50  # per-retriever candidates fed into the fusion
+    rag_rrf_k: int = 60
+    rag_rerank_enabled: bool = False
+    rag_rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rag_rerank_candidates: int = 20
+    rag_rerank_cache_size: int = 8192
+
+    # LangGraph Settings
+    langgraph_checkpoint_backend: str = "memory"  # memory, sqlite or mongo
+    langgraph_checkpoint_path: str = "data/langgraph_checkpoints.sqlite3"
 
     # IaC Settings
     iac_enabled: bool = True
     iac_providers: List[str] = ["terraform", "pulumi", "cloudformation", "bicep"]
     iac_validation_enabled: bool = True
     iac_cost_estimation_enabled: bool = True
+    iac_plugin_cache_dir: str = "data/terraform-plugin-cache"  # shared TF_PLUGIN_CACHE_DIR; empty disables
+    iac_validation_cache_size: int = 256
+    iac_validation_cache_ttl_seconds: float = 3600.0  # 0 disables the validation cache
+    iac_terraform_timeout_seconds: float = 300.0
+    iac_checkov_timeout_seconds: float = 180.0
+    iac_tfsec_timeout_seconds: float = 120.0
+    iac_trivy_timeout_seconds: float = 120.0
 
     # CORS Settings
     cors_origins: List[str] = [
@@ -5,7 +5,7 @@ Provides natural, context-aware responses based on conversation history and user
 
 import json
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -141,6 +141,58 @@ class ContextAwareResponseManager:
             print(f"Error generating context-aware response: {e}")
             return agent_response  # Fallback to original response
 
+    async def stream_context_aware_response(
+        self, 
+        message: str, 
+        agent_response: str, 
+        user_id: str, 
+        session_id: str,
+        agent_type: str = None,
+        additional_context: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_context_aware_response: yields the enhanced
+        response as text deltas while the model generates it
+        """
+        try:
+            user_context = self._get_or_create_user_context(user_id)
+            conv_context = self._get_or_create_conversation_context(session_id, user_id)
+            self._update_contexts(message, agent_response, user_context, conv_context, agent_type)
+        except Exception as e:
+            print(f"Error generating context-aware response: {e}")
+            yield agent_response
+            return
+        
+        if not self.openai_client:
+            yield self._apply_basic_context_enhancement(agent_response, user_context, conv_context)
+            return
+        
+        parts = []
+        try:
+            stream = await self.openai_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=self._build_enhancement_messages(message, agent_response, user_context, conv_context),
+                max_tokens=800,
+                temperature=0.3,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            print(f"Error in AI response enhancement: {e}")
+            if not parts:
+                yield self._apply_basic_context_enhancement(agent_response, user_context, conv_context)
+                return
+        
+        # Personalized recommendations are appended after the streamed text
+        streamed = "".join(parts)
+        completed = self._add_personalized_recommendations(streamed, user_context, conv_context)
+        if len(completed) > len(streamed):
+            yield completed[len(streamed):]
+
     def _get_or_create_user_context(self, user_id: str) -> UserContext:
         """Get existing user context or create new one"""
         if user_id not in self.user_contexts:
@@ -278,15 +330,44 @@ class ContextAwareResponseManager:
             if not self.openai_client:
                 return self._apply_basic_context_enhancement(agent_response, user_context, conv_context)
             
-            # Get conversation history summary
-            recent_messages = conv_context.messages[-5:] if len(conv_context.messages) > 5 else conv_context.messages
-            conversation_history = "\n".join([
-                f"User: {msg['user_message']}\nAgent: {msg['agent_response'][:100]}..."
-                for msg in recent_messages
-            ])
+            response = await self.openai_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=self._build_enhancement_messages(message, agent_response, user_context, conv_context),
+                max_tokens=800,
+                temperature=0.3
+            )
+            
+            enhanced_response = response.choices[0].message.content.strip()
+            
+            # Add personalized recommendations if appropriate
+            enhanced_response = self._add_personalized_recommendations(
+                enhanced_response, user_context, conv_context
+            )
+            
+            return enhanced_response
             
-            # Build context-aware enhancement prompt
-            enhancement_prompt = f"""
+        except Exception as e:
+            print(f"Error in AI response enhancement: {e}")
+            return self._apply_basic_context_enhancement(agent_response, user_context, conv_context)
+
+    def _build_enhancement_messages(
+        self, 
+        message: str, 
+        agent_response: str, 
+        user_context: UserContext, 
+        conv_context: ConversationContext
+    ) -> List[Dict[str, str]]:
+        """Chat messages asking the model to personalize an agent response"""
+        
+        # Get conversation history summary
+        recent_messages = conv_context.messages[-5:] if len(conv_context.messages) > 5 else conv_context.messages
+        conversation_history = "\n".join([
+            f"User: {msg['user_message']}\nAgent: {msg['agent_response'][:100]}..."
+            for msg in recent_messages
+        ])
+        
+        # Build context-aware enhancement prompt
+        enhancement_prompt = f"""
 Enhance this DevOps assistant response to be more context-aware and personalized.
 
 User Profile:
@@ -312,29 +393,11 @@ Enhancement Guidelines:
 
 Enhanced Response (maintain all factual information, just improve presentation):
 """
-            
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a context-aware DevOps assistant that personalizes responses based on user context."},
-                    {"role": "user", "content": enhancement_prompt}
-                ],
-                max_tokens=800,
-                temperature=0.3
-            )
-            
-            enhanced_response = response.choices[0].message.content.strip()
-            
-            # Add personalized recommendations if appropriate
-            enhanced_response = self._add_personalized_recommendations(
-                enhanced_response, user_context, conv_context
-            )
-            
-            return enhanced_response
-            
-        except Exception as e:
-            print(f"Error in AI response enhancement: {e}")
-            return self._apply_basic_context_enhancement(agent_response, user_context, conv_context)
+        
+        return [
+            {"role": "system", "content": "You are a context-aware DevOps assistant that personalizes responses based on user context."},
+            {"role": "user", "content": enhancement_prompt}
+        ]
 
     def _apply_basic_context_enhancement(
         self, 
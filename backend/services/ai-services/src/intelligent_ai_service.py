@@ -8,11 +8,12 @@ import http.server
 import socketserver
 import json
 import asyncio
+import contextlib
 import os
 import signal
 import sys
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 import hmac
@@ -21,6 +22,11 @@ import base64
 import threading
 import time
 import uuid
+import queue
+import copy
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
 try:
     import jwt  # optional JWT verification
 except Exception:
@@ -31,9 +37,163 @@ except Exception:
     boto3 = None  # type: ignore
 load_dotenv()
 try:
-    from pymongo import MongoClient
+    from pymongo import MongoClient, UpdateOne
 except Exception:  # optional dependency
     MongoClient = None  # type: ignore
+    UpdateOne = None  # type: ignore
+try:
+    from utils.mongo_registry import mongo_registry
+except Exception:
+    mongo_registry = None  # type: ignore
+try:
+    from utils.rate_limiter import TokenBucket, build_rate_limiter
+    from utils.ttl_cache import TTLCache, build_idempotency_store
+    from utils.metrics import LatencyHistogram
+except Exception:
+    TokenBucket = None  # type: ignore
+    build_rate_limiter = None  # type: ignore
+    TTLCache = None  # type: ignore
+    build_idempotency_store = None  # type: ignore
+    LatencyHistogram = None  # type: ignore
+try:
+    from utils.cloud_cache import boto_client_pool, cloud_read_cache, fan_out
+except Exception:
+    boto_client_pool = None  # type: ignore
+    cloud_read_cache = None  # type: ignore
+    fan_out = None  # type: ignore
+
+
+def _aws_client(service: str, region: str = None):
+    """Shared boto3 client for (service, region) from the process-wide pool."""
+    if boto_client_pool is not None:
+        return boto_client_pool.client(service, region)
+    return boto3.client(service, region_name=region)
+
+
+def _invalidate_cloud_reads(*apis: str) -> None:
+    """Drop cached cloud listings after this service changed the resources behind them."""
+    if cloud_read_cache is not None:
+        for api in apis:
+            cloud_read_cache.invalidate(api)
+
+
+def _mongo_collection(name: str):
+    """Return a collection on the process-wide pooled client (None if Mongo is not configured)."""
+    if mongo_registry is not None:
+        return mongo_registry.get_collection(name)
+    mongo_uri = os.getenv('MONGODB_URI')
+    if mongo_uri and MongoClient:
+        return MongoClient(mongo_uri)[os.getenv('MONGODB_DB', 'inframind')][name]
+    return None
+
+INVENTORY_KEY_FIELDS = ('tenant_id', 'provider', 'account', 'region', 'resource_type', 'resource_id')
+
+
+class InventorySweep:
+    """Buffered, change-detecting writer for one discovery sweep.
+
+    Existing content hashes for the sweep scope are loaded up front, so a
+    resource whose normalized document is unchanged costs no write at all.
+    Changed documents are flushed with unordered bulk_write in batches of
+    INVENTORY_BULK_BATCH_SIZE, and finish() marks everything in scope that
+    was not seen as stale in a single batched update.
+    """
+
+    def __init__(self, col, tenant_id: str, provider: str, account: str = None, region: str = None, batch_size: int = None):
+        self.col = col
+        self.tenant_id = tenant_id
+        self.provider = provider
+        self.account = account
+        self.region = region
+        self.batch_size = batch_size or int(os.getenv('INVENTORY_BULK_BATCH_SIZE', '500'))
+        self._ops: list = []
+        self._seen: set = set()
+        self._failed_regions: set = set()
+        self._failed = False
+        self.stats = {'seen': 0, 'written': 0, 'unchanged': 0, 'stale_marked': 0, 'errors': 0}
+        self._known: Dict[tuple, Dict[str, Any]] = {}
+        if self.col is not None:
+            scope = {'tenant_id': tenant_id, 'provider': provider}
+            if account is not None:
+                scope['account'] = account
+            if region is not None:
+                scope['region'] = region
+            projection = {f: 1 for f in INVENTORY_KEY_FIELDS}
+            projection.update({'content_hash': 1, 'stale': 1})
+            for d in self.col.find(scope, projection):
+                self._known[self._key_tuple(d)] = {'_id': d.get('_id'), 'hash': d.get('content_hash'), 'stale': bool(d.get('stale'))}
+
+    @staticmethod
+    def _key_tuple(doc: Dict[str, Any]) -> tuple:
+        return tuple(doc.get(f) for f in INVENTORY_KEY_FIELDS)
+
+    @staticmethod
+    def content_hash(doc: Dict[str, Any]) -> str:
+        normalized = {k: v for k, v in doc.items() if k not in ('discovered_at', 'content_hash', 'stale', 'stale_since', '_id')}
+        return hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        doc = {**doc, 'tenant_id': self.tenant_id}
+        key = self._key_tuple(doc)
+        self._seen.add(key)
+        self.stats['seen'] += 1
+        digest = self.content_hash(doc)
+        known = self._known.get(key)
+        if known and known['hash'] == digest and not known['stale']:
+            self.stats['unchanged'] += 1
+            return
+        if self.col is None or UpdateOne is None:
+            return
+        now = datetime.now().isoformat()
+        filt = {f: doc.get(f) for f in INVENTORY_KEY_FIELDS}
+        self._ops.append(UpdateOne(
+            filt,
+            {'$set': {**doc, 'content_hash': digest, 'discovered_at': now, 'stale': False}, '$unset': {'stale_since': ''}},
+            upsert=True,
+        ))
+        if len(self._ops) >= self.batch_size:
+            self.flush()
+
+    def fail(self, region: str = None) -> None:
+        """Record that part of the sweep did not complete so it is never marked stale."""
+        if region is None:
+            self._failed = True
+        else:
+            self._failed_regions.add(region)
+
+    def flush(self) -> None:
+        if not self._ops:
+            return
+        ops, self._ops = self._ops, []
+        try:
+            res = self.col.bulk_write(ops, ordered=False)
+            self.stats['written'] += (res.upserted_count or 0) + (res.modified_count or 0)
+        except Exception as e:
+            # unordered: everything except the reported failures was applied
+            details = getattr(e, 'details', None) or {}
+            errors = len(details.get('writeErrors', [])) if details else len(ops)
+            self.stats['errors'] += errors
+            self.stats['written'] += (details.get('nUpserted', 0) + details.get('nModified', 0)) if details else 0
+
+    def finish(self) -> Dict[str, int]:
+        self.flush()
+        if self.col is None or self._failed:
+            return self.stats
+        region_idx = INVENTORY_KEY_FIELDS.index('region')
+        missing = [
+            meta['_id'] for key, meta in self._known.items()
+            if key not in self._seen and not meta['stale'] and key[region_idx] not in self._failed_regions
+        ]
+        now = datetime.now().isoformat()
+        for i in range(0, len(missing), self.batch_size * 10):
+            chunk = missing[i:i + self.batch_size * 10]
+            try:
+                res = self.col.update_many({'_id': {'$in': chunk}}, {'$set': {'stale': True, 'stale_since': now}})
+                self.stats['stale_marked'] += res.modified_count or 0
+            except Exception:
+                self.stats['errors'] += len(chunk)
+        return self.stats
+
 
 # In-memory fallback incident store if MongoDB is not configured
 INCIDENT_STORE: Dict[str, Dict[str, Any]] = {}
@@ -42,13 +202,15 @@ import requests
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI for natural language processing
-import openai
+# Shared LLM gateway for natural language processing (pooled connections, concurrency limits, response cache)
 openai_client = None
 try:
-    openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    from utils.llm_gateway import llm_gateway, llm_tenant_scope
+    openai_client = llm_gateway.client('intelligent_ai_service')
 except Exception as e:
-    print(f"Warning: OpenAI client initialization failed: {e}")
+    llm_gateway = None  # type: ignore
+    llm_tenant_scope = None  # type: ignore
+    print(f"Warning: LLM gateway initialization failed: {e}")
 
 # Import enhanced orchestration and dialogue components
 try:
@@ -69,6 +231,7 @@ except ImportError as e:
         def __init__(self, client): 
             self.conversation_contexts = {}
         async def generate_context_aware_response(self, msg, resp, uid, sid, agent_type): return resp
+        async def stream_context_aware_response(self, msg, resp, uid, sid, agent_type): yield resp
     
     class NaturalDialogueManager:
         def __init__(self, client): pass
@@ -245,9 +408,9 @@ config_client = boto3.client('config')
 conversation_states = {}
 
 # Initialize enhanced AI orchestration components
-workflow_orchestrator = MultiAgentWorkflowOrchestrator(openai_client)
-context_manager = ContextAwareResponseManager(openai_client)
-dialogue_manager = NaturalDialogueManager(openai_client)
+workflow_orchestrator = MultiAgentWorkflowOrchestrator(llm_gateway.client('workflow_orchestrator') if llm_gateway else None)
+context_manager = ContextAwareResponseManager(llm_gateway.client('context_manager') if llm_gateway else None)
+dialogue_manager = NaturalDialogueManager(llm_gateway.client('dialogue_manager') if llm_gateway else None)
 
 # Agent Registry - All 28+ specialized agents
 AGENT_REGISTRY = {
@@ -314,28 +477,136 @@ AGENT_REGISTRY = {
     'security_whisperer': 'SecurityWhispererAgent'
 }
 
+# --- Intent classification fast path ---
+# Seed phrases per intent for the local classifier (mirrors the few-shot examples in the OpenAI prompt)
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    'cost_analysis': ['show my costs', 'show me cost breakdown by service', 'what is my aws bill', 'monthly spending', 'billing summary', 'how much am i spending'],
+    'security_scan': ['scan for security vulnerabilities', 'run a security scan', 'check my security posture', 'security audit of my account'],
+    'security_report': ['generate security report', 'detailed security report', 'export security findings report'],
+    'infrastructure_health': ['check infrastructure health', 'system health status', 'is my infrastructure healthy', 'health check of resources'],
+    'ec2_listing': ['list my ec2 instances', 'show instances', 'show my servers', 'what ec2 instances do i have'],
+    'ec2_provisioning': ['create an ec2 instance', 'launch a new server', 'provision a virtual machine', 'spin up an instance'],
+    'ec2_management': ['stop all instances', 'start my instance', 'terminate the instance', 'reboot the server'],
+    's3_management': ['create s3 bucket', 'list my buckets', 'delete bucket', 'show s3 storage'],
+    'database_management': ['create mysql database', 'list rds databases', 'backup my database', 'create postgresql database'],
+    'load_balancer': ['set up application load balancer', 'list load balancers', 'create network load balancer'],
+    'auto_scaling': ['configure auto scaling', 'list auto scaling groups', 'scale out my fleet'],
+    'network_management': ['create vpc with private subnets', 'list my vpcs', 'show security groups', 'create subnet'],
+    'compliance_automation': ['run compliance audit', 'check compliance status', 'governance audit'],
+    'monitoring': ['monitor cpu usage for my instances', 'show cloudwatch metrics', 'monitoring dashboard'],
+    'container_scanning': ['scan containers for vulnerabilities', 'scan docker image', 'container image security scan'],
+    'secrets_detection': ['detect secrets in my repository', 'find leaked credentials', 'scan for hardcoded passwords'],
+    'pipeline_generation': ['generate ci/cd pipeline for my app', 'create github actions workflow', 'generate jenkins pipeline'],
+    'rca_analysis': ['analyze the incident root cause', 'investigate root cause', 'root cause analysis of outage'],
+    'predictive_analysis': ['predict future resource usage', 'forecast capacity', 'predict cost trend'],
+    'threat_detection': ['detect advanced threats', 'threat detection', 'hunt for threats'],
+    'zero_trust': ['implement zero trust', 'zero trust assessment'],
+    'incident_response': ['respond to security incident', 'incident response plan'],
+    'disaster_recovery': ['setup disaster recovery', 'disaster recovery plan', 'test dr failover'],
+    'cloud_migration': ['migrate to azure', 'cloud migration plan', 'migrate workloads to gcp'],
+    'multi_cloud_management': ['manage multi cloud resources', 'multi cloud overview'],
+}
+
+# Messages carrying concrete identifiers need the LLM's entity extraction, so never take the fast path for them
+_ENTITY_HINT_RE = re.compile(
+    r'\b(?:[a-z]{2}-[a-z]+-\d|i-[0-9a-f]{8,}|vpc-[0-9a-f]+|subnet-[0-9a-f]+|sg-[0-9a-f]+|[a-z]\d[a-z]?\.\w+)\b|\b(?:called|named)\b'
+)
+
+# Intents the local fast path and its cache may answer: read-only, with no entities beyond what the keyword
+# rules set. Mutating intents (s3_management, ec2_management, ...) always get the LLM's entity extraction.
+_LOCAL_INTENT_ALLOWLIST = frozenset({
+    'cost_analysis', 'ec2_listing', 'infrastructure_health', 'security_scan', 'security_report',
+})
+
+
+class LocalIntentClassifier:
+    """Tiny TF-IDF nearest-centroid classifier over INTENT_EXAMPLES.
+
+    Only used to confirm the keyword fallback: when both agree with enough
+    similarity the remote OpenAI call is skipped.
+    """
+
+    def __init__(self, examples: Dict[str, List[str]]):
+        docs = [(intent, self._features(text)) for intent, texts in examples.items() for text in texts]
+        df: Dict[str, int] = {}
+        for _, feats in docs:
+            for f in set(feats):
+                df[f] = df.get(f, 0) + 1
+        n = len(docs)
+        self.idf = {f: math.log((1 + n) / (1 + c)) + 1.0 for f, c in df.items()}
+        centroids: Dict[str, Dict[str, float]] = {}
+        for intent, feats in docs:
+            vec = self._vectorize(feats)
+            acc = centroids.setdefault(intent, {})
+            for f, w in vec.items():
+                acc[f] = acc.get(f, 0.0) + w
+        self.centroids = {intent: self._normalize(vec) for intent, vec in centroids.items()}
+
+    @staticmethod
+    def _features(text: str) -> List[str]:
+        tokens = re.findall(r'[a-z0-9/]+', text.lower())
+        return tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+
+    @staticmethod
+    def _normalize(vec: Dict[str, float]) -> Dict[str, float]:
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        return {f: w / norm for f, w in vec.items()}
+
+    def _vectorize(self, feats: List[str]) -> Dict[str, float]:
+        tf: Dict[str, float] = {}
+        for f in feats:
+            if f in self.idf:
+                tf[f] = tf.get(f, 0.0) + 1.0
+        return self._normalize({f: c * self.idf[f] for f, c in tf.items()})
+
+    def predict(self, text: str) -> tuple:
+        vec = self._vectorize(self._features(text))
+        best, best_sim = 'general_query', 0.0
+        for intent, centroid in self.centroids.items():
+            sim = sum(w * centroid.get(f, 0.0) for f, w in vec.items())
+            if sim > best_sim:
+                best, best_sim = intent, sim
+        return best, best_sim
+
+
+_local_intent_classifier = LocalIntentClassifier(INTENT_EXAMPLES)
+_intent_cache = TTLCache(
+    max_size=int(os.getenv('INTENT_CACHE_SIZE', '5000')),
+    ttl_sec=float(os.getenv('INTENT_CACHE_TTL_SEC', '3600')),
+) if TTLCache else None
+_intent_stage_latency = {stage: LatencyHistogram() for stage in ('cache', 'local', 'remote')} if LatencyHistogram else {}
+
+
 class IntelligentAIService(http.server.BaseHTTPRequestHandler):
-    # --- Simple in-memory rate limiter and idempotency cache ---
+    # --- Rate limiter and idempotency cache (O(1), bounded; RATE_LIMIT_BACKEND / IDEMPOTENCY_BACKEND=redis to share) ---
+    _rate_limiter = build_rate_limiter() if build_rate_limiter else None
+    _idempotency_store = build_idempotency_store() if build_idempotency_store else None
     _rate_limits: Dict[str, list] = {}
     _idempotency_cache: Dict[str, float] = {}
+    _fallback_lock = threading.Lock()
     _dead_letter: list = []
     _metrics: Dict[str, Dict[str, float]] = {
         'requests_total': {},
         'errors_total': {},
+        'rejected_total': {},
     }
+    _metrics_lock = threading.Lock()
 
     def _now_ts(self) -> float:
         return time.time()
 
     def _rate_limit_ok(self, key: str, limit: int = 60, window_sec: int = 60) -> bool:
-        bucket = self._rate_limits.setdefault(key, [])
-        cutoff = self._now_ts() - window_sec
-        # drop old
-        self._rate_limits[key] = [t for t in bucket if t >= cutoff]
-        if len(self._rate_limits[key]) >= limit:
-            return False
-        self._rate_limits[key].append(self._now_ts())
-        return True
+        if self._rate_limiter is not None:
+            return self._rate_limiter.allow(key, limit, window_sec)
+        with self._fallback_lock:
+            bucket = self._rate_limits.setdefault(key, [])
+            cutoff = self._now_ts() - window_sec
+            # drop old
+            self._rate_limits[key] = [t for t in bucket if t >= cutoff]
+            if len(self._rate_limits[key]) >= limit:
+                return False
+            self._rate_limits[key].append(self._now_ts())
+            return True
 
     def _verify_hmac(self, provided_sig: str, secret: str, body_bytes: bytes) -> bool:
         if not secret:
@@ -347,15 +618,18 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             return False
 
     def _idempotent(self, idem_key: str, ttl_sec: int = 300) -> bool:
-        now = self._now_ts()
-        # purge old
-        for k, ts in list(self._idempotency_cache.items()):
-            if now - ts > ttl_sec:
-                self._idempotency_cache.pop(k, None)
-        if idem_key in self._idempotency_cache:
-            return False
-        self._idempotency_cache[idem_key] = now
-        return True
+        if self._idempotency_store is not None:
+            return self._idempotency_store.add(idem_key, ttl_sec=ttl_sec)
+        with self._fallback_lock:
+            now = self._now_ts()
+            # purge old
+            for k, ts in list(self._idempotency_cache.items()):
+                if now - ts > ttl_sec:
+                    self._idempotency_cache.pop(k, None)
+            if idem_key in self._idempotency_cache:
+                return False
+            self._idempotency_cache[idem_key] = now
+            return True
 
     # --- Auth helpers (JWT, multi-tenant) ---
     def _parse_bearer(self) -> Dict[str, Any]:
@@ -394,9 +668,11 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
         if not any(r in roles for r in required):
             raise PermissionError('forbidden')
 
-    def _inc_metric(self, name: str, label: str) -> None:
-        bucket = self._metrics.setdefault(name, {})
-        bucket[label] = bucket.get(label, 0.0) + 1.0
+    @classmethod
+    def _inc_metric(cls, name: str, label: str) -> None:
+        with cls._metrics_lock:
+            bucket = cls._metrics.setdefault(name, {})
+            bucket[label] = bucket.get(label, 0.0) + 1.0
 
     # --- AWS Secrets/KMS helpers ---
     def _secrets_client(self):
@@ -441,12 +717,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
 
     def _audit_log(self, event: str, actor: Dict[str, Any], data: Dict[str, Any]):
         try:
-            col = None
-            mongo_uri = os.getenv('MONGODB_URI')
-            mongo_db = os.getenv('MONGODB_DB', 'inframind')
-            if mongo_uri and MongoClient:
-                client = MongoClient(mongo_uri)
-                col = client[mongo_db]['audit_logs']
+            col = _mongo_collection('audit_logs')
             entry = {
                 'event': event,
                 'actor': actor,
@@ -461,12 +732,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
     # --- Inventory storage helpers ---
     @staticmethod
     def _get_inventory_collection():
-        mongo_uri = os.getenv('MONGODB_URI')
-        mongo_db = os.getenv('MONGODB_DB', 'inframind')
-        if mongo_uri and MongoClient:
-            client = MongoClient(mongo_uri)
-            return client[mongo_db]['inventory_resources']
-        return None
+        return _mongo_collection('inventory_resources')
 
     def _inventory_upsert(self, tenant_id: str, doc: Dict[str, Any]) -> None:
         try:
@@ -502,15 +768,22 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
         except Exception:
             return ''
 
-    def _azure_list_resources(self, access_token: str, subscription_id: str) -> List[Dict[str, Any]]:
+    def _azure_list_resources(self, access_token: str, subscription_id: str) -> Optional[List[Dict[str, Any]]]:
+        """All resources in the subscription, or None if the listing failed."""
         try:
             headers = {'Authorization': f'Bearer {access_token}'}
             url = f"https://management.azure.com/subscriptions/{subscription_id}/providers/Microsoft.Resources/resources?api-version=2021-04-01"
-            r = requests.get(url, headers=headers, timeout=20)
-            r.raise_for_status()
-            return r.json().get('value', [])
+            resources: List[Dict[str, Any]] = []
+            while url:
+                self._provider_throttle('azure')
+                r = requests.get(url, headers=headers, timeout=20)
+                r.raise_for_status()
+                body = r.json()
+                resources.extend(body.get('value', []))
+                url = body.get('nextLink')
+            return resources
         except Exception:
-            return []
+            return None
 
     # --- GCP connector (Service Account JWT flow + REST) ---
     def _gcp_get_token(self, sa: Dict[str, Any], scopes: List[str]) -> str:
@@ -540,73 +813,132 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
         except Exception:
             return ''
 
-    def _gcp_list_instances(self, project_id: str, access_token: str) -> List[Dict[str, Any]]:
+    def _gcp_list_instances(self, project_id: str, access_token: str) -> Optional[List[Dict[str, Any]]]:
+        """All instances in the project, or None if the listing failed."""
         try:
             headers = {'Authorization': f'Bearer {access_token}'}
             url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/aggregated/instances"
-            r = requests.get(url, headers=headers, timeout=20)
-            r.raise_for_status()
-            items = r.json().get('items', {})
             instances: List[Dict[str, Any]] = []
-            for _, group in items.items():
-                for inst in group.get('instances', []) or []:
-                    instances.append(inst)
+            page_token = None
+            while True:
+                self._provider_throttle('gcp')
+                params = {'pageToken': page_token} if page_token else None
+                r = requests.get(url, headers=headers, params=params, timeout=20)
+                r.raise_for_status()
+                body = r.json()
+                for _, group in body.get('items', {}).items():
+                    for inst in group.get('instances', []) or []:
+                        instances.append(inst)
+                page_token = body.get('nextPageToken')
+                if not page_token:
+                    break
             return instances
         except Exception:
-            return []
+            return None
 
-    def _gcp_list_buckets(self, project_id: str, access_token: str) -> List[Dict[str, Any]]:
+    def _gcp_list_buckets(self, project_id: str, access_token: str) -> Optional[List[Dict[str, Any]]]:
+        """All buckets in the project, or None if the listing failed."""
         try:
             headers = {'Authorization': f'Bearer {access_token}'}
             url = f"https://www.googleapis.com/storage/v1/b?project={project_id}"
-            r = requests.get(url, headers=headers, timeout=20)
-            r.raise_for_status()
-            return r.json().get('items', [])
+            buckets: List[Dict[str, Any]] = []
+            page_token = None
+            while True:
+                self._provider_throttle('gcp')
+                params = {'pageToken': page_token} if page_token else None
+                r = requests.get(url, headers=headers, params=params, timeout=20)
+                r.raise_for_status()
+                body = r.json()
+                buckets.extend(body.get('items', []))
+                page_token = body.get('nextPageToken')
+                if not page_token:
+                    break
+            return buckets
         except Exception:
-            return []
+            return None
 
     # --- Inventory discovery ---
-    def _discover_aws_resources(self, tenant_id: str) -> None:
+    _inventory_cycle_lock = threading.Lock()
+    _inventory_unit_metrics: Dict[str, Dict[str, Any]] = {}
+    _provider_buckets: Dict[str, Any] = {}
+
+    @classmethod
+    def _provider_throttle(cls, provider: str) -> None:
+        """Block until the provider's call budget (INVENTORY_RATE_<PROVIDER> calls/sec) allows another request."""
+        if TokenBucket is None:
+            return
+        bucket = cls._provider_buckets.get(provider)
+        if bucket is None:
+            with cls._metrics_lock:
+                rate = float(os.getenv(f'INVENTORY_RATE_{provider.upper()}', '10'))
+                bucket = cls._provider_buckets.setdefault(provider, TokenBucket(rate))
+        bucket.acquire()
+
+    @staticmethod
+    def _aws_regions() -> List[str]:
+        regions_env = os.getenv('AWS_ALLOWED_REGIONS')
+        return [r.strip() for r in regions_env.split(',') if r.strip()] if regions_env else ['us-east-1']
+
+    def _discover_aws_region(self, tenant_id: str, region: str) -> Dict[str, int]:
+        account = os.getenv('AWS_ACCOUNT_ID','')
+        sweep = InventorySweep(IntelligentAIService._get_inventory_collection(), tenant_id, 'aws', account, region=region)
         try:
-            regions_env = os.getenv('AWS_ALLOWED_REGIONS')
-            regions = [r.strip() for r in regions_env.split(',')] if regions_env else ['us-east-1']
-            for region in regions:
-                try:
-                    ec2 = boto3.client('ec2', region_name=region)
-                    resp = ec2.describe_instances()
-                    for res in resp.get('Reservations', []):
-                        for inst in res.get('Instances', []):
-                            rid = inst.get('InstanceId')
-                            self._inventory_upsert(tenant_id, {
-                                'provider': 'aws',
-                                'account': os.getenv('AWS_ACCOUNT_ID',''),
-                                'region': region,
-                                'resource_type': 'ec2',
-                                'resource_id': rid,
-                                'name': rid,
-                                'state': inst.get('State',{}).get('Name'),
-                                'tags': {t['Key']: t.get('Value') for t in inst.get('Tags',[]) if 'Key' in t}
-                            })
-                except Exception:
-                    continue
-            try:
-                s3 = boto3.client('s3')
-                buckets = s3.list_buckets().get('Buckets', [])
-                for b in buckets:
-                    self._inventory_upsert(tenant_id, {
-                        'provider': 'aws',
-                        'account': os.getenv('AWS_ACCOUNT_ID',''),
-                        'region': 'global',
-                        'resource_type': 's3',
-                        'resource_id': b.get('Name'),
-                        'name': b.get('Name')
-                    })
-            except Exception:
-                pass
+            ec2 = _aws_client('ec2', region)
+            pages = iter(ec2.get_paginator('describe_instances').paginate(PaginationConfig={'PageSize': 1000}))
+            while True:
+                self._provider_throttle('aws')
+                page = next(pages, None)
+                if page is None:
+                    break
+                for res in page.get('Reservations', []):
+                    for inst in res.get('Instances', []):
+                        rid = inst.get('InstanceId')
+                        sweep.add({
+                            'provider': 'aws',
+                            'account': account,
+                            'region': region,
+                            'resource_type': 'ec2',
+                            'resource_id': rid,
+                            'name': rid,
+                            'state': inst.get('State',{}).get('Name'),
+                            'tags': {t['Key']: t.get('Value') for t in inst.get('Tags',[]) if 'Key' in t}
+                        })
+        except Exception:
+            sweep.fail(region)
+        return sweep.finish()
+
+    def _discover_aws_s3(self, tenant_id: str) -> Dict[str, int]:
+        account = os.getenv('AWS_ACCOUNT_ID','')
+        sweep = InventorySweep(IntelligentAIService._get_inventory_collection(), tenant_id, 'aws', account, region='global')
+        try:
+            s3 = _aws_client('s3')
+            self._provider_throttle('aws')
+            buckets = s3.list_buckets().get('Buckets', [])
+            for b in buckets:
+                sweep.add({
+                    'provider': 'aws',
+                    'account': account,
+                    'region': 'global',
+                    'resource_type': 's3',
+                    'resource_id': b.get('Name'),
+                    'name': b.get('Name')
+                })
+        except Exception:
+            sweep.fail('global')
+        return sweep.finish()
+
+    def _discover_aws_resources(self, tenant_id: str) -> Dict[str, int]:
+        """Sequential sweep of every allowed region plus S3; the scheduler runs the same units in parallel."""
+        totals: Dict[str, int] = {}
+        try:
+            for stats in [self._discover_aws_region(tenant_id, r) for r in self._aws_regions()] + [self._discover_aws_s3(tenant_id)]:
+                for k, v in stats.items():
+                    totals[k] = totals.get(k, 0) + v
         except Exception:
             pass
+        return totals
 
-    def _discover_azure_resources(self, tenant_id: str, secret_name: str) -> None:
+    def _discover_azure_resources(self, tenant_id: str, secret_name: str) -> Dict[str, int]:
         try:
             cfg = self._get_secret(secret_name)
             tenant = cfg.get('tenant_id') or cfg.get('directory_id')
@@ -615,11 +947,15 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             subscription_id = cfg.get('subscription_id')
             token = self._azure_get_token(tenant, client_id, client_secret)
             if not token or not subscription_id:
-                return
+                return {}
             resources = self._azure_list_resources(token, subscription_id)
-            for r in resources:
+            sweep = InventorySweep(IntelligentAIService._get_inventory_collection(), tenant_id, 'azure', subscription_id)
+            if resources is None:
+                # a failed listing is not proof its resources are gone; don't mark the subscription stale
+                sweep.fail()
+            for r in resources or []:
                 rid = r.get('id')
-                self._inventory_upsert(tenant_id, {
+                sweep.add({
                     'provider': 'azure',
                     'account': subscription_id,
                     'region': r.get('location') or 'unknown',
@@ -627,20 +963,27 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                     'resource_id': rid,
                     'name': r.get('name')
                 })
+            return sweep.finish()
         except Exception:
-            pass
+            return {}
 
-    def _discover_gcp_resources(self, tenant_id: str, secret_name: str) -> None:
+    def _discover_gcp_resources(self, tenant_id: str, secret_name: str) -> Dict[str, int]:
         try:
             cfg = self._get_secret(secret_name)
             project_id = cfg.get('project_id')
             token = self._gcp_get_token(cfg, ['https://www.googleapis.com/auth/cloud-platform'])
             if not token or not project_id:
-                return
-            for inst in self._gcp_list_instances(project_id, token):
+                return {}
+            sweep = InventorySweep(IntelligentAIService._get_inventory_collection(), tenant_id, 'gcp', project_id)
+            instances = self._gcp_list_instances(project_id, token)
+            buckets = self._gcp_list_buckets(project_id, token)
+            if instances is None or buckets is None:
+                # a failed listing is not proof its resources are gone; don't mark the project stale
+                sweep.fail()
+            for inst in instances or []:
                 rid = inst.get('id') or inst.get('selfLink')
                 zone = (inst.get('zone') or '').split('/')[-1]
-                self._inventory_upsert(tenant_id, {
+                sweep.add({
                     'provider': 'gcp',
                     'account': project_id,
                     'region': zone,
@@ -648,8 +991,8 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                     'resource_id': rid,
                     'name': inst.get('name')
                 })
-            for b in self._gcp_list_buckets(project_id, token):
-                self._inventory_upsert(tenant_id, {
+            for b in buckets or []:
+                sweep.add({
                     'provider': 'gcp',
                     'account': project_id,
                     'region': b.get('location') or 'global',
@@ -657,34 +1000,76 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                     'resource_id': b.get('id'),
                     'name': b.get('name')
                 })
+            return sweep.finish()
         except Exception:
-            pass
+            return {}
 
-    def _run_inventory_cycle(self) -> None:
+    def _inventory_units(self, col) -> List[tuple]:
+        """Expand tenants and their integration configs into (tenant, provider, region, fn) work units."""
+        units: List[tuple] = []
+        for tenant_id in col.distinct('tenant_id'):
+            for region in self._aws_regions():
+                units.append((tenant_id, 'aws', region, lambda t=tenant_id, r=region: self._discover_aws_region(t, r)))
+            units.append((tenant_id, 'aws', 'global', lambda t=tenant_id: self._discover_aws_s3(t)))
+            for cfg in col.find({'tenant_id': tenant_id}, {'integration': 1, 'secret_name': 1}):
+                integ = (cfg.get('integration') or '').lower()
+                secret_name = cfg.get('secret_name') or ''
+                if integ == 'azure' and secret_name:
+                    units.append((tenant_id, 'azure', '*', lambda t=tenant_id, n=secret_name: self._discover_azure_resources(t, n)))
+                if integ == 'gcp' and secret_name:
+                    units.append((tenant_id, 'gcp', '*', lambda t=tenant_id, n=secret_name: self._discover_gcp_resources(t, n)))
+        return units
+
+    def _run_inventory_unit(self, tenant_id: str, provider: str, region: str, fn) -> None:
+        started = time.monotonic()
+        status = 'ok'
+        stats: Dict[str, int] = {}
+        try:
+            stats = fn() or {}
+        except Exception:
+            status = 'error'
+        entry = {
+            'tenant_id': tenant_id,
+            'provider': provider,
+            'region': region,
+            'status': status,
+            'duration_sec': round(time.monotonic() - started, 3),
+            'stats': stats,
+            'finished_at': datetime.now().isoformat(),
+        }
+        with IntelligentAIService._metrics_lock:
+            IntelligentAIService._inventory_unit_metrics[f"{tenant_id}|{provider}|{region}"] = entry
+
+    def _run_inventory_cycle(self) -> Dict[str, Any]:
+        # Never overlap cycles: a slow cycle makes the next tick a no-op instead of piling up
+        if not IntelligentAIService._inventory_cycle_lock.acquire(blocking=False):
+            self._inc_metric('inventory_cycles_total', 'skipped')
+            return {'skipped': True}
         try:
             col = IntelligentAIService._get_configs_collection()
             if col is None:
-                return
-            tenants = col.distinct('tenant_id')
-            for tenant_id in tenants:
-                self._discover_aws_resources(tenant_id)
-                cfgs = list(col.find({'tenant_id': tenant_id}))
-                for cfg in cfgs:
-                    integ = (cfg.get('integration') or '').lower()
-                    secret_name = cfg.get('secret_name') or ''
-                    if integ == 'azure' and secret_name:
-                        self._discover_azure_resources(tenant_id, secret_name)
-                    if integ == 'gcp' and secret_name:
-                        self._discover_gcp_resources(tenant_id, secret_name)
+                return {}
+            started = time.monotonic()
+            units = self._inventory_units(col)
+            workers = max(1, int(os.getenv('INVENTORY_MAX_CONCURRENCY', '8')))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='inventory') as pool:
+                for tenant_id, provider, region, fn in units:
+                    pool.submit(self._run_inventory_unit, tenant_id, provider, region, fn)
+            self._inc_metric('inventory_cycles_total', 'completed')
+            return {'units': len(units), 'duration_sec': round(time.monotonic() - started, 3)}
         except Exception:
-            pass
+            self._inc_metric('inventory_cycles_total', 'failed')
+            return {}
+        finally:
+            IntelligentAIService._inventory_cycle_lock.release()
 
     def _start_inventory_scheduler(self) -> None:
         interval_sec = int(os.getenv('INVENTORY_INTERVAL_SEC', '600'))
         def loop():
             while True:
+                # Fixed cadence; _run_inventory_cycle skips the tick if the previous cycle is still running
                 try:
-                    self._run_inventory_cycle()
+                    threading.Thread(target=self._run_inventory_cycle, name='inventory-cycle', daemon=True).start()
                 except Exception:
                     pass
                 time.sleep(interval_sec)
@@ -694,12 +1079,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
     # --- Users (auth) ---
     @staticmethod
     def _get_users_collection():
-        mongo_uri = os.getenv('MONGODB_URI')
-        mongo_db = os.getenv('MONGODB_DB', 'inframind')
-        if mongo_uri and MongoClient:
-            client = MongoClient(mongo_uri)
-            return client[mongo_db]['users']
-        return None
+        return _mongo_collection('users')
 
     def _hash_password(self, password: str, salt: str = '') -> str:
         import hashlib
@@ -733,12 +1113,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
     # --- Rules engine ---
     @staticmethod
     def _get_rules_collection():
-        mongo_uri = os.getenv('MONGODB_URI')
-        mongo_db = os.getenv('MONGODB_DB', 'inframind')
-        if mongo_uri and MongoClient:
-            client = MongoClient(mongo_uri)
-            return client[mongo_db]['rules']
-        return None
+        return _mongo_collection('rules')
 
     def _load_rules(self, tenant_id: str) -> List[Dict[str, Any]]:
         col = self._get_rules_collection()
@@ -773,12 +1148,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
     # --- Persistence helpers ---
     @staticmethod
     def _get_mongo_collection():
-        mongo_uri = os.getenv('MONGODB_URI')
-        mongo_db = os.getenv('MONGODB_DB', 'inframind')
-        if mongo_uri and MongoClient:
-            client = MongoClient(mongo_uri)
-            return client[mongo_db]['incidents']
-        return None
+        return _mongo_collection('incidents')
 
     @staticmethod
     def _persist_incident(doc: Dict[str, Any]) -> Dict[str, Any]:
@@ -810,12 +1180,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
     # Integration configs stored in same DB (separate type)
     @staticmethod
     def _get_configs_collection():
-        mongo_uri = os.getenv('MONGODB_URI')
-        mongo_db = os.getenv('MONGODB_DB', 'inframind')
-        if mongo_uri and MongoClient:
-            client = MongoClient(mongo_uri)
-            return client[mongo_db]['integration_configs']
-        return None
+        return _mongo_collection('integration_configs')
 
     def _save_integration_config(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         integration = payload.get('integration')
@@ -900,11 +1265,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             ok = bool(token)
             status = None
             if ok and sa.get('project_id'):
-                try:
-                    _ = self._gcp_list_buckets(sa['project_id'], token)
-                    status = 200
-                except Exception:
-                    status = 500
+                status = 200 if self._gcp_list_buckets(sa['project_id'], token) is not None else 500
             return {'ok': ok, 'status': status}
         return {'ok': False, 'error': 'unsupported_integration'}
 
@@ -1101,6 +1462,9 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                     "agents_available": len(AGENT_REGISTRY),
                     "agents": list(AGENT_REGISTRY.keys())
                 }
+                # /health?deep=true also pings MongoDB through the shared pool
+                if mongo_registry is not None and self._query_param(parsed_path, 'deep').lower() in ['1', 'true', 'yes']:
+                    response_data["mongo"] = mongo_registry.health_check()
                 self.wfile.write(json.dumps(response_data).encode())
 
             elif parsed_path.path == '/dashboard/summary':
@@ -1109,12 +1473,16 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                     tenant_id = claims.get('tenant_id') or 'default'
                     inv = IntelligentAIService._get_inventory_collection()
                     inc = IntelligentAIService._get_mongo_collection()
+                    # Costs come from the read cache (refreshed in the background); ?refresh=true forces a fetch
+                    refresh = self._query_param(parsed_path, 'refresh').lower() in ['1', 'true', 'yes']
+                    costs, costs_freshness = self._cloud_read('costs', self._fetch_real_costs, force=refresh)
                     summary = {
                         'resources_total': 0,
                         'by_provider': {},
                         'by_type': {},
                         'incidents_open': 0,
-                        'costs': self.get_real_costs(),
+                        'costs': costs,
+                        'freshness': {'costs': costs_freshness},
                     }
                     if inv is not None:
                         cursor = inv.find({'tenant_id': tenant_id}, {'provider': 1, 'resource_type': 1})
@@ -1199,11 +1567,14 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
 
             elif parsed_path.path == '/aws/ec2':
                 try:
-                    instances = self.get_ec2_instances()
+                    refresh = self._query_param(parsed_path, 'refresh').lower() in ['1', 'true', 'yes']
+                    regions = self._ec2_regions()
+                    instances, freshness = self._cloud_read('ec2_instances', lambda: self._fetch_ec2_instances(regions),
+                                                            key=tuple(regions), force=refresh)
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     self.end_headers()
-                    self.wfile.write(json.dumps(instances).encode())
+                    self.wfile.write(json.dumps({**instances, 'freshness': freshness}).encode())
                 except Exception as e:
                     self.send_response(500)
                     self.send_header('Content-type', 'application/json')
@@ -1212,11 +1583,12 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             
             elif parsed_path.path == '/aws/s3':
                 try:
-                    buckets = self.get_s3_buckets()
+                    refresh = self._query_param(parsed_path, 'refresh').lower() in ['1', 'true', 'yes']
+                    buckets, freshness = self._cloud_read('s3_buckets', self._fetch_s3_buckets, force=refresh)
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     self.end_headers()
-                    self.wfile.write(json.dumps(buckets).encode())
+                    self.wfile.write(json.dumps({**buckets, 'freshness': freshness}).encode())
                 except Exception as e:
                     self.send_response(500)
                     self.send_header('Content-type', 'application/json')
@@ -1225,11 +1597,12 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             
             elif parsed_path.path == '/aws/costs':
                 try:
-                    costs = self.get_real_costs()
+                    refresh = self._query_param(parsed_path, 'refresh').lower() in ['1', 'true', 'yes']
+                    costs, freshness = self._cloud_read('costs', self._fetch_real_costs, force=refresh)
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     self.end_headers()
-                    self.wfile.write(json.dumps(costs).encode())
+                    self.wfile.write(json.dumps({**costs, 'freshness': freshness}).encode())
                 except Exception as e:
                     self.send_response(500)
                     self.send_header('Content-type', 'application/json')
@@ -1238,11 +1611,12 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             
             elif parsed_path.path == '/aws/security':
                 try:
-                    security = self.get_security_status()
+                    refresh = self._query_param(parsed_path, 'refresh').lower() in ['1', 'true', 'yes']
+                    security, freshness = self._cloud_read('security', self._fetch_security_status, force=refresh)
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     self.end_headers()
-                    self.wfile.write(json.dumps(security).encode())
+                    self.wfile.write(json.dumps({**security, 'freshness': freshness}).encode())
                 except Exception as e:
                     self.send_response(500)
                     self.send_header('Content-type', 'application/json')
@@ -1251,11 +1625,12 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             
             elif parsed_path.path == '/aws/monitoring':
                 try:
-                    monitoring = self.get_monitoring_data()
+                    refresh = self._query_param(parsed_path, 'refresh').lower() in ['1', 'true', 'yes']
+                    monitoring, freshness = self._cloud_read('monitoring', self._fetch_monitoring_data, force=refresh)
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     self.end_headers()
-                    self.wfile.write(json.dumps(monitoring).encode())
+                    self.wfile.write(json.dumps({**monitoring, 'freshness': freshness}).encode())
                 except Exception as e:
                     self.send_response(500)
                     self.send_header('Content-type', 'application/json')
@@ -1323,6 +1698,71 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                     lines.append('# TYPE inframind_errors_total counter')
                     for label, val in self._metrics.get('errors_total', {}).items():
                         lines.append(f"inframind_errors_total{{route=\"{label}\"}} {val}")
+                    lines.append('# HELP inframind_rejected_total Connections rejected with 503 by reason')
+                    lines.append('# TYPE inframind_rejected_total counter')
+                    for label, val in self._metrics.get('rejected_total', {}).items():
+                        lines.append(f"inframind_rejected_total{{reason=\"{label}\"}} {val}")
+                    if mongo_registry is not None:
+                        lines.append('# HELP inframind_mongo_pool_events_total MongoDB client and connection pool events')
+                        lines.append('# TYPE inframind_mongo_pool_events_total counter')
+                        for label, val in mongo_registry.metrics().items():
+                            lines.append(f"inframind_mongo_pool_events_total{{event=\"{label}\"}} {val}")
+                    lines.append('# HELP inframind_inventory_cycles_total Inventory discovery cycles by result')
+                    lines.append('# TYPE inframind_inventory_cycles_total counter')
+                    for label, val in self._metrics.get('inventory_cycles_total', {}).items():
+                        lines.append(f"inframind_inventory_cycles_total{{result=\"{label}\"}} {val}")
+                    lines.append('# HELP inframind_inventory_unit_duration_seconds Duration of the last discovery run per tenant/provider/region')
+                    lines.append('# TYPE inframind_inventory_unit_duration_seconds gauge')
+                    for unit in list(self._inventory_unit_metrics.values()):
+                        lines.append(
+                            f"inframind_inventory_unit_duration_seconds{{tenant=\"{unit['tenant_id']}\",provider=\"{unit['provider']}\","
+                            f"region=\"{unit['region']}\",status=\"{unit['status']}\"}} {unit['duration_sec']}"
+                        )
+                    if _intent_cache is not None:
+                        cache_stats = _intent_cache.stats()
+                        lines.append('# HELP inframind_intent_cache_total Intent cache lookups by result')
+                        lines.append('# TYPE inframind_intent_cache_total counter')
+                        lines.append(f"inframind_intent_cache_total{{result=\"hit\"}} {cache_stats['hits']}")
+                        lines.append(f"inframind_intent_cache_total{{result=\"miss\"}} {cache_stats['misses']}")
+                    lines.append('# HELP inframind_intent_classifications_total Intents resolved by stage (local classifier or OpenAI)')
+                    lines.append('# TYPE inframind_intent_classifications_total counter')
+                    for label, val in self._metrics.get('intent_classifications_total', {}).items():
+                        lines.append(f"inframind_intent_classifications_total{{stage=\"{label}\"}} {val}")
+                    if _intent_stage_latency:
+                        lines.append('# HELP inframind_intent_stage_seconds Intent analysis latency by the stage that answered')
+                        lines.append('# TYPE inframind_intent_stage_seconds histogram')
+                        for stage, hist in _intent_stage_latency.items():
+                            lines.extend(hist.prometheus_lines('inframind_intent_stage_seconds', {'stage': stage}))
+                    if llm_gateway is not None:
+                        llm_stats = llm_gateway.stats()
+                        lines.append('# HELP inframind_llm_requests_total LLM requests by caller and how they were answered')
+                        lines.append('# TYPE inframind_llm_requests_total counter')
+                        for caller, caller_stats in llm_stats['callers'].items():
+                            for result in ('upstream_calls', 'cache_hits', 'semantic_hits', 'coalesced', 'errors', 'retries'):
+                                lines.append(f"inframind_llm_requests_total{{caller=\"{caller}\",result=\"{result}\"}} {caller_stats[result]}")
+                        lines.append('# HELP inframind_llm_tokens_total LLM tokens by caller (saved = served from cache or coalesced)')
+                        lines.append('# TYPE inframind_llm_tokens_total counter')
+                        for caller, caller_stats in llm_stats['callers'].items():
+                            for kind in ('prompt', 'completion', 'saved'):
+                                lines.append(f"inframind_llm_tokens_total{{caller=\"{caller}\",kind=\"{kind}\"}} {caller_stats[kind + '_tokens']}")
+                        lines.append('# HELP inframind_llm_in_flight Distinct LLM requests currently in flight')
+                        lines.append('# TYPE inframind_llm_in_flight gauge')
+                        lines.append(f"inframind_llm_in_flight {llm_stats['in_flight']}")
+                    if cloud_read_cache is not None:
+                        lines.append('# HELP inframind_cloud_cache_total Cloud read cache lookups and refreshes by result')
+                        lines.append('# TYPE inframind_cloud_cache_total counter')
+                        for label, val in cloud_read_cache.stats().items():
+                            if label not in ('entries', 'loading'):
+                                lines.append(f"inframind_cloud_cache_total{{result=\"{label}\"}} {val}")
+                    if boto_client_pool is not None:
+                        lines.append('# HELP inframind_aws_clients Pooled boto3 clients (one per service and region)')
+                        lines.append('# TYPE inframind_aws_clients gauge')
+                        lines.append(f"inframind_aws_clients {boto_client_pool.stats()['clients']}")
+                    queue_depth = getattr(self.server, 'queue_depth', None)
+                    if queue_depth is not None:
+                        lines.append('# HELP inframind_worker_queue_depth Connections waiting for a worker thread')
+                        lines.append('# TYPE inframind_worker_queue_depth gauge')
+                        lines.append(f"inframind_worker_queue_depth {queue_depth()}")
                     lines.append('# HELP inframind_up 1 if service is up')
                     lines.append('# TYPE inframind_up gauge')
                     lines.append('inframind_up 1')
@@ -1401,12 +1841,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                             stream_flag = False
                     # Persist chat message
                     try:
-                        col = None
-                        mongo_uri = os.getenv('MONGODB_URI')
-                        mongo_db = os.getenv('MONGODB_DB', 'inframind')
-                        if mongo_uri and MongoClient:
-                            client = MongoClient(mongo_uri)
-                            col = client[mongo_db]['chat_messages']
+                        col = _mongo_collection('chat_messages')
                         if col is not None:
                             col.insert_one({
                                 'tenant_id': claims.get('tenant_id') or 'default',
@@ -1420,6 +1855,9 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                         pass
                     
                     print(f"Processing message: {message} for session: {session_id}")
+                    # LLM calls made for this request count against the caller's tenant limits
+                    tenant_scope = (llm_tenant_scope(claims.get('tenant_id') or 'default')
+                                    if llm_tenant_scope else contextlib.nullcontext())
 
                     if stream_flag:
                         # Setup SSE headers
@@ -1438,16 +1876,24 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                             self.wfile.flush()
                         except Exception:
                             pass
-                        # Compute response
-                        ai_response = asyncio.run(self._process_with_agents(message, user_id, session_id))
+                        # Stream the agent's raw result first, then the enhancement tokens as they arrive
+                        final_event = {}
+
+                        async def _pump_events():
+                            async for event, data in self._stream_with_agents(message, user_id, session_id):
+                                if event == 'final':
+                                    final_event.update(data)
+                                try:
+                                    self._write_sse_event(event, data)
+                                except Exception:
+                                    pass  # client went away; keep going so the reply is still persisted
+
+                        with tenant_scope:
+                            _run_async(_pump_events())
+                        ai_response = final_event.get('response', '')
                         # Persist AI response
                         try:
-                            col = None
-                            mongo_uri = os.getenv('MONGODB_URI')
-                            mongo_db = os.getenv('MONGODB_DB', 'inframind')
-                            if mongo_uri and MongoClient:
-                                client = MongoClient(mongo_uri)
-                                col = client[mongo_db]['chat_messages']
+                            col = _mongo_collection('chat_messages')
                             if col is not None:
                                 col.insert_one({
                                     'tenant_id': claims.get('tenant_id') or 'default',
@@ -1459,21 +1905,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                                 })
                         except Exception:
                             pass
-                        # Stream the response in chunks
                         try:
-                            text = str(ai_response)
-                            chunk_size = 256
-                            for i in range(0, len(text), chunk_size):
-                                chunk = text[i:i+chunk_size]
-                                payload = json.dumps({
-                                    'delta': chunk,
-                                    'complete': (i + chunk_size) >= len(text)
-                                })
-                                self.wfile.write(b"event: message\n")
-                                self.wfile.write(b"data: ")
-                                self.wfile.write(payload.encode('utf-8'))
-                                self.wfile.write(b"\n\n")
-                                self.wfile.flush()
                             # end event
                             self.wfile.write(b"event: end\n")
                             self.wfile.write(b"data: done\n\n")
@@ -1482,15 +1914,12 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                             pass
                     else:
                         # Non-streaming: compute then return JSON
-                        ai_response = asyncio.run(self._process_with_agents(message, user_id, session_id))
+                        timings = {}
+                        with tenant_scope:
+                            ai_response = _run_async(self._process_with_agents(message, user_id, session_id, timings))
                         # Persist AI response
                         try:
-                            col = None
-                            mongo_uri = os.getenv('MONGODB_URI')
-                            mongo_db = os.getenv('MONGODB_DB', 'inframind')
-                            if mongo_uri and MongoClient:
-                                client = MongoClient(mongo_uri)
-                                col = client[mongo_db]['chat_messages']
+                            col = _mongo_collection('chat_messages')
                             if col is not None:
                                 col.insert_one({
                                     'tenant_id': claims.get('tenant_id') or 'default',
@@ -1513,7 +1942,8 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                             "timestamp": datetime.now().isoformat(),
                             "context": context,
                             "user_id": user_id,
-                            "session_id": session_id
+                            "session_id": session_id,
+                            "metadata": {"timings_ms": timings}
                         }
                         self.wfile.write(json.dumps(response_data).encode())
                     
@@ -1674,7 +2104,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                             else:
                                 result = {'action': 'no_op', 'reason': 'incident_not_found', 'fingerprint': fp}
                     else:
-                        result = asyncio.run(self._handle_incoming_alert(alert))
+                        result = _run_async(self._handle_incoming_alert(alert))
                     # Audit receipt
                     try:
                         self._audit_log('alert_received', {'ip': client_ip, 'user_id': 'system', 'tenant_id': 'default'}, {'source': source, 'status': alert.get('status'), 'fingerprint': alert.get('fingerprint')})
@@ -1791,7 +2221,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
                     elif vendor == 'jira' and action in ['create','update','get','delete']:
                         result = self._jira_crud(action, payload)
                     else:
-                        result = asyncio.run(self._handle_itsm_webhook(vendor, payload))
+                        result = _run_async(self._handle_itsm_webhook(vendor, payload))
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
                     self.end_headers()
@@ -1815,8 +2245,74 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(json.dumps({"error": str(e)}).encode())
 
-    async def _process_with_agents(self, message: str, user_id: str, session_id: str) -> str:
-        """Process message with intelligent agent orchestration and natural dialogue"""
+    def _write_sse_event(self, event: str, data: Any) -> None:
+        """Write one server-sent event with a JSON payload and flush it to the client"""
+        self.wfile.write(f"event: {event}\n".encode('utf-8'))
+        self.wfile.write(b"data: ")
+        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(b"\n\n")
+        self.wfile.flush()
+
+    @staticmethod
+    async def _timed_stage(timings: Dict[str, float], stage: str, awaitable):
+        """Await a pipeline stage and record its wall time in milliseconds"""
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _run_agent_stage(self, message: str, user_id: str, session_id: str, timings: Dict[str, float]) -> tuple:
+        """Produce the agent's raw result: a multi-agent workflow or a single routed agent.
+
+        Workflow complexity analysis and intent classification run concurrently;
+        the intent is simply unused when the request becomes a multi-agent workflow.
+        Returns (raw_response, agent_type, workflow_result).
+        """
+        workflow_result, intent_analysis = await asyncio.gather(
+            self._timed_stage(timings, 'orchestration',
+                              workflow_orchestrator.analyze_and_orchestrate(message, user_id, session_id)),
+            self._timed_stage(timings, 'intent', asyncio.to_thread(self._analyze_intent, message, session_id))
+        )
+
+        if workflow_result.get("workflow_execution"):
+            # Complex multi-agent workflow
+            return workflow_result["result"]["summary"], "multi_agent_workflow", workflow_result
+
+        # Single agent processing
+        print(f"Intent analysis: {intent_analysis}")
+        raw_response, agent_type = await self._timed_stage(
+            timings, 'agent', self._route_to_single_agent(message, user_id, session_id, intent_analysis)
+        )
+        return raw_response, agent_type, workflow_result
+
+    def _apply_dialogue_stage(self, message: str, session_id: str, response: str, workflow_result: Dict[str, Any]) -> str:
+        """Natural dialogue enhancement of the context-aware response"""
+        dialogue_context = DialogueContext(
+            user_emotion="neutral",
+            conversation_stage="middle",
+            task_complexity="simple" if not workflow_result.get("workflow_execution") else "complex",
+            user_confidence="medium",
+            success_rate=1.0,
+            last_interaction_success=True
+        )
+        
+        # Get conversation history for context
+        conversation_history = context_manager.conversation_contexts.get(session_id, None)
+        history_list = conversation_history.messages if conversation_history else []
+        
+        return dialogue_manager.enhance_response_with_natural_dialogue(
+            message, response, dialogue_context, history_list
+        )
+
+    async def _process_with_agents(self, message: str, user_id: str, session_id: str,
+                                   timings: Dict[str, float] = None) -> str:
+        """Process message with intelligent agent orchestration and natural dialogue
+
+        Per-stage wall times (ms) are recorded into ``timings`` when given.
+        """
+        timings = {} if timings is None else timings
+        started = time.perf_counter()
         try:
             print(f"Processing with agents: {message}")
             
@@ -1824,56 +2320,73 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             if session_id in conversation_states:
                 print(f"Continuing conversation for session: {session_id}")
                 # Continue existing conversation
-                return await self._continue_conversation(message, session_id)
-            
-            # STEP 1: Multi-Agent Workflow Analysis
-            # Check if this requires multi-agent orchestration
-            workflow_result = await workflow_orchestrator.analyze_and_orchestrate(message, user_id, session_id)
+                return await self._timed_stage(timings, 'conversation', self._continue_conversation(message, session_id))
             
-            if workflow_result.get("workflow_execution"):
-                # Complex multi-agent workflow
-                raw_response = workflow_result["result"]["summary"]
-                agent_type = "multi_agent_workflow"
-            else:
-                # Single agent processing
-                # Parse intent and determine which agent to involve
-                intent_analysis = self._analyze_intent(message, session_id)
-                print(f"Intent analysis: {intent_analysis}")
-                
-                # Route to appropriate single agent
-                raw_response, agent_type = await self._route_to_single_agent(message, user_id, session_id, intent_analysis)
+            # STEP 1: Multi-Agent Workflow Analysis, or intent routing to a single agent
+            raw_response, agent_type, workflow_result = await self._run_agent_stage(message, user_id, session_id, timings)
             
             # STEP 2: Context-Aware Response Enhancement
-            # Generate context-aware response
-            context_enhanced_response = await context_manager.generate_context_aware_response(
-                message, raw_response, user_id, session_id, agent_type
+            context_enhanced_response = await self._timed_stage(
+                timings, 'enhancement',
+                context_manager.generate_context_aware_response(message, raw_response, user_id, session_id, agent_type)
             )
             
             # STEP 3: Natural Dialogue Enhancement
-            # Create dialogue context
-            dialogue_context = DialogueContext(
-                user_emotion="neutral",
-                conversation_stage="middle",
-                task_complexity="simple" if not workflow_result.get("workflow_execution") else "complex",
-                user_confidence="medium",
-                success_rate=1.0,
-                last_interaction_success=True
-            )
-            
-            # Get conversation history for context
-            conversation_history = context_manager.conversation_contexts.get(session_id, None)
-            history_list = conversation_history.messages if conversation_history else []
-            
-            # Apply natural dialogue patterns
-            final_response = dialogue_manager.enhance_response_with_natural_dialogue(
-                message, context_enhanced_response, dialogue_context, history_list
-            )
-            
-            return final_response
+            return self._apply_dialogue_stage(message, session_id, context_enhanced_response, workflow_result)
             
         except Exception as e:
             print(f"Error in _process_with_agents: {e}")
             return f"I encountered an error while processing your request: {str(e)}"
+        finally:
+            timings['total'] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _stream_with_agents(self, message: str, user_id: str, session_id: str):
+        """Streaming variant of _process_with_agents yielding (event, data) pairs.
+
+        ``raw`` carries the agent's result as soon as it exists, ``message`` events
+        carry the enhancement as it is generated ({'delta', 'complete'}), and
+        ``final`` carries the finished response with per-stage timings.
+
+        Text the dialogue stage appends is sent as the ``complete`` delta, so the
+        deltas add up to ``final.response``. When the dialogue stage changes the
+        text in any other way (e.g. an opening line), ``final.response`` differs
+        from the streamed text and replaces it; it is also what gets persisted.
+        """
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        agent_type = None
+        try:
+            if session_id in conversation_states:
+                response = await self._timed_stage(timings, 'conversation', self._continue_conversation(message, session_id))
+                yield 'raw', {'text': response, 'agent_type': None}
+                yield 'message', {'delta': response, 'complete': True}
+            else:
+                raw_response, agent_type, workflow_result = await self._run_agent_stage(message, user_id, session_id, timings)
+                timings['first_byte'] = round((time.perf_counter() - started) * 1000, 1)
+                yield 'raw', {'text': str(raw_response), 'agent_type': agent_type}
+
+                enhancement_started = time.perf_counter()
+                parts = []
+                async for delta in context_manager.stream_context_aware_response(
+                    message, raw_response, user_id, session_id, agent_type
+                ):
+                    if not parts:
+                        timings['enhancement_first_token'] = round((time.perf_counter() - enhancement_started) * 1000, 1)
+                    parts.append(delta)
+                    yield 'message', {'delta': delta, 'complete': False}
+                timings['enhancement'] = round((time.perf_counter() - enhancement_started) * 1000, 1)
+
+                streamed = "".join(parts)
+                response = self._apply_dialogue_stage(message, session_id, streamed.strip(), workflow_result)
+                tail = response[len(streamed):] if response.startswith(streamed) else ''
+                yield 'message', {'delta': tail, 'complete': True}
+        except Exception as e:
+            print(f"Error in _stream_with_agents: {e}")
+            response = f"I encountered an error while processing your request: {str(e)}"
+            yield 'message', {'delta': response, 'complete': True}
+
+        timings['total'] = round((time.perf_counter() - started) * 1000, 1)
+        yield 'final', {'response': response, 'metadata': {'agent_type': agent_type, 'timings_ms': timings}}
 
     async def _route_to_single_agent(self, message: str, user_id: str, session_id: str, intent_analysis: Dict[str, Any]) -> tuple:
         """Route message to appropriate single agent and return response with agent type"""
@@ -2229,7 +2742,7 @@ class IntelligentAIService(http.server.BaseHTTPRequestHandler):
             current_intent = current_state.get('intent', 'unknown')
             current_action = current_state.get('action', 'unknown')
             
-            response = openai_client.chat.completions.create(
+            response = await openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -2387,7 +2900,7 @@ Guidelines:
             - "t3.medium with load balancing and auto-scaling" → {{"instance_type": "t3.medium", "load_balancing": true, "auto_scaling": true}}
             """
             
-            response = openai_client.chat.completions.create(
+            response = await openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
@@ -2681,7 +3194,7 @@ Guidelines:
         try:
             # Create region-specific EC2 client with error handling
             try:
-                regional_ec2 = boto3.client('ec2', region_name=region)
+                regional_ec2 = _aws_client('ec2', region)
                 # Test credentials with a simple call
                 regional_ec2.describe_regions(RegionNames=[region])
             except Exception as cred_error:
@@ -2751,6 +3264,7 @@ Guidelines:
             
             # Launch instances
             response = regional_ec2.run_instances(**run_config)
+            _invalidate_cloud_reads('ec2_instances')
             
             instances = []
             for instance in response['Instances']:
@@ -3014,7 +3528,65 @@ Now I need to know which operating system to use:
         
         return None
 
+    @staticmethod
+    def _normalize_intent_message(message: str) -> str:
+        return re.sub(r'\s+', ' ', (message or '').lower()).strip().rstrip('?!.')
+
+    def _intent_cache_key(self, message: str, session_id: str = None) -> tuple:
+        """Message plus the conversation state the remote prompt sees (last action and its context)"""
+        last_action, context_digest = '', ''
+        if session_id and session_id in conversation_states:
+            last_action = conversation_states[session_id].get('last_action', '')
+            if last_action:
+                context_info = conversation_states[session_id].get('context', {})
+                context_digest = hashlib.sha256(
+                    json.dumps(context_info, sort_keys=True, default=str).encode()
+                ).hexdigest()
+        return (self._normalize_intent_message(message), last_action, context_digest)
+
+    @staticmethod
+    def _observe_intent_stage(stage: str, started: float) -> None:
+        hist = _intent_stage_latency.get(stage)
+        if hist is not None:
+            hist.observe(time.perf_counter() - started)
+
+    def _local_intent_analysis(self, message: str, session_id: str = None):
+        """Answer high-confidence read-only intents locally; None means ask OpenAI."""
+        keyword = self._fallback_intent_analysis(message, session_id)
+        if keyword.get('intent') not in _LOCAL_INTENT_ALLOWLIST:
+            return None
+        # context follow-ups ("detailed report" after a scan) are decided by the keyword rules alone
+        if keyword.get('confidence', 0) >= 0.9:
+            return keyword
+        normalized = self._normalize_intent_message(message)
+        if keyword.get('intent') == 'general_query' or _ENTITY_HINT_RE.search(normalized):
+            return None
+        predicted, similarity = _local_intent_classifier.predict(normalized)
+        if predicted == keyword['intent'] and similarity >= float(os.getenv('INTENT_LOCAL_MIN_SIMILARITY', '0.35')):
+            return {'intent': predicted, 'confidence': 0.9, 'entities': keyword.get('entities', {})}
+        return None
+
     def _analyze_intent(self, message: str, session_id: str = None) -> dict:
+        """Analyze user intent: cache, then local classifier, then OpenAI with conversation context"""
+        started = time.perf_counter()
+        cache_key = self._intent_cache_key(message, session_id)
+        if _intent_cache is not None:
+            cached = _intent_cache.get(cache_key)
+            if cached is not None:
+                self._observe_intent_stage('cache', started)
+                return copy.deepcopy(cached)
+        local = self._local_intent_analysis(message, session_id)
+        if local is not None:
+            self._inc_metric('intent_classifications_total', 'local')
+            self._observe_intent_stage('local', started)
+            if _intent_cache is not None:
+                _intent_cache.set(cache_key, copy.deepcopy(local))
+            return local
+        result = self._remote_intent_analysis(message, session_id)
+        self._observe_intent_stage('remote', started)
+        return result
+
+    def _remote_intent_analysis(self, message: str, session_id: str = None) -> dict:
         """Analyze user intent using natural language processing with OpenAI and conversation context"""
         try:
             if not openai_client:
@@ -3102,7 +3674,9 @@ STANDARD EXAMPLES:
 Return only valid JSON:
 """
 
-            response = openai_client.chat.completions.create(
+            # Synchronous caller (runs in a worker thread): block on the shared gateway
+            response = llm_gateway.chat_completion_sync(
+                caller='intent_classifier',
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an expert intent classifier for DevOps commands. Return only valid JSON."},
@@ -3123,6 +3697,9 @@ Return only valid JSON:
             try:
                 result = json.loads(result_text)
                 print(f"OpenAI Intent Analysis: {result}")
+                self._inc_metric('intent_classifications_total', 'remote')
+                if _intent_cache is not None and isinstance(result, dict):
+                    _intent_cache.set(self._intent_cache_key(message, session_id), copy.deepcopy(result))
                 return result
             except json.JSONDecodeError:
                 print(f"Failed to parse OpenAI response: {result_text}")
@@ -3249,7 +3826,7 @@ Return only valid JSON:
             - "I need 50 instances for web servers across multiple regions" → {{"instance_count": 50, "multi_region": true, "use_case": "web servers"}}
             """
             
-            response = openai_client.chat.completions.create(
+            response = await openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
@@ -3548,7 +4125,7 @@ You don't have any EC2 instances running at the moment.
     def get_available_instance_types(self, region: str = 'us-east-1') -> List[Dict[str, Any]]:
         """Get all available instance types for a region"""
         try:
-            ec2_client = boto3.client('ec2', region_name=region)
+            ec2_client = _aws_client('ec2', region)
             response = ec2_client.describe_instance_types()
             
             instance_types = []
@@ -3585,7 +4162,7 @@ You don't have any EC2 instances running at the moment.
     def get_available_amis(self, region: str = 'us-east-1', os_filter: str = None) -> List[Dict[str, Any]]:
         """Get available AMIs for a region with optional OS filtering"""
         try:
-            ec2_client = boto3.client('ec2', region_name=region)
+            ec2_client = _aws_client('ec2', region)
             
             # Get Amazon Linux 2, Ubuntu, Windows AMIs
             filters = [
@@ -3625,7 +4202,7 @@ You don't have any EC2 instances running at the moment.
     def get_available_key_pairs(self, region: str = 'us-east-1') -> List[Dict[str, Any]]:
         """Get available key pairs for a region"""
         try:
-            ec2_client = boto3.client('ec2', region_name=region)
+            ec2_client = _aws_client('ec2', region)
             response = ec2_client.describe_key_pairs()
             return [{'KeyName': kp['KeyName'], 'KeyFingerprint': kp.get('KeyFingerprint', '')} for kp in response['KeyPairs']]
         except Exception as e:
@@ -3635,7 +4212,7 @@ You don't have any EC2 instances running at the moment.
     def get_available_vpcs(self, region: str = 'us-east-1') -> List[Dict[str, Any]]:
         """Get available VPCs for a region"""
         try:
-            ec2_client = boto3.client('ec2', region_name=region)
+            ec2_client = _aws_client('ec2', region)
             response = ec2_client.describe_vpcs()
             vpcs = []
             for vpc in response['Vpcs']:
@@ -3661,7 +4238,7 @@ You don't have any EC2 instances running at the moment.
     def get_available_subnets(self, region: str = 'us-east-1', vpc_id: str = None) -> List[Dict[str, Any]]:
         """Get available subnets for a region/VPC"""
         try:
-            ec2_client = boto3.client('ec2', region_name=region)
+            ec2_client = _aws_client('ec2', region)
             filters = []
             if vpc_id:
                 filters.append({'Name': 'vpc-id', 'Values': [vpc_id]})
@@ -3692,7 +4269,7 @@ You don't have any EC2 instances running at the moment.
     def get_available_security_groups(self, region: str = 'us-east-1', vpc_id: str = None) -> List[Dict[str, Any]]:
         """Get available security groups for a region/VPC"""
         try:
-            ec2_client = boto3.client('ec2', region_name=region)
+            ec2_client = _aws_client('ec2', region)
             filters = []
             if vpc_id:
                 filters.append({'Name': 'vpc-id', 'Values': [vpc_id]})
@@ -3755,22 +4332,26 @@ You don't have any EC2 instances running at the moment.
                     return f"❌ Instance {instance_id} not found in your account."
             
             # Create region-specific EC2 client
-            regional_ec2 = boto3.client('ec2', region_name=region)
+            regional_ec2 = _aws_client('ec2', region)
             
             if action == 'stop':
                 response = regional_ec2.stop_instances(InstanceIds=[instance_id])
+                _invalidate_cloud_reads('ec2_instances')
                 return f"✅ **Instance Stop Initiated**\n\n🔄 Stopping instance **{instance_id}** in **{region}**\n\nThe instance will take a few moments to stop. You won't be charged for compute time while it's stopped, but storage costs still apply."
             
             elif action == 'start':
                 response = regional_ec2.start_instances(InstanceIds=[instance_id])
+                _invalidate_cloud_reads('ec2_instances')
                 return f"✅ **Instance Start Initiated**\n\n🚀 Starting instance **{instance_id}** in **{region}**\n\nThe instance will take a few moments to start up and become available."
             
             elif action == 'reboot':
                 response = regional_ec2.reboot_instances(InstanceIds=[instance_id])
+                _invalidate_cloud_reads('ec2_instances')
                 return f"✅ **Instance Reboot Initiated**\n\n🔄 Rebooting instance **{instance_id}** in **{region}**\n\nThe instance will restart and be available in a few moments."
             
             elif action == 'terminate':
                 response = regional_ec2.terminate_instances(InstanceIds=[instance_id])
+                _invalidate_cloud_reads('ec2_instances')
                 return f"⚠️ **Instance Termination Initiated**\n\n🔥 Terminating instance **{instance_id}** in **{region}**\n\n**WARNING:** This action is IRREVERSIBLE. All data on the instance will be permanently lost unless you have EBS volumes or backups."
             
             else:
@@ -3783,7 +4364,7 @@ You don't have any EC2 instances running at the moment.
         """Manage all instances in a specific region"""
         try:
             # Get instances in the region
-            regional_ec2 = boto3.client('ec2', region_name=region)
+            regional_ec2 = _aws_client('ec2', region)
             response = regional_ec2.describe_instances(
                 Filters=[
                     {'Name': 'instance-state-name', 'Values': ['running', 'stopped']}
@@ -3807,18 +4388,22 @@ You don't have any EC2 instances running at the moment.
             # Perform the action
             if action == 'stop':
                 regional_ec2.stop_instances(InstanceIds=instance_ids)
+                _invalidate_cloud_reads('ec2_instances')
                 return f"✅ **Bulk Instance Stop Initiated**\n\n🔄 Stopping {len(instance_ids)} instance(s) in **{region}**:\n• " + "\n• ".join(instance_ids) + "\n\nInstances will stop in a few moments."
             
             elif action == 'start':
                 regional_ec2.start_instances(InstanceIds=instance_ids)
+                _invalidate_cloud_reads('ec2_instances')
                 return f"✅ **Bulk Instance Start Initiated**\n\n🚀 Starting {len(instance_ids)} instance(s) in **{region}**:\n• " + "\n• ".join(instance_ids) + "\n\nInstances will start in a few moments."
             
             elif action == 'reboot':
                 regional_ec2.reboot_instances(InstanceIds=instance_ids)
+                _invalidate_cloud_reads('ec2_instances')
                 return f"✅ **Bulk Instance Reboot Initiated**\n\n🔄 Rebooting {len(instance_ids)} instance(s) in **{region}**:\n• " + "\n• ".join(instance_ids) + "\n\nInstances will restart in a few moments."
             
             elif action == 'terminate':
                 regional_ec2.terminate_instances(InstanceIds=instance_ids)
+                _invalidate_cloud_reads('ec2_instances')
                 return f"⚠️ **Bulk Instance Termination Initiated**\n\n🔥 Terminating {len(instance_ids)} instance(s) in **{region}**:\n• " + "\n• ".join(instance_ids) + "\n\n**WARNING:** This action is IRREVERSIBLE!"
                 
         except Exception as e:
@@ -3862,16 +4447,20 @@ You don't have any EC2 instances running at the moment.
             results = []
             for region, instance_ids in regions_instances.items():
                 try:
-                    regional_ec2 = boto3.client('ec2', region_name=region)
+                    regional_ec2 = _aws_client('ec2', region)
                     
                     if action == 'stop':
                         regional_ec2.stop_instances(InstanceIds=instance_ids)
+                        _invalidate_cloud_reads('ec2_instances')
                     elif action == 'start':
                         regional_ec2.start_instances(InstanceIds=instance_ids)
+                        _invalidate_cloud_reads('ec2_instances')
                     elif action == 'reboot':
                         regional_ec2.reboot_instances(InstanceIds=instance_ids)
+                        _invalidate_cloud_reads('ec2_instances')
                     elif action == 'terminate':
                         regional_ec2.terminate_instances(InstanceIds=instance_ids)
+                        _invalidate_cloud_reads('ec2_instances')
                     
                     results.append(f"• **{region}:** {len(instance_ids)} instance(s)")
                 except Exception as e:
@@ -3950,7 +4539,7 @@ Perfect! Now I need to know which operating system to use:
             print(f"Provisioning EC2 instance: {instance_type} in {region} with {os_type}")
             
             # Create EC2 client for the specific region
-            ec2_client_region = boto3.client('ec2', region_name=region)
+            ec2_client_region = _aws_client('ec2', region)
             
             # Get valid AMI for the region and OS
             ami_id = await self._get_valid_ami(region, os_type)
@@ -3979,6 +4568,7 @@ Perfect! Now I need to know which operating system to use:
             
             # Actually provision the instance using the region-specific client
             response = ec2_client_region.run_instances(**config)
+            _invalidate_cloud_reads('ec2_instances')
             
             if response['Instances']:
                 instance_id = response['Instances'][0]['InstanceId']
@@ -4017,7 +4607,7 @@ Perfect! Now I need to know which operating system to use:
         """Get a valid AMI ID for the specified region and OS"""
         try:
             # Create region-specific EC2 client
-            ec2_client_region = boto3.client('ec2', region_name=region)
+            ec2_client_region = _aws_client('ec2', region)
             
             if 'amazon linux' in os_type.lower():
                 # Get Amazon Linux 2 AMI for the specific region
@@ -4836,7 +5426,7 @@ Available capabilities:
 Keep the response concise but informative. Include relevant emojis for better user experience.
 """
 
-                response = openai_client.chat.completions.create(
+                response = await openai_client.chat.completions.create(
                     model="gpt-3.5-turbo",
                     messages=[
                         {"role": "system", "content": "You are a helpful DevOps AI assistant. Be concise, professional, and actionable."},
@@ -4980,7 +5570,7 @@ What would you like to name your S3 bucket?
             # Create the bucket
             try:
                 # Use region-specific client always to avoid IllegalLocationConstraint issues
-                regional_s3 = boto3.client('s3', region_name=region or 'us-east-1')
+                regional_s3 = _aws_client('s3', region or 'us-east-1')
                 if (region or 'us-east-1') == 'us-east-1':
                     # us-east-1 doesn't need LocationConstraint
                     regional_s3.create_bucket(Bucket=bucket_name)
@@ -4989,6 +5579,7 @@ What would you like to name your S3 bucket?
                         Bucket=bucket_name,
                         CreateBucketConfiguration={'LocationConstraint': region}
                     )
+                _invalidate_cloud_reads('s3_buckets')
                 
                 # Set bucket permissions
                 if permissions == 'public':
@@ -5111,6 +5702,7 @@ All files, versions, and metadata will be permanently deleted.
                 
                 # Empty bucket - safe to delete
                 s3_client.delete_bucket(Bucket=bucket_name)
+                _invalidate_cloud_reads('s3_buckets')
                 return f"""✅ **Bucket Deleted Successfully**
 
 🗑️ **Bucket `{bucket_name}` has been permanently deleted.**
@@ -6585,6 +7177,7 @@ I can help you analyze incidents and perform intelligent root cause analysis.
                 Bucket=bucket_name,
                 CreateBucketConfiguration={'LocationConstraint': 'us-east-1'}
             )
+            _invalidate_cloud_reads('s3_buckets')
             
             return f"""✅ **S3 Bucket Created Successfully!**
 
@@ -6839,7 +7432,32 @@ Here are your databases:
         except Exception as e:
             return f"Error getting monitoring data: {str(e)}"
 
-    def get_real_costs(self):
+    @staticmethod
+    def _cacheable_cloud_result(value) -> bool:
+        # Error payloads are returned to the caller but never cached
+        return not (isinstance(value, dict) and 'error' in value)
+
+    def _cloud_read(self, api: str, loader, key=(), force: bool = False):
+        """Serve a cloud read through the shared read cache; returns (value, freshness)"""
+        if cloud_read_cache is None:
+            return loader(), None
+        read = cloud_read_cache.read(api, loader, key=key, cache_if=self._cacheable_cloud_result, force=force)
+        return read.value, read.freshness()
+
+    def _warm_cloud_cache(self) -> None:
+        """Load the dashboard reads in the background so the first page view is a cache hit"""
+        if cloud_read_cache is None:
+            return
+        cloud_read_cache.refresh('costs', self._fetch_real_costs, cache_if=self._cacheable_cloud_result)
+        regions = self._ec2_regions()
+        cloud_read_cache.refresh('ec2_instances', lambda: self._fetch_ec2_instances(regions), key=tuple(regions),
+                                 cache_if=self._cacheable_cloud_result)
+
+    def get_real_costs(self, force_refresh: bool = False):
+        """Get real AWS costs from Cost Explorer (cached; Cost Explorer bills per request)"""
+        return self._cloud_read('costs', self._fetch_real_costs, force=force_refresh)[0]
+
+    def _fetch_real_costs(self):
         """Get real AWS costs from Cost Explorer"""
         try:
             # Get costs for the current month
@@ -6888,7 +7506,11 @@ Here are your databases:
             else:
                 return {'error': str(e)}
 
-    def get_security_status(self):
+    def get_security_status(self, force_refresh: bool = False):
+        """Get real security status from AWS Security Hub (cached)"""
+        return self._cloud_read('security', self._fetch_security_status, force=force_refresh)[0]
+
+    def _fetch_security_status(self):
         """Get real security status from AWS Security Hub"""
         try:
             # Get security findings
@@ -6923,7 +7545,11 @@ Here are your databases:
         except Exception as e:
             return {'error': str(e)}
 
-    def get_monitoring_data(self):
+    def get_monitoring_data(self, force_refresh: bool = False):
+        """Get real monitoring data from CloudWatch (cached)"""
+        return self._cloud_read('monitoring', self._fetch_monitoring_data, force=force_refresh)[0]
+
+    def _fetch_monitoring_data(self):
         """Get real monitoring data from CloudWatch"""
         try:
             # Get EC2 instance metrics
@@ -7011,68 +7637,101 @@ Here are your databases:
         except Exception as e:
             return {'error': str(e)}
 
-    def get_ec2_instances(self, region_filter=None):
-        """Get real EC2 instances from AWS across all regions or filtered by region"""
+    @staticmethod
+    def _ec2_regions(region_filter=None) -> List[str]:
+        """Regions to list EC2 instances in: the filter, or the authorized set"""
+        if region_filter:
+            return [region_filter]
+        # Use a safe default set or env-configured regions to avoid AuthFailure spam
+        preferred = os.getenv('AWS_ALLOWED_REGIONS')
+        if preferred:
+            return [r.strip() for r in preferred.split(',') if r.strip()]
+        return ['us-east-1','us-west-2','eu-west-1','ap-southeast-1','ap-northeast-1']
+
+    def get_ec2_instances(self, region_filter=None, force_refresh: bool = False):
+        """Get real EC2 instances from AWS across all regions or filtered by region (cached)"""
+        regions = self._ec2_regions(region_filter)
+        return self._cloud_read('ec2_instances', lambda: self._fetch_ec2_instances(regions),
+                                key=tuple(regions), force=force_refresh)[0]
+
+    @staticmethod
+    def _describe_region_instances(region: str) -> List[Dict[str, Any]]:
+        """All non-terminated instances of one region, following every page"""
+        instances = []
+        paginator = _aws_client('ec2', region).get_paginator('describe_instances')
+        pages = paginator.paginate(
+            Filters=[{'Name': 'instance-state-name', 'Values': ['pending', 'running', 'stopping', 'stopped']}],
+            PaginationConfig={'PageSize': 1000}
+        )
+        for page in pages:
+            for reservation in page.get('Reservations', []):
+                for instance in reservation.get('Instances', []):
+                    instances.append({
+                        'InstanceId': instance['InstanceId'],
+                        'InstanceType': instance['InstanceType'],
+                        'State': instance['State']['Name'],
+                        'LaunchTime': instance['LaunchTime'].isoformat(),
+                        'PublicIpAddress': instance.get('PublicIpAddress', 'N/A'),
+                        'PrivateIpAddress': instance.get('PrivateIpAddress', 'N/A'),
+                        'Region': region,
+                        'AvailabilityZone': instance.get('Placement', {}).get('AvailabilityZone', 'N/A')
+                    })
+        return instances
+
+    def _fetch_ec2_instances(self, ec2_regions: List[str]):
+        """Get real EC2 instances from AWS, querying the regions in parallel"""
         try:
-            # Get regions to scan
-            if region_filter:
-                # Filter to specific region
-                ec2_regions = [region_filter]
-                print(f"Filtering EC2 instances to region: {region_filter}")
+            print(f"Scanning {len(ec2_regions)} regions for EC2 instances: {ec2_regions}")
+            if fan_out is not None:
+                results = fan_out(self._describe_region_instances, ec2_regions)
             else:
-                # Use a safe default set or env-configured regions to avoid AuthFailure spam
-                preferred = os.getenv('AWS_ALLOWED_REGIONS')
-                if preferred:
-                    ec2_regions = [r.strip() for r in preferred.split(',') if r.strip()]
-                else:
-                    ec2_regions = ['us-east-1','us-west-2','eu-west-1','ap-southeast-1','ap-northeast-1']
-                print(f"Scanning authorized {len(ec2_regions)} regions for EC2 instances: {ec2_regions}")
+                results = []
+                for region in ec2_regions:
+                    try:
+                        results.append((region, self._describe_region_instances(region), None))
+                    except Exception as e:
+                        results.append((region, None, e))
             
             all_instances = []
             region_counts = {}
-            
-            for region in ec2_regions:
-                try:
-                    # Create region-specific client
-                    regional_ec2 = boto3.client('ec2', region_name=region)
-                    response = regional_ec2.describe_instances()
-                    
-                    region_instance_count = 0
-                    for reservation in response['Reservations']:
-                        for instance in reservation['Instances']:
-                            # Only include running or stopped instances (not terminated)
-                            if instance['State']['Name'] not in ['terminated', 'terminating']:
-                                instance_info = {
-                                    'InstanceId': instance['InstanceId'],
-                                    'InstanceType': instance['InstanceType'],
-                                    'State': instance['State']['Name'],
-                                    'LaunchTime': instance['LaunchTime'].isoformat(),
-                                    'PublicIpAddress': instance.get('PublicIpAddress', 'N/A'),
-                                    'PrivateIpAddress': instance.get('PrivateIpAddress', 'N/A'),
-                                    'Region': region,
-                                    'AvailabilityZone': instance.get('Placement', {}).get('AvailabilityZone', 'N/A')
-                                }
-                                all_instances.append(instance_info)
-                                region_instance_count += 1
-                    
-                    if region_instance_count > 0:
-                        region_counts[region] = region_instance_count
-                        
-                except Exception as e:
+            failed_regions = {}
+            for region, instances, error in results:
+                if error is not None:
                     # Skip regions that are not accessible or enabled
-                    print(f"Skipping region {region}: {e}")
+                    print(f"Skipping region {region}: {error}")
+                    failed_regions[region] = str(error)
                     continue
+                all_instances.extend(instances)
+                if instances:
+                    region_counts[region] = len(instances)
             
-            return {
+            if failed_regions and len(failed_regions) == len(results):
+                # Nothing was listed (expired credentials, throttling): an error payload
+                # keeps the read cache on the last good listing instead of an empty one
+                return {
+                    'error': f"EC2 listing failed in every region: {next(iter(failed_regions.values()))}",
+                    'instances': [],
+                    'count': 0,
+                    'failed_regions': failed_regions
+                }
+            
+            listing = {
                 'instances': all_instances, 
                 'count': len(all_instances),
                 'regions': region_counts,
                 'total_regions_with_instances': len(region_counts)
             }
+            if failed_regions:
+                listing['failed_regions'] = failed_regions
+            return listing
         except Exception as e:
             return {'error': str(e), 'instances': [], 'count': 0}
 
-    def get_s3_buckets(self):
+    def get_s3_buckets(self, force_refresh: bool = False):
+        """Get real S3 buckets from AWS with detailed information (cached)"""
+        return self._cloud_read('s3_buckets', self._fetch_s3_buckets, force=force_refresh)[0]
+
+    def _fetch_s3_buckets(self):
         """Get real S3 buckets from AWS with detailed information"""
         try:
             response = s3_client.list_buckets()
@@ -7133,7 +7792,7 @@ Here are your databases:
         """Get the region of an S3 bucket"""
         try:
             # Use us-east-1 for Location since endpoint resolver expects that for classic
-            regional = boto3.client('s3', region_name='us-east-1')
+            regional = _aws_client('s3', 'us-east-1')
             response = regional.get_bucket_location(Bucket=bucket_name)
             return response['LocationConstraint'] or 'us-east-1'
         except Exception:
@@ -8052,6 +8711,93 @@ Here are your databases:
         except Exception as e:
             return f"Error in disaster recovery: {str(e)}"
 
+# --- Concurrent serving ---
+_worker_state = threading.local()
+
+
+def _run_async(coro):
+    """Run a coroutine on the calling worker thread's persistent event loop.
+
+    Worker threads live for the whole process, so each one keeps a single loop
+    and reuses it for every request it serves instead of asyncio.run() per call.
+    """
+    loop = getattr(_worker_state, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _worker_state.loop = loop
+    return loop.run_until_complete(coro)
+
+
+class BoundedThreadPoolServer(socketserver.TCPServer):
+    """TCPServer that hands accepted connections to a fixed pool of workers.
+
+    Connections wait in a bounded queue; once it is full new connections are
+    answered with 503 straight away so a burst of slow /chat calls cannot hold
+    /health and the webhooks hostage.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, workers: int = 16, max_queue: int = 64):
+        super().__init__(server_address, handler_class)
+        self._pending: 'queue.Queue' = queue.Queue(maxsize=max(1, max_queue))
+        self._workers: List[threading.Thread] = []
+        for i in range(max(1, workers)):
+            t = threading.Thread(target=self._worker_loop, name=f"ai-service-worker-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def queue_depth(self) -> int:
+        return self._pending.qsize()
+
+    def _worker_loop(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+        loop = getattr(_worker_state, 'loop', None)
+        if loop is not None and not loop.is_closed():
+            loop.close()
+
+    def process_request(self, request, client_address):
+        try:
+            self._pending.put_nowait((request, client_address))
+        except queue.Full:
+            self._reject_busy(request)
+
+    def _reject_busy(self, request) -> None:
+        IntelligentAIService._inc_metric('rejected_total', 'queue_full')
+        body = json.dumps({'error': 'server_busy'}).encode()
+        head = (
+            "HTTP/1.1 503 Service Unavailable\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Retry-After: 1\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        try:
+            request.sendall(head + body)
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        for _ in self._workers:
+            self._pending.put(None)
+        for t in self._workers:
+            t.join(timeout=5)
+
+
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
     print(f"\n🛑 Received signal {signum}. Shutting down gracefully...")
@@ -8085,9 +8831,23 @@ def run_server():
         print("🧭 Inventory scheduler started (INVENTORY_INTERVAL_SEC env controls interval)")
     except Exception as e:
         print(f"⚠️ Inventory scheduler not started: {e}")
+    try:
+        _Tmp._warm_cloud_cache(tmp)
+        print("🌡️ Cloud read cache warming (costs, EC2) in the background")
+    except Exception as e:
+        print(f"⚠️ Cloud read cache not warmed: {e}")
 
+    # AI_SERVICE_SERVER_MODE=single restores the old one-request-at-a-time server
+    server_mode = os.getenv('AI_SERVICE_SERVER_MODE', 'pool').lower()
     try:
-        with socketserver.TCPServer(("", port), IntelligentAIService) as httpd:
+        if server_mode == 'single':
+            httpd = socketserver.TCPServer(("", port), IntelligentAIService)
+        else:
+            workers = int(os.getenv('AI_SERVICE_WORKERS', '16'))
+            max_queue = int(os.getenv('AI_SERVICE_MAX_QUEUE', '64'))
+            httpd = BoundedThreadPoolServer(("", port), IntelligentAIService, workers=workers, max_queue=max_queue)
+            print(f"🧵 Serving with {workers} workers (queue limit {max_queue}, 503 when full)")
+        with httpd:
             httpd.serve_forever()
     except KeyboardInterrupt:
         print("\n🛑 Service stopped by user")
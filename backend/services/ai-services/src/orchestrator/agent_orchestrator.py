@@ -4,6 +4,7 @@ Manages agent lifecycle, task routing, load balancing, and inter-agent communica
 """
 
 import asyncio
+import time
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Type
 import uuid
@@ -69,6 +70,7 @@ from ..agents.cloud.cloud_ops_agent import CloudOpsAgent
 from ..config.settings import AgentType, settings
 from ..utils.logging import get_logger
 from ..utils.metrics import system_metrics
+from .task_scheduler import TaskScheduler, QueuedTask
 
 # New governance/safety/finops agents
 try:
@@ -165,7 +167,9 @@ class AgentOrchestrator:
         # Task management
         self.active_tasks: Dict[str, TaskAssignment] = {}
         self.completed_tasks: List[TaskAssignment] = []
-        self.task_queue: List[AgentTask] = []
+        self.task_queue = TaskScheduler()
+        # Set whenever a task is queued or an agent slot is released
+        self._dispatch_event = asyncio.Event()
         
         # Performance tracking
         self.agent_performance: Dict[str, Dict[str, Any]] = {}
@@ -177,6 +181,8 @@ class AgentOrchestrator:
         
         # Configuration
         self.max_concurrent_tasks_per_agent = settings.max_concurrent_agents
+        # Upper bound on how long the dispatcher sleeps without a wakeup
+        self.dispatch_idle_seconds = 30.0
         self.task_timeout_seconds = settings.agent_timeout_seconds
         self.retry_attempts = settings.retry_attempts
         
@@ -269,29 +275,20 @@ class AgentOrchestrator:
             task_id = task.id
             self.logger.info(f"Submitting task {task_id}: {task.description}")
             
-            # Route task to appropriate agent
-            agent_id = await self._route_task(task)
+            required_agent_type = await self._determine_agent_type_for_task(task)
+            
+            # Queued tasks of the same type go first; otherwise route directly
+            agent_id = None
+            if required_agent_type not in self.task_queue.pending_types():
+                agent_id = await self._route_task(task, required_agent_type)
             
             if agent_id:
-                # Create task assignment
-                assignment = TaskAssignment(
-                    task_id=task_id,
-                    agent_id=agent_id,
-                    agent_type=self.agents[agent_id].agent_type,
-                    task=task,
-                    assigned_at=datetime.now(timezone.utc)
-                )
-                
-                self.active_tasks[task_id] = assignment
-                
-                # Execute task asynchronously
-                asyncio.create_task(self._execute_task_assignment(assignment))
-                
-                self.load_balancer_stats['successful_assignments'] += 1
+                self._assign_task(task, agent_id)
                 return task_id
             else:
                 # Add to queue if no agent available
-                self.task_queue.append(task)
+                self.task_queue.push(required_agent_type, task)
+                self._dispatch_event.set()
                 self.logger.warning(f"No available agent for task {task_id}, added to queue")
                 return task_id
                 
@@ -348,7 +345,16 @@ class AgentOrchestrator:
             'active_tasks': len(self.active_tasks),
             'queued_tasks': len(self.task_queue),
             'agents': agent_statuses,
-            'load_balancer_stats': self.load_balancer_stats
+            'load_balancer_stats': self.load_balancer_stats,
+            'task_queue': self.task_queue.get_metrics()
+        }
+    
+    def get_queue_metrics(self) -> Dict[str, Any]:
+        """Queue depth and wait times per agent type, for sizing max_concurrent_agents"""
+        return {
+            'max_concurrent_tasks_per_agent': self.max_concurrent_tasks_per_agent,
+            'active_tasks': len(self.active_tasks),
+            **self.task_queue.get_metrics()
         }
     
     async def get_recommendations(
@@ -585,31 +591,63 @@ class AgentOrchestrator:
             except Exception as e:
                 self.logger.error(f"Error stopping agent {agent_id}: {str(e)}")
     
-    async def _route_task(self, task: AgentTask) -> Optional[str]:
+    async def _route_task(self, task: AgentTask, required_agent_type: Optional[AgentType] = None) -> Optional[str]:
         """Route task to the most appropriate available agent"""
         # Determine required agent type based on task type
-        required_agent_type = await self._determine_agent_type_for_task(task)
+        if required_agent_type is None:
+            required_agent_type = await self._determine_agent_type_for_task(task)
         
         if required_agent_type not in self.agent_types:
             self.logger.warning(f"No agents available for type {required_agent_type}")
             return None
         
-        # Find best available agent
+        best_agent_id = self._select_available_agent(required_agent_type)
+        if not best_agent_id:
+            return None
+        
+        self.load_balancer_stats['total_tasks_routed'] += 1
+        return best_agent_id
+    
+    def _select_available_agent(self, agent_type: AgentType) -> Optional[str]:
+        """Least loaded active agent of ``agent_type`` with a free slot"""
+        # Tasks handed to an agent but not yet started still hold a slot
+        pending: Dict[str, int] = {}
+        for assignment in self.active_tasks.values():
+            if assignment.task.status == TaskStatus.PENDING:
+                pending[assignment.agent_id] = pending.get(assignment.agent_id, 0) + 1
+        
         available_agents = []
-        for agent_id in self.agent_types[required_agent_type]:
+        for agent_id in self.agent_types.get(agent_type, []):
             agent = self.agents[agent_id]
-            if agent.is_active and len(agent.current_tasks) < self.max_concurrent_tasks_per_agent:
-                available_agents.append((agent_id, agent))
+            load = len(agent.current_tasks) + pending.get(agent_id, 0)
+            if agent.is_active and load < self.max_concurrent_tasks_per_agent:
+                available_agents.append((agent_id, load))
         
         if not available_agents:
             return None
         
         # Select agent with lowest current load
-        best_agent_id, _ = min(available_agents, key=lambda x: len(x[1].current_tasks))
-        
-        self.load_balancer_stats['total_tasks_routed'] += 1
+        best_agent_id, _ = min(available_agents, key=lambda x: x[1])
         return best_agent_id
     
+    def _assign_task(self, task: AgentTask, agent_id: str) -> TaskAssignment:
+        """Record the assignment and start executing it"""
+        assignment = TaskAssignment(
+            task_id=task.id,
+            agent_id=agent_id,
+            agent_type=self.agents[agent_id].agent_type,
+            task=task,
+            assigned_at=datetime.now(timezone.utc)
+        )
+        
+        self.active_tasks[task.id] = assignment
+        
+        # Execute task asynchronously
+        asyncio.create_task(self._execute_task_assignment(assignment))
+        
+        self.load_balancer_stats['successful_assignments'] += 1
+        return assignment
+    
     async def _determine_agent_type_for_task(self, task: AgentTask) -> AgentType:
         """Determine which agent type should handle the task"""
         task_type = task.task_type.lower()
@@ -667,23 +705,66 @@ class AgentOrchestrator:
             assignment.task.status = TaskStatus.FAILED
             assignment.task.error = str(e)
             self.logger.error(f"Task {assignment.task_id} failed: {str(e)}")
+        
+        finally:
+            # A slot was released; let the dispatcher hand it to a queued task
+            self._dispatch_event.set()
     
     async def _task_processing_loop(self):
-        """Background loop to process queued tasks"""
+        """Background loop that dispatches queued tasks whenever a slot frees up"""
         while self.status == OrchestratorStatus.RUNNING:
             try:
-                if self.task_queue:
-                    task = self.task_queue.pop(0)
-                    task_id = await self.submit_task(task)
-                    if task_id:
-                        self.logger.info(f"Processed queued task {task_id}")
+                # Sleep until a task is queued, a slot is released, or the nearest deadline
+                timeout = min(self.dispatch_idle_seconds, max(0.0, self.task_queue.next_deadline() - time.time()))
+                try:
+                    await asyncio.wait_for(self._dispatch_event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._dispatch_event.clear()
                 
-                await asyncio.sleep(1)  # Check every second
+                dispatched = self._dispatch_queued_tasks()
+                if dispatched:
+                    self.logger.info(f"Dispatched {dispatched} queued tasks ({len(self.task_queue)} still queued)")
                 
             except Exception as e:
                 self.logger.error(f"Error in task processing loop: {str(e)}")
                 await asyncio.sleep(5)  # Wait longer on error
     
+    def _dispatch_queued_tasks(self) -> int:
+        """Hand queued tasks to free agent slots; returns the number dispatched"""
+        dispatched = 0
+        # Expire overdue tasks first, including those of agent types with no free slot
+        for expired_entry in self.task_queue.expire():
+            self._record_expired(expired_entry)
+        for agent_type in self.task_queue.pending_types():
+            while True:
+                agent_id = self._select_available_agent(agent_type)
+                if not agent_id:
+                    break
+                entry, expired = self.task_queue.pop(agent_type)
+                for expired_entry in expired:
+                    self._record_expired(expired_entry)
+                if entry is None:
+                    break
+                self.load_balancer_stats['total_tasks_routed'] += 1
+                self._assign_task(entry.task, agent_id)
+                dispatched += 1
+        return dispatched
+    
+    def _record_expired(self, entry: QueuedTask):
+        """Track a task that timed out in the queue like any other finished task"""
+        self.completed_tasks.append(TaskAssignment(
+            task_id=entry.task.id,
+            agent_id="",
+            agent_type=entry.agent_type,
+            task=entry.task,
+            assigned_at=datetime.now(timezone.utc),
+            status=TaskStatus.TIMEOUT
+        ))
+        if len(self.completed_tasks) > 1000:
+            self.completed_tasks = self.completed_tasks[-1000:]
+        self.logger.warning(f"Task {entry.task.id} expired in queue before dispatch")
+    
     async def _health_monitoring_loop(self):
         """Background loop to monitor agent health"""
         while self.status == OrchestratorStatus.RUNNING:
@@ -4,7 +4,9 @@ Handles complex requests that require multiple specialized agents working togeth
 """
 
 import asyncio
+import copy
 import json
+import time
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
@@ -43,6 +45,7 @@ class AgentStep:
     status: str = "pending"
     execution_time: Optional[float] = None
     error_message: Optional[str] = None
+    timeout_seconds: Optional[float] = None  # Falls back to the orchestrator default
 
 
 @dataclass 
@@ -59,6 +62,7 @@ class MultiAgentWorkflow:
     actual_duration: Optional[int] = None
     user_id: str = ""
     session_id: str = ""
+    fail_fast: bool = False  # Stop scheduling new steps after the first failure
 
 
 class MultiAgentWorkflowOrchestrator:
@@ -74,10 +78,14 @@ class MultiAgentWorkflowOrchestrator:
     - Context passing between agents
     """
     
-    def __init__(self, openai_client=None):
+    def __init__(self, openai_client=None, max_parallel_steps: int = 4, step_timeout_seconds: float = 300.0):
         self.openai_client = openai_client
         self.active_workflows: Dict[str, MultiAgentWorkflow] = {}
         
+        # DAG execution limits
+        self.max_parallel_steps = max(1, max_parallel_steps)
+        self.step_timeout_seconds = step_timeout_seconds
+        
         # Workflow templates for common scenarios
         self.workflow_templates = {
             "production_environment": self._get_production_env_template(),
@@ -239,7 +247,8 @@ Examples:
         
         # Use template if available, otherwise create custom workflow
         if workflow_type in self.workflow_templates:
-            steps = self.workflow_templates[workflow_type].copy()
+            # Steps are mutated during execution, so each workflow gets its own copies
+            steps = copy.deepcopy(self.workflow_templates[workflow_type])
         else:
             steps = await self._generate_custom_workflow_steps(user_request, analysis)
         
@@ -257,65 +266,99 @@ Examples:
         return workflow
 
     async def _execute_workflow(self, workflow: MultiAgentWorkflow) -> Dict[str, Any]:
-        """Execute multi-agent workflow with dependency resolution"""
+        """
+        Execute multi-agent workflow as a DAG.
+        
+        Steps whose dependencies have completed run concurrently (at most
+        ``max_parallel_steps`` at a time), each under its own timeout. A failed
+        step skips its dependents; with ``workflow.fail_fast`` it also cancels
+        running steps and stops scheduling new ones.
+        """
         try:
             workflow.status = WorkflowStatus.EXECUTING
             start_time = datetime.now(timezone.utc)
+            started = time.perf_counter()
             
-            results = []
-            step_outputs = {}  # Store outputs for dependency resolution
+            steps_by_name = {step.agent_name: step for step in workflow.steps}
+            step_results: Dict[str, Dict[str, Any]] = {}
+            finished_at: Dict[str, float] = {}
             
-            # Execute steps in dependency order
-            for step in workflow.steps:
-                try:
-                    # Wait for dependencies to complete
-                    if step.dependencies:
-                        missing_deps = [dep for dep in step.dependencies if dep not in step_outputs]
-                        if missing_deps:
-                            step.status = "failed"
-                            step.error_message = f"Missing dependencies: {missing_deps}"
-                            continue
-                        
-                        # Merge dependency outputs into step inputs
-                        for dep in step.dependencies:
-                            step.inputs.update(step_outputs[dep])
-                    
-                    # Execute the step
-                    step_start = datetime.now(timezone.utc)
-                    step_result = await self._execute_workflow_step(step, workflow.context)
-                    step_end = datetime.now(timezone.utc)
-                    
-                    step.execution_time = (step_end - step_start).total_seconds()
-                    step.outputs = step_result.get("outputs", {})
-                    step.status = "completed" if step_result.get("success") else "failed"
-                    
-                    if step.status == "failed":
-                        step.error_message = step_result.get("error", "Unknown error")
-                    
-                    # Store outputs for dependent steps
-                    step_outputs[step.agent_name] = step.outputs
-                    
-                    results.append({
-                        "step": step.agent_name,
-                        "status": step.status,
-                        "result": step_result.get("response", ""),
-                        "execution_time": step.execution_time
-                    })
+            # Steps that can never run: unknown dependencies or dependency cycles
+            blocked = self._find_unrunnable_steps(workflow.steps, steps_by_name)
+            for name, reason in blocked.items():
+                steps_by_name[name].status = "failed"
+                steps_by_name[name].error_message = reason
+                step_results[name] = {"step": name, "status": "failed", "error": reason}
+            
+            remaining_deps = {
+                step.agent_name: set(step.dependencies)
+                for step in workflow.steps if step.agent_name not in blocked
+            }
+            dependents: Dict[str, List[str]] = {name: [] for name in steps_by_name}
+            for name, deps in remaining_deps.items():
+                for dep in deps:
+                    dependents[dep].append(name)
+            
+            semaphore = asyncio.Semaphore(self.max_parallel_steps)
+            running: Dict[asyncio.Task, str] = {}
+            aborted = False
+            
+            def launch_ready():
+                for name in [n for n, deps in remaining_deps.items() if not deps]:
+                    del remaining_deps[name]
+                    task = asyncio.create_task(
+                        self._run_workflow_step(steps_by_name[name], steps_by_name, workflow.context, semaphore)
+                    )
+                    running[task] = name
+            
+            def skip_dependents(name: str, reason: str):
+                for child in dependents.get(name, []):
+                    if child in remaining_deps:
+                        del remaining_deps[child]
+                        steps_by_name[child].status = "skipped"
+                        steps_by_name[child].error_message = reason
+                        step_results[child] = {"step": child, "status": "skipped", "error": reason}
+                        skip_dependents(child, reason)
+            
+            launch_ready()
+            while running:
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    step_results[name] = task.result()
+                    finished_at[name] = time.perf_counter() - started
                     
-                except Exception as e:
-                    step.status = "failed"
-                    step.error_message = str(e)
-                    results.append({
-                        "step": step.agent_name,
-                        "status": "failed",
-                        "error": str(e)
-                    })
+                    if steps_by_name[name].status == "completed":
+                        for child in dependents.get(name, []):
+                            if child in remaining_deps:
+                                remaining_deps[child].discard(name)
+                    else:
+                        skip_dependents(name, f"Skipped: dependency '{name}' failed")
+                        if workflow.fail_fast:
+                            aborted = True
+                
+                if aborted:
+                    for task, name in running.items():
+                        task.cancel()
+                        steps_by_name[name].status = "cancelled"
+                        steps_by_name[name].error_message = "Cancelled after another step failed (fail-fast)"
+                        step_results[name] = {"step": name, "status": "cancelled", "error": steps_by_name[name].error_message}
+                    await asyncio.gather(*running, return_exceptions=True)
+                    running.clear()
+                    for name in list(remaining_deps):
+                        steps_by_name[name].status = "skipped"
+                        steps_by_name[name].error_message = "Skipped after another step failed (fail-fast)"
+                        step_results[name] = {"step": name, "status": "skipped", "error": steps_by_name[name].error_message}
+                    remaining_deps.clear()
+                    break
+                
+                launch_ready()
             
             # Calculate final status and duration
             end_time = datetime.now(timezone.utc)
             workflow.actual_duration = (end_time - start_time).total_seconds()
             
-            failed_steps = [s for s in workflow.steps if s.status == "failed"]
+            failed_steps = [s for s in workflow.steps if s.status != "completed"]
             if failed_steps:
                 workflow.status = WorkflowStatus.FAILED
             else:
@@ -325,7 +368,9 @@ Examples:
                 "workflow_id": workflow.workflow_id,
                 "status": workflow.status,
                 "duration": workflow.actual_duration,
-                "steps": results,
+                "steps": [step_results[step.agent_name] for step in workflow.steps if step.agent_name in step_results],
+                "critical_path": self._critical_path(workflow.steps, steps_by_name),
+                "total_step_time": round(sum(s.execution_time or 0.0 for s in workflow.steps), 3),
                 "summary": self._generate_workflow_summary(workflow)
             }
             
@@ -337,6 +382,125 @@ Examples:
                 "error": str(e)
             }
 
+    async def _run_workflow_step(
+        self,
+        step: AgentStep,
+        steps_by_name: Dict[str, AgentStep],
+        context: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """Run one ready step under the concurrency limit and its timeout"""
+        async with semaphore:
+            # Merge dependency outputs into step inputs
+            for dep in step.dependencies:
+                step.inputs.update(steps_by_name[dep].outputs)
+            
+            timeout = step.timeout_seconds or self.step_timeout_seconds
+            step.status = "running"
+            step_start = time.perf_counter()
+            try:
+                step_result = await asyncio.wait_for(self._execute_workflow_step(step, context), timeout=timeout)
+            except asyncio.TimeoutError:
+                step_result = {"success": False, "error": f"Step timed out after {timeout}s", "outputs": {}}
+            except Exception as e:
+                step_result = {"success": False, "error": str(e), "outputs": {}}
+            
+            step.execution_time = time.perf_counter() - step_start
+            step.outputs = step_result.get("outputs", {})
+            step.status = "completed" if step_result.get("success") else "failed"
+            
+            if step.status == "failed":
+                step.error_message = step_result.get("error", "Unknown error")
+                return {
+                    "step": step.agent_name,
+                    "status": "failed",
+                    "error": step.error_message,
+                    "execution_time": step.execution_time
+                }
+            
+            return {
+                "step": step.agent_name,
+                "status": step.status,
+                "result": step_result.get("response", ""),
+                "execution_time": step.execution_time
+            }
+
+    def _find_unrunnable_steps(self, steps: List[AgentStep], steps_by_name: Dict[str, AgentStep]) -> Dict[str, str]:
+        """Steps with unknown dependencies, inside a dependency cycle, or downstream of either"""
+        blocked: Dict[str, str] = {}
+        for step in steps:
+            missing_deps = [dep for dep in step.dependencies if dep not in steps_by_name]
+            if missing_deps:
+                blocked[step.agent_name] = f"Missing dependencies: {missing_deps}"
+        
+        # Kahn's algorithm: anything never reaching in-degree zero is in or behind a cycle
+        indegree = {step.agent_name: len(step.dependencies) for step in steps}
+        dependents: Dict[str, List[str]] = {name: [] for name in steps_by_name}
+        for step in steps:
+            for dep in step.dependencies:
+                if dep in dependents:
+                    dependents[dep].append(step.agent_name)
+        ready = [name for name, degree in indegree.items() if degree == 0]
+        resolved = set()
+        while ready:
+            name = ready.pop()
+            if name in blocked:
+                continue
+            resolved.add(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        
+        for step in steps:
+            if step.agent_name not in resolved and step.agent_name not in blocked:
+                blocked[step.agent_name] = "Unresolvable dependencies (missing step or dependency cycle upstream)"
+        return blocked
+
+    def _critical_path(self, steps: List[AgentStep], steps_by_name: Dict[str, AgentStep]) -> Dict[str, Any]:
+        """Longest chain of dependent step durations - the lower bound on workflow duration
+
+        Only completed steps are considered. A step completes only after all of its
+        dependencies did, so they form a DAG even when the workflow has a cycle.
+        """
+        completed = {step.agent_name for step in steps if step.status == "completed"}
+        longest: Dict[str, Tuple[float, Optional[str]]] = {}
+        visiting = set()
+        
+        def visit(name: str) -> float:
+            if name in longest:
+                return longest[name][0]
+            visiting.add(name)
+            step = steps_by_name[name]
+            best_dep, best = None, 0.0
+            for dep in step.dependencies:
+                if dep in completed and dep not in visiting:
+                    length = visit(dep)
+                    if best_dep is None or length > best:
+                        best_dep, best = dep, length
+            visiting.discard(name)
+            longest[name] = (best + (step.execution_time or 0.0), best_dep)
+            return longest[name][0]
+        
+        end, duration = None, 0.0
+        for step in steps:
+            if step.agent_name not in completed:
+                continue
+            length = visit(step.agent_name)
+            if end is None or length > duration:
+                end, duration = step.agent_name, length
+        
+        path = []
+        while end is not None:
+            path.append(end)
+            end = longest[end][1]
+        path.reverse()
+        
+        return {
+            "steps": path,
+            "duration": round(duration, 3)
+        }
+
     async def _execute_workflow_step(self, step: AgentStep, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute individual workflow step by calling appropriate agent"""
         try:
@@ -0,0 +1,221 @@
+"""
+Task Scheduler - Priority queues for tasks waiting on an agent slot
+Per-agent-type queues ordered by priority and deadline, fair across tenants
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..agents.base_agent import AgentTask, Priority, TaskStatus
+from ..config.settings import AgentType
+from ..utils.metrics import LatencyHistogram
+
+
+# Lower rank is dispatched first
+PRIORITY_RANK = {
+    Priority.CRITICAL: 0,
+    Priority.HIGH: 1,
+    Priority.MEDIUM: 2,
+    Priority.LOW: 3,
+}
+
+QUEUE_WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0)
+
+
+@dataclass(order=True)
+class QueuedTask:
+    """Heap entry for a task waiting on an agent slot"""
+    rank: int
+    deadline: float
+    seq: int
+    task: AgentTask = field(compare=False)
+    agent_type: AgentType = field(compare=False)
+    tenant_id: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+def task_tenant(task: AgentTask) -> str:
+    """Tenant a task is accounted to for fair sharing"""
+    return str(task.context.get("tenant_id") or task.metadata.get("tenant_id") or "default")
+
+
+def task_deadline(task: AgentTask) -> float:
+    """Absolute deadline (epoch seconds) from task context/metadata, or +inf"""
+    value = task.metadata.get("deadline", task.context.get("deadline"))
+    if value is None:
+        return float("inf")
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return float("inf")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("inf")
+
+
+class TaskScheduler:
+    """
+    Queues tasks per agent type until an agent slot frees up.
+
+    Within a tenant, tasks are ordered by priority, then earliest deadline, then
+    submission order. Across tenants of the same agent type the most urgent head
+    wins and ties go round-robin, so one tenant's backlog cannot starve another's.
+    Tasks whose deadline passes while queued are expired rather than dispatched.
+    """
+
+    def __init__(self):
+        self._queues: Dict[AgentType, Dict[str, List[QueuedTask]]] = {}
+        self._tenant_order: Dict[AgentType, Deque[str]] = {}
+        self._seq = itertools.count()
+        self._size = 0
+
+        self.wait_time: Dict[AgentType, LatencyHistogram] = {}
+        self.stats = {
+            'enqueued': 0,
+            'dispatched': 0,
+            'expired': 0
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, agent_type: AgentType, task: AgentTask) -> QueuedTask:
+        """Queue a task for the given agent type"""
+        tenant_id = task_tenant(task)
+        entry = QueuedTask(
+            rank=PRIORITY_RANK.get(task.priority, PRIORITY_RANK[Priority.MEDIUM]),
+            deadline=task_deadline(task),
+            seq=next(self._seq),
+            task=task,
+            agent_type=agent_type,
+            tenant_id=tenant_id,
+            enqueued_at=time.time()
+        )
+        tenants = self._queues.setdefault(agent_type, {})
+        if tenant_id not in tenants:
+            tenants[tenant_id] = []
+            self._tenant_order.setdefault(agent_type, deque()).append(tenant_id)
+        heapq.heappush(tenants[tenant_id], entry)
+        self._size += 1
+        self.stats['enqueued'] += 1
+        return entry
+
+    def pending_types(self) -> List[AgentType]:
+        """Agent types that currently have queued tasks"""
+        return [agent_type for agent_type, tenants in self._queues.items() if tenants]
+
+    def pop(self, agent_type: AgentType) -> Tuple[Optional[QueuedTask], List[QueuedTask]]:
+        """
+        Take the next task for ``agent_type``.
+
+        Returns ``(entry, expired)`` where ``expired`` holds tasks whose deadline
+        passed while they waited; they are marked TIMEOUT and removed.
+        """
+        expired: List[QueuedTask] = []
+        tenants = self._queues.get(agent_type)
+        order = self._tenant_order.get(agent_type)
+        now = time.time()
+
+        while tenants:
+            best_tenant = None
+            best_head = None
+            for tenant_id in order:
+                head = tenants[tenant_id][0]
+                if best_head is None or (head.rank, head.deadline) < (best_head.rank, best_head.deadline):
+                    best_tenant, best_head = tenant_id, head
+
+            heap = tenants[best_tenant]
+            entry = heapq.heappop(heap)
+            self._size -= 1
+            order.remove(best_tenant)
+            if heap:
+                order.append(best_tenant)
+            else:
+                del tenants[best_tenant]
+
+            if entry.deadline <= now:
+                entry.task.status = TaskStatus.TIMEOUT
+                entry.task.error = "Deadline passed before an agent became available"
+                self.stats['expired'] += 1
+                expired.append(entry)
+                continue
+
+            self.stats['dispatched'] += 1
+            self._wait_histogram(agent_type).observe(now - entry.enqueued_at)
+            return entry, expired
+
+        return None, expired
+
+    def expire(self, now: Optional[float] = None) -> List[QueuedTask]:
+        """
+        Remove every queued task whose deadline has passed, across all agent types.
+
+        Runs whether or not a slot is free, so an expired task never keeps the
+        dispatcher waking up for a deadline that is already behind it.
+        """
+        now = time.time() if now is None else now
+        expired: List[QueuedTask] = []
+        for agent_type, tenants in self._queues.items():
+            order = self._tenant_order.get(agent_type)
+            for tenant_id in list(tenants):
+                heap = tenants[tenant_id]
+                due = [entry for entry in heap if entry.deadline <= now]
+                if not due:
+                    continue
+                heap[:] = [entry for entry in heap if entry.deadline > now]
+                heapq.heapify(heap)
+                if not heap:
+                    del tenants[tenant_id]
+                    order.remove(tenant_id)
+                for entry in due:
+                    entry.task.status = TaskStatus.TIMEOUT
+                    entry.task.error = "Deadline passed before an agent became available"
+                self._size -= len(due)
+                self.stats['expired'] += len(due)
+                expired.extend(due)
+        return expired
+
+    def next_deadline(self) -> float:
+        """Earliest deadline still ahead among queued tasks (epoch seconds), or +inf"""
+        earliest = float("inf")
+        now = time.time()
+        for tenants in self._queues.values():
+            for heap in tenants.values():
+                for entry in heap:
+                    if now < entry.deadline < earliest:
+                        earliest = entry.deadline
+        return earliest
+
+    def _wait_histogram(self, agent_type: AgentType) -> LatencyHistogram:
+        histogram = self.wait_time.get(agent_type)
+        if histogram is None:
+            histogram = self.wait_time[agent_type] = LatencyHistogram(QUEUE_WAIT_BUCKETS)
+        return histogram
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth and wait-time distribution per agent type"""
+        now = time.time()
+        per_type: Dict[str, Any] = {}
+        for agent_type, tenants in self._queues.items():
+            entries = [entry for heap in tenants.values() for entry in heap]
+            histogram = self.wait_time.get(agent_type)
+            per_type[agent_type.value] = {
+                'depth': len(entries),
+                'tenants': len(tenants),
+                'oldest_wait_seconds': max((now - e.enqueued_at for e in entries), default=0.0),
+                'wait_time': histogram.snapshot() if histogram else None
+            }
+        return {
+            'depth': self._size,
+            **self.stats,
+            'by_agent_type': per_type
+        }
@@ -0,0 +1,326 @@
+"""
+Plugin Execution Pool
+Runs plugin methods in-loop, on a per-plugin thread pool or in per-plugin
+worker processes, each plugin with its own concurrency cap, deadline and
+circuit breaker, so one misbehaving plugin cannot stall the event loop
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Optional, Sequence
+
+
+class ExecutionMode(str, Enum):
+    IN_LOOP = "in_loop"        # awaited on the service loop; only for trusted, non-blocking plugins
+    THREAD = "thread"          # per-plugin thread pool; coroutine methods run on a private event loop
+    SUBPROCESS = "subprocess"  # per-plugin worker processes; instance and arguments must be picklable
+
+
+@dataclass
+class ExecutionPolicy:
+    """How one plugin's methods are executed"""
+    mode: ExecutionMode = ExecutionMode.THREAD
+    max_concurrency: int = 4
+    timeout: float = 30.0          # deadline per call, including the wait for a free slot
+    failure_threshold: int = 5     # consecutive failures that open the circuit; 0 disables
+    reset_timeout: float = 60.0    # seconds the circuit stays open before a trial call
+
+
+class PluginExecutionError(Exception):
+    """A plugin call could not be completed by the execution pool"""
+
+
+class PluginTimeoutError(PluginExecutionError):
+    """A plugin call missed its deadline"""
+
+
+class CircuitOpenError(PluginExecutionError):
+    """A plugin call was rejected because the plugin's circuit is open"""
+
+
+def _call_plugin(instance: Any, method: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+    """Call a plugin method synchronously; coroutine methods get their own event loop"""
+    result = getattr(instance, method)(*args, **kwargs)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+async def _call_plugin_in_loop(instance: Any, method: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+    result = getattr(instance, method)(*args, **kwargs)
+    if asyncio.iscoroutine(result) or asyncio.isfuture(result):
+        result = await result
+    return result
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` failures in a row; while open every call
+    is rejected. After ``reset_timeout`` a single trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    Used from the event loop only, so it needs no locking.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.failure_threshold <= 0:
+            return
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """A trial call ended without an outcome (e.g. the caller was cancelled)"""
+        self._trial_in_flight = False
+
+
+class _Lane:
+    """Execution resources of one plugin"""
+
+    def __init__(self, plugin_id: str, policy: ExecutionPolicy):
+        self.plugin_id = plugin_id
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(max(1, policy.max_concurrency))
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+        self.threads: Optional[ThreadPoolExecutor] = None
+        self.processes = None  # multiprocessing.pool.Pool, created on first use
+        self.pending_process_calls: set = set()
+        self.in_flight = 0
+
+    def shutdown(self):
+        if self.threads is not None:
+            self.threads.shutdown(wait=False)
+            self.threads = None
+        if self.processes is not None:
+            self.processes.terminate()
+            self.processes = None
+        for future in self.pending_process_calls:
+            if not future.done():
+                future.set_exception(PluginExecutionError(f"Worker processes of {self.plugin_id} were stopped"))
+        self.pending_process_calls.clear()
+
+
+class PluginExecutionPool:
+    """
+    Per-plugin execution lanes.
+
+    A call holds one of its plugin's concurrency slots until the underlying
+    work actually finishes, so a plugin whose calls hang past their deadline
+    exhausts its own slots rather than shared capacity. Timed-out in-loop
+    calls are cancelled and timed-out subprocess calls restart that plugin's
+    worker processes; a thread cannot be interrupted, so a timed-out thread
+    call keeps its slot until it returns.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lanes: Dict[str, _Lane] = {}
+        self._mp_context = multiprocessing.get_context("spawn")
+
+    def configure(self, plugin_id: str, policy: ExecutionPolicy):
+        """Set a plugin's policy; calls already running finish on the previous lane"""
+        previous = self._lanes.get(plugin_id)
+        self._lanes[plugin_id] = _Lane(plugin_id, policy)
+        if previous is not None:
+            self._retire(previous)
+
+    def remove(self, plugin_id: str):
+        lane = self._lanes.pop(plugin_id, None)
+        if lane is not None:
+            self._retire(lane)
+
+    def policy(self, plugin_id: str) -> Optional[ExecutionPolicy]:
+        lane = self._lanes.get(plugin_id)
+        return lane.policy if lane else None
+
+    def _retire(self, lane: _Lane):
+        if lane.threads is not None:
+            lane.threads.shutdown(wait=False)
+            lane.threads = None
+        if lane.processes is not None:
+            lane.processes.close()  # workers exit once their queued calls are done
+            lane.processes = None
+
+    async def run(self, plugin_id: str, instance: Any, method: str,
+                  args: Sequence[Any] = (), kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call ``instance.method(*args, **kwargs)`` under the plugin's policy.
+
+        Raises CircuitOpenError without running anything while the circuit is
+        open, PluginTimeoutError when the deadline passes, and otherwise
+        whatever the plugin method raised.
+        """
+        lane = self._lanes.get(plugin_id)
+        if lane is None:
+            raise PluginExecutionError(f"Plugin {plugin_id} has no execution policy")
+        policy = lane.policy
+        kwargs = kwargs or {}
+
+        if not lane.breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit open for plugin {plugin_id} after "
+                f"{lane.breaker.consecutive_failures} consecutive failures"
+            )
+
+        deadline = time.monotonic() + policy.timeout
+        try:
+            try:
+                await asyncio.wait_for(lane.semaphore.acquire(), policy.timeout)
+            except asyncio.TimeoutError:
+                raise PluginTimeoutError(
+                    f"Plugin {plugin_id} has {policy.max_concurrency} calls in flight; "
+                    f"no slot freed within {policy.timeout}s"
+                ) from None
+
+            try:
+                future = self._submit(lane, instance, method, args, kwargs)
+            except Exception:
+                lane.semaphore.release()
+                raise
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                await self._abandon(lane, future)
+                raise PluginTimeoutError(
+                    f"Plugin {plugin_id}.{method} exceeded its {policy.timeout}s deadline"
+                ) from None
+        except asyncio.CancelledError:
+            lane.breaker.release_trial()
+            raise
+        except Exception:
+            lane.breaker.record_failure()
+            if lane.breaker.state == CircuitBreaker.OPEN:
+                self.logger.warning(f"Circuit opened for plugin {plugin_id}")
+            raise
+
+        lane.breaker.record_success()
+        return result
+
+    def _submit(self, lane: _Lane, instance: Any, method: str,
+                args: Sequence[Any], kwargs: Dict[str, Any]) -> asyncio.Future:
+        """Start the call; the lane's slot is released when the work itself completes"""
+        loop = asyncio.get_running_loop()
+        mode = lane.policy.mode
+
+        if mode == ExecutionMode.IN_LOOP:
+            future = asyncio.ensure_future(_call_plugin_in_loop(instance, method, args, kwargs))
+        elif mode == ExecutionMode.THREAD:
+            if lane.threads is None:
+                lane.threads = ThreadPoolExecutor(
+                    max_workers=max(1, lane.policy.max_concurrency),
+                    thread_name_prefix=f"plugin-{lane.plugin_id}"
+                )
+            future = loop.run_in_executor(
+                lane.threads, functools.partial(_call_plugin, instance, method, args, kwargs)
+            )
+        elif mode == ExecutionMode.SUBPROCESS:
+            future = self._submit_to_processes(lane, loop, instance, method, args, kwargs)
+        else:
+            raise PluginExecutionError(f"Unknown execution mode: {mode}")
+
+        lane.in_flight += 1
+
+        def _finished(_):
+            lane.in_flight -= 1
+            lane.semaphore.release()
+            if not future.cancelled():
+                future.exception()  # retrieved here so abandoned calls do not log "never retrieved"
+
+        future.add_done_callback(_finished)
+        return future
+
+    def _submit_to_processes(self, lane: _Lane, loop, instance: Any, method: str,
+                             args: Sequence[Any], kwargs: Dict[str, Any]) -> asyncio.Future:
+        if lane.processes is None:
+            lane.processes = self._mp_context.Pool(processes=max(1, lane.policy.max_concurrency))
+        future = loop.create_future()
+        lane.pending_process_calls.add(future)
+        future.add_done_callback(lane.pending_process_calls.discard)
+
+        def _resolve(value, failed: bool):
+            if future.done():
+                return
+            if failed:
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+        lane.processes.apply_async(
+            _call_plugin, (instance, method, args, kwargs),
+            callback=lambda value: loop.call_soon_threadsafe(_resolve, value, False),
+            error_callback=lambda error: loop.call_soon_threadsafe(_resolve, error, True)
+        )
+        return future
+
+    async def _abandon(self, lane: _Lane, future: asyncio.Future):
+        """Stop what can be stopped of a call that missed its deadline"""
+        mode = lane.policy.mode
+        if mode == ExecutionMode.IN_LOOP:
+            future.cancel()
+        elif mode == ExecutionMode.SUBPROCESS and lane.processes is not None:
+            # a worker cannot be interrupted individually; restart the plugin's workers
+            processes, lane.processes = lane.processes, None
+            pending = list(lane.pending_process_calls)
+            await asyncio.get_running_loop().run_in_executor(None, processes.terminate)
+            for call in pending:
+                if not call.done():
+                    call.set_exception(PluginExecutionError(
+                        f"Worker processes of {lane.plugin_id} restarted after a timeout"
+                    ))
+            self.logger.warning(f"Restarted worker processes of plugin {lane.plugin_id} after a timeout")
+
+    def lane_stats(self, plugin_id: str) -> Optional[Dict[str, Any]]:
+        lane = self._lanes.get(plugin_id)
+        if lane is None:
+            return None
+        return {
+            "mode": lane.policy.mode.value,
+            "max_concurrency": lane.policy.max_concurrency,
+            "timeout": lane.policy.timeout,
+            "in_flight": lane.in_flight,
+            "circuit_state": lane.breaker.state,
+            "consecutive_failures": lane.breaker.consecutive_failures
+        }
+
+    def shutdown(self):
+        """Stop all worker threads and processes"""
+        for lane in self._lanes.values():
+            lane.shutdown()
@@ -10,11 +10,12 @@ import importlib
 import inspect
 from typing import Dict, Any, List, Optional, Union, Callable
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import uuid
 import yaml
 import os
+import time
 from pathlib import Path
 
 try:
@@ -27,6 +28,19 @@ except ImportError:
         ALLOWED_PLUGIN_TYPES = ["agent", "tool", "integration"]
     settings = MockSettings()
 
+from .execution_pool import (
+    CircuitOpenError,
+    ExecutionMode,
+    ExecutionPolicy,
+    PluginExecutionPool,
+    PluginTimeoutError
+)
+
+try:
+    from ..utils.metrics import LatencyHistogram
+except ImportError:  # imported as the top-level ``plugins`` package
+    from utils.metrics import LatencyHistogram
+
 
 class PluginType(str, Enum):
     AGENT = "agent"
@@ -90,6 +104,9 @@ class PluginInstance:
     execution_count: int = 0
     success_count: int = 0
     error_count: int = 0
+    timeout_count: int = 0
+    rejected_count: int = 0  # calls refused while the plugin's circuit was open
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
 
 @dataclass
@@ -127,6 +144,17 @@ class PluginSDK:
         self.plugins: Dict[str, PluginInstance] = {}
         self.marketplace_plugins: Dict[str, MarketplacePlugin] = {}
         
+        # Plugin execution: marketplace plugins run isolated under the default policy,
+        # built-in plugins are trusted and awaited in-loop
+        self.execution_pool = PluginExecutionPool()
+        self.default_execution_policy = ExecutionPolicy(
+            mode=ExecutionMode(getattr(settings, "plugin_execution_mode", "thread")),
+            max_concurrency=getattr(settings, "plugin_max_concurrency", 4),
+            timeout=getattr(settings, "plugin_timeout_seconds", 30.0),
+            failure_threshold=getattr(settings, "plugin_circuit_failure_threshold", 5),
+            reset_timeout=getattr(settings, "plugin_circuit_reset_seconds", 60.0)
+        )
+        
         # Plugin directories
         self.plugin_dirs = [
             Path("plugins"),
@@ -200,9 +228,10 @@ class PluginSDK:
         )
         
         # Register built-in plugins
-        self._register_plugin(security_plugin, self._create_security_scanner())
-        self._register_plugin(cost_plugin, self._create_cost_optimizer())
-        self._register_plugin(compliance_plugin, self._create_compliance_checker())
+        builtin_policy = replace(self.default_execution_policy, mode=ExecutionMode.IN_LOOP)
+        self._register_plugin(security_plugin, self._create_security_scanner(), builtin_policy)
+        self._register_plugin(cost_plugin, self._create_cost_optimizer(), builtin_policy)
+        self._register_plugin(compliance_plugin, self._create_compliance_checker(), builtin_policy)
     
     def _create_security_scanner(self):
         """Create security scanner plugin instance"""
@@ -315,7 +344,8 @@ class PluginSDK:
         
         return ComplianceChecker
     
-    def _register_plugin(self, metadata: PluginMetadata, plugin_class: type):
+    def _register_plugin(self, metadata: PluginMetadata, plugin_class: type,
+                         execution_policy: Optional[ExecutionPolicy] = None):
         """Register a plugin"""
         
         try:
@@ -331,6 +361,7 @@ class PluginSDK:
             )
             
             self.plugins[metadata.id] = plugin_instance
+            self.execution_pool.configure(metadata.id, execution_policy or self.default_execution_policy)
             self.logger.info(f"Registered plugin: {metadata.name} v{metadata.version}")
             
         except Exception as e:
@@ -473,6 +504,7 @@ class PluginSDK:
             )
             
             self.plugins[plugin_id] = plugin_instance
+            self.execution_pool.configure(plugin_id, self.default_execution_policy)
             
             return {
                 "success": True,
@@ -497,6 +529,7 @@ class PluginSDK:
             await asyncio.sleep(0.5)
             
             del self.plugins[plugin_id]
+            self.execution_pool.remove(plugin_id)
             
             return {
                 "success": True,
@@ -524,17 +557,20 @@ class PluginSDK:
             if not hasattr(plugin.instance, method):
                 return {"success": False, "error": f"Method {method} not found"}
             
-            method_func = getattr(plugin.instance, method)
-            
-            # Execute method
-            start_time = datetime.now()
-            result = await method_func(*args, **kwargs)
-            execution_time = (datetime.now() - start_time).total_seconds()
+            # Execute method under the plugin's execution policy
+            started = time.perf_counter()
+            try:
+                result = await self.execution_pool.run(plugin_id, plugin.instance, method, args, kwargs)
+            except CircuitOpenError as e:
+                plugin.rejected_count += 1
+                return {"success": False, "error": str(e), "circuit_open": True}
+            except Exception as e:
+                self._record_execution(plugin, time.perf_counter() - started, e)
+                raise
+            execution_time = time.perf_counter() - started
             
             # Update statistics
-            plugin.last_execution = datetime.now()
-            plugin.execution_count += 1
-            plugin.success_count += 1
+            self._record_execution(plugin, execution_time)
             
             return {
                 "success": True,
@@ -553,6 +589,53 @@ class PluginSDK:
             self.logger.error(f"Failed to execute plugin {plugin_id}.{method}: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _record_execution(self, plugin: PluginInstance, seconds: float, error: Optional[Exception] = None):
+        """Update a plugin's execution counters and latency histogram"""
+        
+        plugin.latency.observe(seconds)
+        plugin.last_execution = datetime.now()
+        plugin.execution_count += 1
+        if error is None:
+            plugin.success_count += 1
+        elif isinstance(error, PluginTimeoutError):
+            plugin.timeout_count += 1
+    
+    def _latency_summary(self, plugin: PluginInstance) -> Dict[str, Any]:
+        """Latency histogram of a plugin with estimated percentiles, in seconds"""
+        
+        snapshot = plugin.latency.snapshot()
+        return {
+            "count": snapshot["count"],
+            "mean": snapshot["mean"],
+            "p50": plugin.latency.quantile(0.5),
+            "p95": plugin.latency.quantile(0.95),
+            "p99": plugin.latency.quantile(0.99),
+            "buckets": snapshot["buckets"]
+        }
+    
+    async def update_execution_policy(self, plugin_id: str, policy: Dict[str, Any]) -> Dict[str, Any]:
+        """Change how a plugin is executed (mode, max_concurrency, timeout, circuit settings)"""
+        
+        try:
+            if plugin_id not in self.plugins:
+                return {"success": False, "error": "Plugin not found"}
+            
+            current = self.execution_pool.policy(plugin_id) or self.default_execution_policy
+            updates = dict(policy)
+            if "mode" in updates:
+                updates["mode"] = ExecutionMode(updates["mode"])
+            new_policy = replace(current, **updates)
+            self.execution_pool.configure(plugin_id, new_policy)
+            
+            return {
+                "success": True,
+                "plugin_id": plugin_id,
+                "execution": self.execution_pool.lane_stats(plugin_id)
+            }
+            
+        except (TypeError, ValueError) as e:
+            return {"success": False, "error": f"Invalid execution policy: {str(e)}"}
+    
     async def get_installed_plugins(self) -> List[Dict[str, Any]]:
         """Get list of installed plugins"""
         
@@ -573,6 +656,10 @@ class PluginSDK:
                 "execution_count": plugin.execution_count,
                 "success_count": plugin.success_count,
                 "error_count": plugin.error_count,
+                "timeout_count": plugin.timeout_count,
+                "rejected_count": plugin.rejected_count,
+                "latency": self._latency_summary(plugin),
+                "execution": self.execution_pool.lane_stats(plugin_id),
                 "error_message": plugin.error_message
             })
         
@@ -643,6 +730,10 @@ class PluginSDK:
             "execution_count": plugin.execution_count,
             "success_count": plugin.success_count,
             "error_count": plugin.error_count,
+            "timeout_count": plugin.timeout_count,
+            "rejected_count": plugin.rejected_count,
+            "latency": self._latency_summary(plugin),
+            "execution": self.execution_pool.lane_stats(plugin_id),
             "error_message": plugin.error_message,
             "config": plugin.config
         }
@@ -698,6 +789,16 @@ class PluginSDK:
         total_successes = sum(p.success_count for p in self.plugins.values())
         success_rate = total_successes / total_executions if total_executions > 0 else 0
         
+        # Plugins ranked by p95 latency, for spotting slow plugins
+        slowest_plugins = sorted(
+            (
+                {"plugin_id": plugin_id, "p95": p.latency.quantile(0.95), "mean": p.latency.snapshot()["mean"]}
+                for plugin_id, p in self.plugins.items() if p.execution_count
+            ),
+            key=lambda entry: entry["p95"],
+            reverse=True
+        )[:5]
+        
         return {
             "status": "healthy",
             "total_plugins": total_plugins,
@@ -706,6 +807,12 @@ class PluginSDK:
             "total_executions": total_executions,
             "total_successes": total_successes,
             "success_rate": success_rate,
+            "total_timeouts": sum(p.timeout_count for p in self.plugins.values()),
+            "open_circuits": [
+                plugin_id for plugin_id in self.plugins
+                if (self.execution_pool.lane_stats(plugin_id) or {}).get("circuit_state") == "open"
+            ],
+            "slowest_plugins": slowest_plugins,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -3,7 +3,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 from pydantic import BaseModel, Field
 
-from ..cmdb.models import Resource, ResourceType, CloudProvider
+from ..cmdb.models import Resource, ResourceType, CloudProvider, ResourceSearch
 from ..cmdb.store import CMDBStore
 
 
@@ -460,17 +460,16 @@ class TagPolicyEngine:
     
     async def generate_compliance_report(self, tenant_id: str) -> Dict[str, Any]:
         """Generate tag compliance report"""
-        # Get all resources for tenant
-        resources = await self.cmdb_store.get_resources_by_tenant(tenant_id)
-        
         # Get policies
         policies = [p for p in self.default_policies if p.tenant_id in ["default", tenant_id]]
         
-        # Evaluate all resources
+        # Evaluate all resources, streamed from the CMDB
         all_violations = []
         compliant_resources = 0
+        total_resources = 0
         
-        for resource in resources:
+        async for resource in self.cmdb_store.search_resources_iter(ResourceSearch(tenant_id=tenant_id)):
+            total_resources += 1
             violations = await self.evaluate_resource(resource, policies)
             if violations:
                 all_violations.extend(violations)
@@ -487,13 +486,13 @@ class TagPolicyEngine:
         # Generate report
         report = {
             "tenant_id": tenant_id,
-            "total_resources": len(resources),
+            "total_resources": total_resources,
             "compliant_resources": compliant_resources,
-            "non_compliant_resources": len(resources) - compliant_resources,
+            "non_compliant_resources": total_resources - compliant_resources,
             "total_violations": len(all_violations),
             "auto_remediated": len(remediated),
             "manual_remediation_needed": len(all_violations) - len(remediated),
-            "compliance_score": round((compliant_resources / len(resources)) * 100, 2) if resources else 100,
+            "compliance_score": round((compliant_resources / total_resources) * 100, 2) if total_resources else 100,
             "violations_by_policy": {},
             "violations_by_severity": {},
             "generated_at": datetime.utcnow().isoformat()
@@ -0,0 +1,103 @@
+"""
+Persistent embedding cache for the RAG pipeline.
+Vectors are keyed by (model name, chunk content hash) and stored in SQLite,
+so re-ingesting unchanged documents does not re-embed their chunks.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of a chunk's text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed map of (model, content hash) -> float32 vector"""
+
+    def __init__(self, path: str, model_name: str):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, content_hash))"
+        )
+        self._conn.commit()
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given hashes (missing hashes are omitted)"""
+        wanted = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            # stay well below SQLite's bound-parameter limit
+            for start in range(0, len(wanted), 500):
+                batch = wanted[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings"
+                    f" WHERE model = ? AND content_hash IN ({placeholders})",
+                    [self.model_name, *batch]
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors keyed by content hash"""
+        if not vectors:
+            return
+        rows = [
+            (self.model_name, key, array("f", vector).tobytes())
+            for key, vector in vectors.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, content_hash, vector) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            size = self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE model = ?", (self.model_name,)
+            ).fetchone()[0]
+        return {"size": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def build_embedding_cache(path: Optional[str], model_name: str) -> Optional[EmbeddingCache]:
+    """Open the cache at ``path``; an empty path disables caching"""
+    if not path:
+        return None
+    try:
+        return EmbeddingCache(path, model_name)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Embedding cache disabled: {e}")
+        return None
@@ -0,0 +1,88 @@
+"""
+Hybrid retrieval helpers for the RAG pipeline.
+Fuses dense and lexical rankings with reciprocal rank fusion and optionally
+reorders the fused candidates with a cross-encoder.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Cross-encoder reranking is optional
+try:
+    from sentence_transformers import CrossEncoder
+    CROSS_ENCODER_AVAILABLE = True
+except ImportError:
+    CrossEncoder = None
+    CROSS_ENCODER_AVAILABLE = False
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60,
+                           weights: Optional[Sequence[float]] = None) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists: each id scores sum(weight / (k + rank)) over the
+    lists it appears in (rank starting at 1). Scores are normalized so an id
+    ranked first in every list scores 1.0. Returns (id, score), best first.
+    """
+    if weights is None:
+        weights = [1.0] * len(rankings)
+    best_possible = sum(weights) / (k + 1)
+    if not best_possible:
+        return []
+
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + rank)
+    fused = sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
+    return [(item, score / best_possible) for item, score in fused]
+
+
+class CrossEncoderReranker:
+    """
+    Scores (query, passage) pairs with a sentence-transformers cross-encoder.
+
+    The model is loaded on first use. Scores are cached per (query, passage
+    key) in ``cache`` — any object with ``get``/``set``, e.g. a TTLCache — so
+    repeated queries only score passages they have not seen yet. Blocking;
+    call it from an executor.
+    """
+
+    def __init__(self, model_name: str, cache: Any = None, batch_size: int = 32):
+        self.logger = logging.getLogger(__name__)
+        self.model_name = model_name
+        self.cache = cache
+        self.batch_size = batch_size
+        self._model = None
+        self._load_failed = False
+
+    @property
+    def available(self) -> bool:
+        return CROSS_ENCODER_AVAILABLE and not self._load_failed
+
+    def _get_model(self):
+        if self._model is None and self.available:
+            try:
+                self._model = CrossEncoder(self.model_name)
+            except Exception as e:
+                self._load_failed = True
+                self.logger.error(f"Failed to load cross-encoder {self.model_name}: {str(e)}")
+        return self._model
+
+    def score(self, query: str, passages: Sequence[Tuple[str, str]]) -> List[float]:
+        """Relevance scores for ``passages`` given as (cache key, text) pairs"""
+        scores: List[Optional[float]] = [
+            self.cache.get((query, key)) if self.cache is not None else None for key, _ in passages
+        ]
+        missing = [i for i, value in enumerate(scores) if value is None]
+        if missing:
+            model = self._get_model()
+            if model is None:
+                raise RuntimeError("Cross-encoder reranker not available")
+            predicted = model.predict(
+                [(query, passages[i][1]) for i in missing], batch_size=self.batch_size, show_progress_bar=False
+            )
+            for i, value in zip(missing, predicted):
+                scores[i] = float(value)
+                if self.cache is not None:
+                    self.cache.set((query, passages[i][0]), scores[i])
+        return scores
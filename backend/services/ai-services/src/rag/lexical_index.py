@@ -0,0 +1,210 @@
+"""
+BM25 lexical index for the RAG pipeline.
+Kept alongside the vector store so exact tokens (error codes, instance
+IDs, CVE numbers) that embeddings rank poorly can still be retrieved.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    from .local_index import matches_filters
+except ImportError:  # imported as a top-level module (benchmarks)
+    from local_index import matches_filters
+
+# Identifier-like tokens keep their inner separators: "cve-2024-3094", "i-0abc123", "http.5xx"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.:/][a-z0-9]+)*")
+TOKEN_SEPARATORS = re.compile(r"[-_.:/]")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or that the this to was what when where which "
+    "with why do does can i my we our you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased terms of ``text``. Compound identifiers are indexed whole and
+    by their parts, so "CVE-2024-3094" also matches a query for "3094".
+    """
+    terms = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        if token in STOPWORDS:
+            continue
+        terms.append(token)
+        if TOKEN_SEPARATORS.search(token):
+            terms.extend(part for part in TOKEN_SEPARATORS.split(token) if part and part not in STOPWORDS)
+    return terms
+
+
+class BM25Index:
+    """
+    Okapi BM25 over chunk contents.
+
+    Postings map term -> {chunk number: term frequency}; document frequencies
+    and lengths are maintained incrementally, so adds and deletes are
+    proportional to the chunk size and a query only touches the postings of
+    its own terms. Chunks are persisted to SQLite when ``path`` is set and the
+    postings are rebuilt from it on startup.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.2, b: float = 0.75):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._payloads: Dict[int, Dict[str, Any]] = {}
+        self._number_of: Dict[str, int] = {}
+        self._by_document: Dict[str, Set[int]] = {}
+        self._total_length = 0
+        self._next_number = 0
+
+        self._conn = None
+        if path:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                " point_id TEXT PRIMARY KEY, document_id TEXT, payload TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_document ON chunks (document_id)")
+            self._conn.commit()
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _load(self):
+        rows = self._conn.execute("SELECT point_id, payload FROM chunks").fetchall()
+        for point_id, payload in rows:
+            self._index(point_id, json.loads(payload))
+        if rows:
+            self.logger.info(f"Loaded lexical index: {len(rows)} chunks")
+
+    def _index(self, point_id: str, payload: Dict[str, Any]):
+        if point_id in self._number_of:
+            self._unindex(self._number_of[point_id])
+        number = self._next_number
+        self._next_number += 1
+
+        terms = Counter(tokenize(payload.get("content", "")))
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[number] = frequency
+        length = sum(terms.values())
+        self._lengths[number] = length
+        self._total_length += length
+        self._ids[number] = point_id
+        self._payloads[number] = payload
+        self._number_of[point_id] = number
+        document_id = payload.get("document_id")
+        if document_id is not None:
+            self._by_document.setdefault(document_id, set()).add(number)
+
+    def _unindex(self, number: int):
+        payload = self._payloads.pop(number)
+        for term in set(tokenize(payload.get("content", ""))):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(number, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(number)
+        del self._number_of[self._ids.pop(number)]
+        document_id = payload.get("document_id")
+        numbers = self._by_document.get(document_id)
+        if numbers is not None:
+            numbers.discard(number)
+            if not numbers:
+                del self._by_document[document_id]
+
+    def add(self, points: Iterable[Dict[str, Any]]):
+        """Index points given as ``{"id", "payload"}`` dicts; the payload's ``content`` is tokenized"""
+        records = []
+        with self._lock:
+            for point in points:
+                point_id = str(point["id"])
+                payload = point.get("payload") or {}
+                self._index(point_id, payload)
+                records.append((point_id, payload.get("document_id"), json.dumps(payload, default=str)))
+            if self._conn and records:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO chunks (point_id, document_id, payload) VALUES (?, ?, ?)", records
+                )
+                self._conn.commit()
+
+    def remove_document(self, document_id: str) -> int:
+        """Drop every chunk of a document; returns the number removed"""
+        with self._lock:
+            numbers = list(self._by_document.get(document_id, ()))
+            for number in numbers:
+                self._unindex(number)
+            if self._conn:
+                self._conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+                self._conn.commit()
+            return len(numbers)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._ids.clear()
+            self._payloads.clear()
+            self._number_of.clear()
+            self._by_document.clear()
+            self._total_length = 0
+            if self._conn:
+                self._conn.execute("DELETE FROM chunks")
+                self._conn.commit()
+
+    def search(self, query: str, limit: int = 10,
+               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Top ``limit`` chunks by BM25 score as ``{"id", "score", "payload"}`` dicts"""
+        terms = set(tokenize(query))
+        with self._lock:
+            total = len(self._ids)
+            if not terms or not total:
+                return []
+            average_length = self._total_length / total
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for number, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[number] / average_length)
+                    scores[number] = scores.get(number, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            if filters:
+                scores = {n: s for n, s in scores.items() if matches_filters(self._payloads[n], filters)}
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [
+                {"id": self._ids[number], "score": score, "payload": self._payloads[number]}
+                for number, score in best
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"chunks": len(self._ids), "terms": len(self._postings), "path": self.path}
+
+    def close(self):
+        with self._lock:
+            if self._conn:
+                self._conn.close()
@@ -0,0 +1,423 @@
+"""
+Embedded vector index for the RAG pipeline.
+An in-process alternative to Qdrant for edge and air-gapped deployments:
+vectors live in a memory-mapped float32 matrix, payloads in SQLite, and
+searches are vectorized cosine top-k with optional IVF approximation.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# Payload fields with a prebuilt inverted index; other filter fields are checked per candidate
+DEFAULT_INDEXED_FIELDS = ("document_id", "document_type", "metadata.source")
+
+# Below any cosine similarity; used as the threshold when none is given
+NO_THRESHOLD = -2.0
+
+VECTORS_FILE = "vectors.f32"
+PAYLOADS_FILE = "payloads.sqlite3"
+
+
+def payload_value(payload: Dict[str, Any], key: str) -> Any:
+    """Value at a dotted payload path (``metadata.source``), or None"""
+    value: Any = payload
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def matches_filters(payload: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """
+    Evaluate VectorStore filter semantics against a payload: a list means any
+    of its values, a dict with gte/lte a range, anything else equality.
+    """
+    for key, expected in filters.items():
+        value = payload_value(payload, key)
+        values = value if isinstance(value, list) else [value]
+        if isinstance(expected, list):
+            if not any(v in expected for v in values):
+                return False
+        elif isinstance(expected, dict):
+            if value is None:
+                return False
+            if "gte" in expected and value < expected["gte"]:
+                return False
+            if "lte" in expected and value > expected["lte"]:
+                return False
+        elif expected not in values:
+            return False
+    return True
+
+
+class LocalVectorIndex:
+    """
+    Cosine-similarity index held in process.
+
+    Vectors are L2-normalized on insert so a search is one matrix-vector
+    product. With a ``path`` the matrix is a memory-mapped file grown by
+    doubling and payloads are kept in SQLite, so the index survives restarts
+    and the OS pages vectors in on demand; without one everything stays in
+    memory. Deletes leave tombstones that are compacted away once they make up
+    half the rows.
+
+    ``mode="ivf"`` clusters the corpus with spherical k-means once it holds
+    ``ivf_min_points`` vectors and scores only the ``nprobe`` clusters nearest
+    to the query, trading a little recall for sub-linear search.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        path: Optional[str] = None,
+        mode: str = "exact",
+        nprobe: int = 8,
+        ivf_min_points: int = 20000,
+        indexed_fields: Sequence[str] = DEFAULT_INDEXED_FIELDS
+    ):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for the local vector index")
+
+        self.logger = logging.getLogger(__name__)
+        self.dim = dim
+        self.path = path
+        self.mode = mode
+        self.nprobe = nprobe
+        self.ivf_min_points = ivf_min_points
+        self.indexed_fields = tuple(indexed_fields)
+        self._lock = threading.RLock()
+
+        self._count = 0
+        self._live = 0
+        self._ids: List[str] = []
+        self._payloads: List[Optional[Dict[str, Any]]] = []
+        self._row_of: Dict[str, int] = {}
+        self._inverted: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in self.indexed_fields}
+
+        # IVF state; trained lazily on search
+        self._centroids = None
+        self._trained_on = 0
+
+        self._conn = None
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(path, PAYLOADS_FILE), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS points ("
+                " row INTEGER PRIMARY KEY, point_id TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        self._matrix = self._open_matrix(0)
+        self._alive = np.zeros(self._matrix.shape[0], dtype=bool)
+        self._assignments = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        if path:
+            self._load()
+
+    # Storage
+
+    def _open_matrix(self, capacity: int):
+        if not self.path:
+            return np.zeros((capacity, self.dim), dtype=np.float32)
+        file_path = os.path.join(self.path, VECTORS_FILE)
+        row_bytes = self.dim * 4
+        existing = os.path.getsize(file_path) // row_bytes if os.path.exists(file_path) else 0
+        capacity = max(capacity, existing, 1)
+        with open(file_path, "ab") as f:
+            f.truncate(capacity * row_bytes)
+        return np.memmap(file_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, 1024)
+        if self.path:
+            self._matrix.flush()
+            del self._matrix
+            self._matrix = self._open_matrix(new_capacity)
+        else:
+            grown = np.zeros((new_capacity, self.dim), dtype=np.float32)
+            grown[:self._count] = self._matrix[:self._count]
+            self._matrix = grown
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._count] = self._alive[:self._count]
+        self._alive = alive
+        assignments = np.full(new_capacity, -1, dtype=np.int32)
+        assignments[:self._count] = self._assignments[:self._count]
+        self._assignments = assignments
+
+    def _load(self):
+        rows = self._conn.execute("SELECT row, point_id, payload FROM points ORDER BY row").fetchall()
+        if not rows:
+            return
+        count = rows[-1][0] + 1
+        self._ensure_capacity(count)
+        self._ids = [""] * count
+        self._payloads = [None] * count
+        for row, point_id, payload in rows:
+            self._ids[row] = point_id
+            self._payloads[row] = json.loads(payload)
+            self._row_of[point_id] = row
+            self._alive[row] = True
+            self._index_payload(row, self._payloads[row])
+        self._count = count
+        self._live = len(rows)
+        self.logger.info(f"Loaded local vector index from {self.path}: {self._live} points")
+
+    # Inverted indexes
+
+    def _index_keys(self, payload: Dict[str, Any], field: str) -> List[Any]:
+        value = payload_value(payload, field)
+        values = value if isinstance(value, list) else [value]
+        return [v for v in values if v is not None and not isinstance(v, (dict, list))]
+
+    def _index_payload(self, row: int, payload: Dict[str, Any]):
+        for field in self.indexed_fields:
+            for key in self._index_keys(payload, field):
+                self._inverted[field].setdefault(key, set()).add(row)
+
+    def _unindex_payload(self, row: int, payload: Dict[str, Any]):
+        for field in self.indexed_fields:
+            postings = self._inverted[field]
+            for key in self._index_keys(payload, field):
+                rows = postings.get(key)
+                if rows is not None:
+                    rows.discard(row)
+                    if not rows:
+                        del postings[key]
+
+    def _filter_rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Live rows matching ``filters`` (sorted), or None for every live row"""
+        if not filters:
+            return None
+        candidates: Optional[Set[int]] = None
+        residual = {}
+        for key, expected in filters.items():
+            if key in self._inverted and not isinstance(expected, dict):
+                wanted = expected if isinstance(expected, list) else [expected]
+                rows: Set[int] = set()
+                for value in wanted:
+                    rows |= self._inverted[key].get(value, set())
+                candidates = rows if candidates is None else candidates & rows
+            else:
+                residual[key] = expected
+        if candidates is None:
+            candidates = (int(row) for row in np.flatnonzero(self._alive[:self._count]))
+        if residual:
+            candidates = (row for row in candidates if matches_filters(self._payloads[row], residual))
+        return np.fromiter(sorted(candidates), dtype=np.int64)
+
+    # Writes
+
+    def upsert(self, points: Iterable[Dict[str, Any]]):
+        """Insert or replace points given as ``{"id", "vector", "payload"}`` dicts"""
+        points = list(points)
+        if not points:
+            return
+        vectors = np.asarray([point["vector"] for point in points], dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            new_rows = sum(1 for point in points if str(point["id"]) not in self._row_of)
+            self._ensure_capacity(self._count + new_rows)
+            records = []
+            written = []
+            for point, vector in zip(points, vectors):
+                point_id = str(point["id"])
+                payload = point.get("payload") or {}
+                row = self._row_of.get(point_id)
+                if row is None:
+                    row = self._count
+                    self._count += 1
+                    self._ids.append(point_id)
+                    self._payloads.append(payload)
+                    self._row_of[point_id] = row
+                    self._live += 1
+                else:
+                    self._unindex_payload(row, self._payloads[row])
+                    self._payloads[row] = payload
+                self._matrix[row] = vector
+                self._alive[row] = True
+                self._index_payload(row, payload)
+                written.append(row)
+                records.append((row, point_id, json.dumps(payload, default=str)))
+
+            if self._centroids is not None:
+                rows = np.asarray(written, dtype=np.int64)
+                self._assignments[rows] = np.argmax(self._matrix[rows] @ self._centroids.T, axis=1)
+            if self.path:
+                self._matrix.flush()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO points (row, point_id, payload) VALUES (?, ?, ?)", records
+                )
+                self._conn.commit()
+
+    def delete(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Delete points matching ``filters`` (all points when empty); returns the number deleted"""
+        with self._lock:
+            rows = self._filter_rows(filters)
+            if rows is None:
+                rows = np.flatnonzero(self._alive[:self._count])
+            for row in rows.tolist():
+                self._unindex_payload(row, self._payloads[row])
+                del self._row_of[self._ids[row]]
+                self._payloads[row] = None
+                self._alive[row] = False
+            self._live -= len(rows)
+            if self.path and len(rows):
+                self._conn.executemany("DELETE FROM points WHERE row = ?", [(row,) for row in rows.tolist()])
+                self._conn.commit()
+            if self._count and self._live <= self._count // 2:
+                self._compact()
+            return len(rows)
+
+    def _compact(self):
+        """Rewrite the index without tombstoned rows"""
+        keep = np.flatnonzero(self._alive[:self._count])
+        vectors = np.array(self._matrix[keep])
+        ids = [self._ids[row] for row in keep.tolist()]
+        payloads = [self._payloads[row] for row in keep.tolist()]
+
+        self._count = 0
+        self._live = 0
+        self._ids, self._payloads, self._row_of = [], [], {}
+        self._inverted = {field: {} for field in self.indexed_fields}
+        self._alive[:] = False
+        self._assignments[:] = -1
+        self._centroids = None
+        if self.path:
+            self._conn.execute("DELETE FROM points")
+            self._conn.commit()
+        self.upsert({"id": i, "vector": v, "payload": p} for i, v, p in zip(ids, vectors, payloads))
+
+    # Search
+
+    def _train_ivf(self):
+        """Spherical k-means over the live vectors"""
+        live = np.flatnonzero(self._alive[:self._count])
+        n = len(live)
+        nlist = int(min(4096, max(16, math.sqrt(n)), n))  # never more lists than points
+        rng = np.random.default_rng(0)
+        sample = self._matrix[rng.choice(live, size=min(n, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(10):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            centroids = np.where(empty[:, None], centroids, sums / np.where(norms == 0, 1, norms))
+
+        self._centroids = centroids.astype(np.float32)
+        for start in range(0, n, 65536):
+            rows = live[start:start + 65536]
+            self._assignments[rows] = np.argmax(self._matrix[rows] @ self._centroids.T, axis=1)
+        self._trained_on = n
+        self.logger.info(f"Trained IVF index: {nlist} lists over {n} points")
+
+    def _ivf_ready(self) -> bool:
+        if self.mode != "ivf" or self._live < self.ivf_min_points:
+            return False
+        if self._centroids is None or self._live > 2 * self._trained_on:
+            self._train_ivf()
+        return True
+
+    def _top_k(self, rows: Optional[np.ndarray], scores: np.ndarray, limit: int,
+               score_threshold: float) -> List[Dict[str, Any]]:
+        """Best ``limit`` of ``scores`` (for ``rows``, or row i when None) at or above the threshold"""
+        keep = scores >= score_threshold
+        scores = scores[keep]
+        rows = np.flatnonzero(keep) if rows is None else rows[keep]
+        if not len(scores):
+            return []
+        if len(scores) > limit:
+            best = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            {"id": self._ids[row], "score": float(scores[i]), "payload": self._payloads[row]}
+            for i, row in zip(best.tolist(), rows[best].tolist())
+        ]
+
+    def _search_one(self, query: np.ndarray, limit: int, score_threshold: float,
+                    rows: Optional[np.ndarray]) -> List[Dict[str, Any]]:
+        if self._ivf_ready():
+            probes = np.argsort(-(self._centroids @ query))[:self.nprobe]
+            in_probe = np.isin(self._assignments[:self._count], probes) & self._alive[:self._count]
+            probe_rows = np.flatnonzero(in_probe)
+            rows = probe_rows if rows is None else np.intersect1d(rows, probe_rows, assume_unique=True)
+        if rows is None:
+            scores = self._matrix[:self._count] @ query
+            scores[~self._alive[:self._count]] = -np.inf
+            return self._top_k(None, scores, limit, score_threshold)
+        if not len(rows):
+            return []
+        return self._top_k(rows, self._matrix[rows] @ query, limit, score_threshold)
+
+    def search(self, vector: Sequence[float], limit: int = 10, score_threshold: Optional[float] = None,
+               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Top ``limit`` points by cosine similarity as ``{"id", "score", "payload"}`` dicts"""
+        return self.search_batch([vector], limit, score_threshold, filters)[0]
+
+    def search_batch(self, vectors: Sequence[Sequence[float]], limit: int = 10,
+                     score_threshold: Optional[float] = None,
+                     filters: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        queries = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+        threshold = NO_THRESHOLD if score_threshold is None else score_threshold
+        with self._lock:
+            if not self._live or limit <= 0:
+                return [[] for _ in queries]
+            rows = self._filter_rows(filters)
+            if rows is None and not self._ivf_ready():
+                # exact search over the whole corpus: one matrix-matrix product for the batch
+                scores = self._matrix[:self._count] @ queries.T
+                scores[~self._alive[:self._count]] = -np.inf
+                return [self._top_k(None, scores[:, i], limit, threshold) for i in range(len(queries))]
+            return [self._search_one(query, limit, threshold, rows) for query in queries]
+
+    def scroll(self, filters: Optional[Dict[str, Any]] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Points matching ``filters`` as ``{"id", "payload"}`` dicts"""
+        with self._lock:
+            rows = self._filter_rows(filters)
+            if rows is None:
+                rows = np.flatnonzero(self._alive[:self._count])
+            return [{"id": self._ids[row], "payload": self._payloads[row]} for row in rows[:limit].tolist()]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "points_count": self._live,
+                "rows": self._count,
+                "capacity": int(self._matrix.shape[0]),
+                "mode": self.mode,
+                "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+                "path": self.path,
+                "indexed_fields": list(self.indexed_fields)
+            }
+
+    def close(self):
+        with self._lock:
+            if self.path:
+                self._matrix.flush()
+                self._conn.close()
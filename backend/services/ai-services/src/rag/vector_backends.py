@@ -0,0 +1,185 @@
+"""
+Vector store backends for the RAG pipeline.
+VectorStore talks to a backend through plain dicts, so Qdrant and the
+embedded LocalVectorIndex are interchangeable:
+
+    upsert(points)                                   points: {"id", "vector", "payload"}
+    search(vector, limit, score_threshold, filters)  -> [{"id", "score", "payload"}]
+    search_batch(vectors, limit, score_threshold, filters)
+    scroll(filters, limit)                           -> [{"id", "payload"}]
+    iter_points(batch_size)                          Qdrant only; pages of {"id", "payload"}
+    delete(filters)                                  empty filters delete everything
+    stats()
+    close()
+
+All methods are blocking; VectorStore runs them on an executor.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Vector database client
+try:
+    from qdrant_client import QdrantClient, models
+    QDRANT_AVAILABLE = True
+except ImportError:
+    QdrantClient = None
+    models = None
+    QDRANT_AVAILABLE = False
+    logging.warning("Qdrant client not available. Install with: pip install qdrant-client")
+
+
+class QdrantBackend:
+    """Backend over a Qdrant collection with cosine distance"""
+
+    def __init__(self, url: str, api_key: Optional[str], collection_name: str, vector_size: int):
+        self.logger = logging.getLogger(__name__)
+        self.client = QdrantClient(url=url, api_key=api_key)
+        self.collection_name = collection_name
+        self.vector_size = vector_size
+        self._initialize_collection()
+
+    def _initialize_collection(self):
+        """Create the collection if it does not exist"""
+        try:
+            collections = self.client.get_collections()
+            collection_names = [col.name for col in collections.collections]
+
+            if self.collection_name not in collection_names:
+                self.client.create_collection(
+                    collection_name=self.collection_name,
+                    vectors_config=models.VectorParams(
+                        size=self.vector_size,
+                        distance=models.Distance.COSINE
+                    )
+                )
+                self.logger.info(f"Created collection: {self.collection_name}")
+            else:
+                self.logger.info(f"Collection {self.collection_name} already exists")
+
+        except Exception as e:
+            self.logger.error(f"Failed to initialize collections: {str(e)}")
+
+    def build_filter(self, filters: Optional[Dict[str, Any]]):
+        """Build Qdrant filter from dictionary"""
+        if not filters:
+            return None
+
+        conditions = []
+
+        for key, value in filters.items():
+            if isinstance(value, str):
+                conditions.append(
+                    models.FieldCondition(
+                        key=key,
+                        match=models.MatchValue(value=value)
+                    )
+                )
+            elif isinstance(value, list):
+                conditions.append(
+                    models.FieldCondition(
+                        key=key,
+                        match=models.MatchAny(any=value)
+                    )
+                )
+            elif isinstance(value, dict):
+                # Handle range queries
+                if "gte" in value or "lte" in value:
+                    range_dict = {}
+                    if "gte" in value:
+                        range_dict["gte"] = value["gte"]
+                    if "lte" in value:
+                        range_dict["lte"] = value["lte"]
+
+                    conditions.append(
+                        models.FieldCondition(
+                            key=key,
+                            range=models.DatetimeRange(**range_dict)
+                        )
+                    )
+
+        return models.Filter(must=conditions) if conditions else None
+
+    def upsert(self, points: List[Dict[str, Any]]):
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[
+                models.PointStruct(id=point["id"], vector=point["vector"], payload=point["payload"])
+                for point in points
+            ]
+        )
+
+    def search(self, vector: Sequence[float], limit: int, score_threshold: Optional[float],
+               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        results = self.client.search(
+            collection_name=self.collection_name,
+            query_vector=list(vector),
+            limit=limit,
+            score_threshold=score_threshold,
+            query_filter=self.build_filter(filters)
+        )
+        return [{"id": r.id, "score": r.score, "payload": r.payload} for r in results]
+
+    def search_batch(self, vectors: Sequence[Sequence[float]], limit: int, score_threshold: Optional[float],
+                     filters: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        query_filter = self.build_filter(filters)
+        responses = self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=[
+                models.SearchRequest(
+                    vector=list(vector),
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    filter=query_filter,
+                    with_payload=True
+                )
+                for vector in vectors
+            ]
+        )
+        return [
+            [{"id": r.id, "score": r.score, "payload": r.payload} for r in response]
+            for response in responses
+        ]
+
+    def scroll(self, filters: Optional[Dict[str, Any]] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        points, _ = self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=self.build_filter(filters),
+            limit=limit
+        )
+        return [{"id": point.id, "payload": point.payload} for point in points]
+
+    def iter_points(self, batch_size: int = 256) -> Iterator[List[Dict[str, Any]]]:
+        """Every point of the collection, payloads only, in pages of ``batch_size``"""
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            if points:
+                yield [{"id": point.id, "payload": point.payload} for point in points]
+            if offset is None:
+                return
+
+    def delete(self, filters: Optional[Dict[str, Any]] = None):
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(
+                filter=self.build_filter(filters) or models.Filter(must=[])
+            )
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        collection_info = self.client.get_collection(self.collection_name)
+        return {
+            "points_count": collection_info.points_count,
+            "segments_count": collection_info.segments_count,
+            "status": collection_info.status.value
+        }
+
+    def close(self):
+        self.client.close()
@@ -1,47 +1,19 @@
 """
 Production-Grade RAG (Retrieval-Augmented Generation) System
-Vector database integration with Qdrant for knowledge retrieval
+Vector database integration with Qdrant (or an embedded local index) for knowledge retrieval
 """
 
 import asyncio
+import functools
 import json
 import logging
+import time
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 import hashlib
 import uuid
 
-# Vector database and embeddings
-try:
-    from qdrant_client import QdrantClient, models
-    from qdrant_client.http import models as rest
-    QDRANT_AVAILABLE = True
-except ImportError:
-    QDRANT_AVAILABLE = False
-    logging.warning("Qdrant client not available. Install with: pip install qdrant-client")
-    
-    # Create dummy models when Qdrant is not available
-    class MockModels:
-        class Filter:
-            def __init__(self, *args, **kwargs):
-                pass
-        
-        class FieldCondition:
-            def __init__(self, *args, **kwargs):
-                pass
-                
-        class MatchValue:
-            def __init__(self, *args, **kwargs):
-                pass
-                
-        class Range:
-            def __init__(self, *args, **kwargs):
-                pass
-    
-    models = MockModels()
-    rest = MockModels()
-
 # Text processing and embeddings
 try:
     from sentence_transformers import SentenceTransformer
@@ -75,6 +47,16 @@ except ImportError:
         EMBEDDING_MODEL = "all-MiniLM-L6-v2"
     settings = MockSettings()
 
+from .embedding_cache import build_embedding_cache, content_hash
+from .hybrid import CrossEncoderReranker, reciprocal_rank_fusion
+from .lexical_index import BM25Index
+from .local_index import NUMPY_AVAILABLE, LocalVectorIndex
+from .vector_backends import QDRANT_AVAILABLE, QdrantBackend
+try:
+    from ..utils.ttl_cache import TTLCache
+except ImportError:  # imported as the top-level ``rag`` package
+    from utils.ttl_cache import TTLCache
+
 
 class VectorStore:
     """Production-grade vector store for RAG system"""
@@ -82,55 +64,125 @@ class VectorStore:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Initialize vector database client
-        if QDRANT_AVAILABLE:
-            self.qdrant_client = QdrantClient(
-                url=settings.qdrant_url,
-                api_key=settings.qdrant_api_key
-            )
-        else:
-            self.qdrant_client = None
-        
         # Initialize embedding model
+        self.embedding_model_name = getattr(settings, "rag_embedding_model", "all-MiniLM-L6-v2")
         if EMBEDDINGS_AVAILABLE:
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.embedding_model = SentenceTransformer(self.embedding_model_name)
         else:
             self.embedding_model = None
         
+        # Embedding pipeline configuration
+        self.embedding_batch_size = getattr(settings, "rag_embedding_batch_size", 64)
+        self.embedding_workers = getattr(settings, "rag_embedding_workers", 0)
+        self.upsert_batch_size = getattr(settings, "rag_upsert_batch_size", 256)
+        self._encode_pool = None
+        self.embedding_cache = build_embedding_cache(
+            getattr(settings, "rag_embedding_cache_path", ""),
+            self.embedding_model_name
+        )
+        
+        # Query-side caches: embeddings are LRU only (a model's output never goes stale);
+        # search results expire quickly and are dropped whenever the collection changes
+        self._query_embeddings = TTLCache(
+            max_size=getattr(settings, "rag_query_embedding_cache_size", 2048),
+            ttl_sec=float("inf")
+        )
+        self.result_cache_ttl = getattr(settings, "rag_result_cache_ttl_seconds", 30.0)
+        self._result_cache = TTLCache(
+            max_size=getattr(settings, "rag_result_cache_size", 1024),
+            ttl_sec=self.result_cache_ttl
+        )
+        self._index_generation = 0
+        
         # Collection configuration
         self.collection_name = "ai_ops_knowledge"
         self.vector_size = 384  # all-MiniLM-L6-v2 embedding size
         
-        # Initialize collections
-        self._initialize_collections()
+        # Initialize vector backend
+        self.backend = self._create_backend()
+        self.qdrant_client = self.backend.client if isinstance(self.backend, QdrantBackend) else None
+        
+        # Hybrid retrieval: a BM25 index kept in step with the backend, fused with
+        # dense results and optionally reranked by a cross-encoder
+        self.retrieval_mode = getattr(settings, "rag_retrieval_mode", "hybrid").lower()
+        self.hybrid_candidates = getattr(settings, "rag_hybrid_candidates", 50)
+        self.rrf_k = getattr(settings, "rag_rrf_k", 60)
+        self.rerank_enabled = getattr(settings, "rag_rerank_enabled", False)
+        self.rerank_candidates = getattr(settings, "rag_rerank_candidates", 20)
+        self.lexical_index = self._create_lexical_index()
+        if self.lexical_index is not None and isinstance(self.backend, QdrantBackend) and not len(self.lexical_index):
+            self._rebuild_lexical_index()
+        self.reranker = CrossEncoderReranker(
+            getattr(settings, "rag_rerank_model", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+            cache=TTLCache(max_size=getattr(settings, "rag_rerank_cache_size", 8192), ttl_sec=float("inf"))
+        )
         
         self.logger.info("Vector store initialized successfully")
     
-    def _initialize_collections(self):
-        """Initialize Qdrant collections"""
-        if not self.qdrant_client:
-            return
-        
-        try:
-            # Check if collection exists
-            collections = self.qdrant_client.get_collections()
-            collection_names = [col.name for col in collections.collections]
-            
-            if self.collection_name not in collection_names:
-                # Create collection
-                self.qdrant_client.create_collection(
+    def _create_backend(self):
+        """Qdrant or the embedded local index, per ``rag_vector_backend``"""
+        backend = getattr(settings, "rag_vector_backend", "qdrant").lower()
+        
+        if backend == "qdrant" and QDRANT_AVAILABLE:
+            try:
+                return QdrantBackend(
+                    url=settings.qdrant_url,
+                    api_key=settings.qdrant_api_key,
                     collection_name=self.collection_name,
-                    vectors_config=models.VectorParams(
-                        size=self.vector_size,
-                        distance=models.Distance.COSINE
-                    )
+                    vector_size=self.vector_size
                 )
-                self.logger.info(f"Created collection: {self.collection_name}")
-            else:
-                self.logger.info(f"Collection {self.collection_name} already exists")
-                
+            except Exception as e:
+                self.logger.error(f"Failed to connect to Qdrant: {str(e)}")
+                return None
+        
+        if backend == "qdrant":
+            self.logger.warning("Qdrant client not installed, using the embedded local vector index")
+        if not NUMPY_AVAILABLE:
+            self.logger.error("Local vector index requires numpy")
+            return None
+        
+        try:
+            return LocalVectorIndex(
+                dim=self.vector_size,
+                path=getattr(settings, "rag_local_index_path", "") or None,
+                mode=getattr(settings, "rag_local_index_mode", "exact"),
+                nprobe=getattr(settings, "rag_local_ivf_nprobe", 8),
+                ivf_min_points=getattr(settings, "rag_local_ivf_min_points", 20000)
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to open local vector index: {str(e)}")
+            return None
+    
+    def _create_lexical_index(self) -> Optional[BM25Index]:
+        """BM25 index kept alongside the vector backend; None disables hybrid retrieval
+
+        The local index keeps it in its own directory, so an in-memory local index
+        gets an in-memory BM25 index and both start empty after a restart. With
+        Qdrant it is persisted at ``rag_lexical_index_path`` when one is set;
+        otherwise it is rebuilt from the collection on startup.
+        """
+        if isinstance(self.backend, LocalVectorIndex):
+            path = str(Path(self.backend.path) / "lexical_index.sqlite3") if self.backend.path else None
+        else:
+            path = getattr(settings, "rag_lexical_index_path", "") or None
+        try:
+            return BM25Index(path=path)
+        except Exception as e:
+            self.logger.error(f"Failed to open lexical index: {str(e)}")
+            return None
+    
+    def _rebuild_lexical_index(self):
+        """Index every chunk already in Qdrant, e.g. after a restart or on a new replica"""
+        indexed = 0
+        try:
+            for points in self.backend.iter_points(self.upsert_batch_size):
+                self.lexical_index.add(points)
+                indexed += len(points)
         except Exception as e:
-            self.logger.error(f"Failed to initialize collections: {str(e)}")
+            self.logger.error(f"Failed to rebuild lexical index from Qdrant: {str(e)}")
+            return
+        if indexed:
+            self.logger.info(f"Rebuilt lexical index from Qdrant: {indexed} chunks")
     
     async def add_document(
         self,
@@ -142,7 +194,7 @@ class VectorStore:
     ) -> str:
         """Add document to vector store"""
         
-        if not self.qdrant_client or not self.embedding_model:
+        if not self.backend or not self.embedding_model:
             raise Exception("Vector store not properly initialized")
         
         try:
@@ -151,34 +203,36 @@ class VectorStore:
             
             # Chunk the document
             chunks = self._chunk_text(content, chunk_size, overlap)
+            chunk_hashes = [content_hash(chunk) for chunk in chunks]
+            
+            # Embed in batches; unchanged chunks come from the cache
+            embeddings = await self.embed_chunks(chunks, chunk_hashes)
             
-            # Process each chunk
+            created_at = datetime.now().isoformat()
             points = []
             for i, chunk in enumerate(chunks):
-                # Generate embedding
-                embedding = self.embedding_model.encode(chunk)
-                
-                # Create point
-                point = models.PointStruct(
+                point = dict(
                     id=f"{doc_id}_{i}",
-                    vector=embedding.tolist(),
+                    vector=embeddings[i],
                     payload={
                         "content": chunk,
+                        "content_hash": chunk_hashes[i],
                         "document_id": doc_id,
                         "chunk_index": i,
                         "document_type": document_type,
                         "metadata": metadata,
-                        "created_at": datetime.now().isoformat(),
+                        "created_at": created_at,
                         "total_chunks": len(chunks)
                     }
                 )
                 points.append(point)
             
-            # Upload to vector store
-            self.qdrant_client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
+            # Upload to vector store in bounded requests
+            for start in range(0, len(points), self.upsert_batch_size):
+                await self._run_blocking(self.backend.upsert, points[start:start + self.upsert_batch_size])
+            if self.lexical_index is not None:
+                await self._run_blocking(self.lexical_index.add, points)
+            self._invalidate_results()
             
             self.logger.info(f"Added document {doc_id} with {len(chunks)} chunks")
             return doc_id
@@ -187,6 +241,123 @@ class VectorStore:
             self.logger.error(f"Failed to add document: {str(e)}")
             raise
     
+    async def embed_chunks(
+        self,
+        chunks: List[str],
+        chunk_hashes: Optional[List[str]] = None
+    ) -> List[List[float]]:
+        """Embed chunks in batches, reusing cached vectors for unchanged content"""
+        
+        if chunk_hashes is None:
+            chunk_hashes = [content_hash(chunk) for chunk in chunks]
+        
+        cached = self.embedding_cache.get_many(chunk_hashes) if self.embedding_cache else {}
+        
+        # Encode each distinct missing chunk once
+        missing: Dict[str, str] = {}
+        for chunk, key in zip(chunks, chunk_hashes):
+            if key not in cached and key not in missing:
+                missing[key] = chunk
+        
+        if missing:
+            texts = list(missing.values())
+            vectors = await asyncio.get_running_loop().run_in_executor(None, self._encode_batch, texts)
+            fresh = {key: vector for key, vector in zip(missing.keys(), vectors)}
+            if self.embedding_cache:
+                self.embedding_cache.put_many(fresh)
+            cached.update(fresh)
+        
+        self.logger.debug(
+            f"Embedded {len(chunks)} chunks ({len(missing)} encoded, {len(chunks) - len(missing)} reused)"
+        )
+        return [cached[key] for key in chunk_hashes]
+    
+    def _encode_batch(self, texts: List[str]) -> List[List[float]]:
+        """Encode texts with the configured batch size, on a process pool for large inputs"""
+        
+        if self.embedding_workers > 0 and len(texts) > self.embedding_batch_size:
+            if self._encode_pool is None:
+                self._encode_pool = self.embedding_model.start_multi_process_pool(
+                    target_devices=["cpu"] * self.embedding_workers
+                )
+            vectors = self.embedding_model.encode_multi_process(
+                texts, self._encode_pool, batch_size=self.embedding_batch_size
+            )
+        else:
+            vectors = self.embedding_model.encode(
+                texts, batch_size=self.embedding_batch_size, show_progress_bar=False
+            )
+        return [vector.tolist() for vector in vectors]
+    
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking backend or model call on the default executor"""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args, **kwargs))
+    
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed query strings, reusing cached embeddings of repeated queries"""
+        
+        vectors: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        for query in dict.fromkeys(queries):
+            vector = self._query_embeddings.get(query)
+            if vector is None:
+                missing.append(query)
+            else:
+                vectors[query] = vector
+        
+        if missing:
+            encoded = await self._run_blocking(self._encode_batch, missing)
+            for query, vector in zip(missing, encoded):
+                self._query_embeddings.set(query, vector)
+                vectors[query] = vector
+        
+        return [vectors[query] for query in queries]
+    
+    def _invalidate_results(self):
+        """Drop cached search results after the collection changed"""
+        self._index_generation += 1
+        self._result_cache.clear()
+    
+    @staticmethod
+    def _result_key(query: str, limit: int, score_threshold: float,
+                    filters: Optional[Dict[str, Any]]) -> Tuple:
+        return (
+            query,
+            json.dumps(filters, sort_keys=True, default=str) if filters else None,
+            limit,
+            score_threshold
+        )
+    
+    def _cache_results(self, key: Tuple, documents: List[Dict[str, Any]], generation: int):
+        # a write that landed while the search ran may not be reflected in its results
+        if self.result_cache_ttl > 0 and generation == self._index_generation:
+            self._result_cache.set(key, documents)
+    
+    @staticmethod
+    def _format_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        payload = result["payload"] or {}
+        return {
+            "id": result["id"],
+            "score": result["score"],
+            "content": payload.get("content", ""),
+            "metadata": payload.get("metadata", {}),
+            "document_type": payload.get("document_type", "general"),
+            "chunk_index": payload.get("chunk_index", 0)
+        }
+    
+    def close(self):
+        """Release the encode process pool and the embedding cache"""
+        
+        if self._encode_pool is not None:
+            self.embedding_model.stop_multi_process_pool(self._encode_pool)
+            self._encode_pool = None
+        if self.embedding_cache:
+            self.embedding_cache.close()
+        if self.backend:
+            self.backend.close()
+        if self.lexical_index is not None:
+            self.lexical_index.close()
+    
     async def search_similar(
         self,
         query: str,
@@ -196,84 +367,200 @@ class VectorStore:
     ) -> List[Dict[str, Any]]:
         """Search for similar documents"""
         
-        if not self.qdrant_client or not self.embedding_model:
+        if not self.backend or not self.embedding_model:
             raise Exception("Vector store not properly initialized")
         
         try:
+            key = self._result_key(query, limit, score_threshold, filters)
+            if self.result_cache_ttl > 0:
+                cached = self._result_cache.get(key)
+                if cached is not None:
+                    return [dict(document) for document in cached]
+            generation = self._index_generation
+            
             # Generate query embedding
-            query_embedding = self.embedding_model.encode(query)
+            query_embedding = (await self.embed_queries([query]))[0]
             
-            # Build search request
-            search_request = models.SearchRequest(
-                vector=query_embedding.tolist(),
-                limit=limit,
-                score_threshold=score_threshold
+            # Search off the event loop
+            results = await self._run_blocking(
+                self.backend.search, query_embedding, limit, score_threshold, filters
             )
             
-            # Add filters if provided
-            if filters:
-                search_request.filter = self._build_filter(filters)
+            # Process results
+            documents = [self._format_result(result) for result in results]
+            self._cache_results(key, documents, generation)
+            return [dict(document) for document in documents]
             
-            # Search
-            results = self.qdrant_client.search(
-                collection_name=self.collection_name,
-                query_vector=query_embedding.tolist(),
-                limit=limit,
-                score_threshold=score_threshold,
-                query_filter=search_request.filter if filters else None
-            )
+        except Exception as e:
+            self.logger.error(f"Search failed: {str(e)}")
+            raise
+    
+    async def search_similar_batch(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        score_threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several queries at once: one embedding batch and one backend round trip"""
+        
+        if not self.backend or not self.embedding_model:
+            raise Exception("Vector store not properly initialized")
+        
+        try:
+            generation = self._index_generation
+            keys = [self._result_key(query, limit, score_threshold, filters) for query in queries]
+            results: List[Optional[List[Dict[str, Any]]]] = [
+                self._result_cache.get(key) if self.result_cache_ttl > 0 else None for key in keys
+            ]
+            
+            # Each distinct uncached query is searched once
+            pending: Dict[Tuple, str] = {}
+            for key, query, cached in zip(keys, queries, results):
+                if cached is None and key not in pending:
+                    pending[key] = query
+            
+            if pending:
+                embeddings = await self.embed_queries(list(pending.values()))
+                responses = await self._run_blocking(
+                    self.backend.search_batch, embeddings, limit, score_threshold, filters
+                )
+                fresh = {}
+                for key, response in zip(pending.keys(), responses):
+                    fresh[key] = [self._format_result(result) for result in response]
+                    self._cache_results(key, fresh[key], generation)
+                results = [cached if cached is not None else fresh[key] for key, cached in zip(keys, results)]
+            
+            return [[dict(document) for document in documents] for documents in results]
+            
+        except Exception as e:
+            self.logger.error(f"Batch search failed: {str(e)}")
+            raise
+    
+    async def hybrid_search(
+        self,
+        query: str,
+        limit: int = 10,
+        score_threshold: float = 0.7,
+        filters: Optional[Dict[str, Any]] = None,
+        rerank: Optional[bool] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Dense and BM25 candidates fused with reciprocal rank fusion, then
+        optionally reranked by the cross-encoder.
+        
+        Dense candidates still honour ``score_threshold``; lexical candidates
+        enter on exact term matches. ``score`` is the normalized fusion score,
+        or the cross-encoder score when reranked. Per-stage latencies (ms) are
+        written to ``timings`` when given.
+        """
+        
+        if not self.backend or not self.embedding_model:
+            raise Exception("Vector store not properly initialized")
+        if self.lexical_index is None:
+            return await self.search_similar(query, limit, score_threshold, filters)
+        
+        rerank = (self.rerank_enabled if rerank is None else rerank) and self.reranker.available
+        stage_times: Dict[str, float] = {}
+        
+        try:
+            started = time.perf_counter()
+            key = ("hybrid", rerank) + self._result_key(query, limit, score_threshold, filters)
+            if self.result_cache_ttl > 0:
+                cached = self._result_cache.get(key)
+                if cached is not None:
+                    if timings is not None:
+                        timings["total"] = (time.perf_counter() - started) * 1000
+                    return [dict(document) for document in cached]
+            generation = self._index_generation
+            depth = max(limit, self.hybrid_candidates)
+            
+            async def dense_stage():
+                stage_started = time.perf_counter()
+                query_embedding = (await self.embed_queries([query]))[0]
+                results = await self._run_blocking(
+                    self.backend.search, query_embedding, depth, score_threshold, filters
+                )
+                stage_times["dense"] = (time.perf_counter() - stage_started) * 1000
+                return results
+            
+            async def lexical_stage():
+                stage_started = time.perf_counter()
+                results = await self._run_blocking(self.lexical_index.search, query, depth, filters)
+                stage_times["lexical"] = (time.perf_counter() - stage_started) * 1000
+                return results
+            
+            dense_results, lexical_results = await asyncio.gather(dense_stage(), lexical_stage())
+            
+            stage_started = time.perf_counter()
+            dense_hits = {str(result["id"]): result for result in dense_results}
+            lexical_hits = {str(result["id"]): result for result in lexical_results}
+            fused = reciprocal_rank_fusion([list(dense_hits), list(lexical_hits)], k=self.rrf_k)
             
-            # Process results
             documents = []
-            for result in results:
-                documents.append({
-                    "id": result.id,
-                    "score": result.score,
-                    "content": result.payload.get("content", ""),
-                    "metadata": result.payload.get("metadata", {}),
-                    "document_type": result.payload.get("document_type", "general"),
-                    "chunk_index": result.payload.get("chunk_index", 0)
-                })
-            
-            return documents
+            for point_id, score in fused[:max(limit, self.rerank_candidates) if rerank else limit]:
+                dense_hit = dense_hits.get(point_id)
+                lexical_hit = lexical_hits.get(point_id)
+                document = self._format_result(
+                    {"id": point_id, "score": score, "payload": (dense_hit or lexical_hit)["payload"]}
+                )
+                document["fusion_score"] = score
+                document["dense_score"] = dense_hit["score"] if dense_hit else None
+                document["lexical_score"] = lexical_hit["score"] if lexical_hit else None
+                documents.append(document)
+            stage_times["fusion"] = (time.perf_counter() - stage_started) * 1000
+            
+            if rerank and documents:
+                stage_started = time.perf_counter()
+                passages = [
+                    ((dense_hits.get(d["id"]) or lexical_hits[d["id"]])["payload"].get("content_hash")
+                     or content_hash(d["content"]), d["content"])
+                    for d in documents
+                ]
+                try:
+                    scores = await self._run_blocking(self.reranker.score, query, passages)
+                    for document, score in zip(documents, scores):
+                        document["rerank_score"] = score
+                        document["score"] = score
+                    documents.sort(key=lambda d: d["rerank_score"], reverse=True)
+                except Exception as e:
+                    self.logger.warning(f"Rerank failed, keeping fused order: {str(e)}")
+                stage_times["rerank"] = (time.perf_counter() - stage_started) * 1000
+            
+            documents = documents[:limit]
+            self._cache_results(key, documents, generation)
+            if timings is not None:
+                timings.update(stage_times)
+                timings["total"] = (time.perf_counter() - started) * 1000
+            return [dict(document) for document in documents]
             
         except Exception as e:
-            self.logger.error(f"Search failed: {str(e)}")
+            self.logger.error(f"Hybrid search failed: {str(e)}")
             raise
     
     async def get_document_by_id(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get document by ID"""
         
-        if not self.qdrant_client:
+        if not self.backend:
             return None
         
         try:
             # Search for all chunks of the document
-            results = self.qdrant_client.scroll(
-                collection_name=self.collection_name,
-                scroll_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="document_id",
-                            match=models.MatchValue(value=document_id)
-                        )
-                    ]
-                ),
-                limit=100
-            )
+            results = await self._run_blocking(self.backend.scroll, {"document_id": document_id}, 100)
             
-            if not results[0]:
+            if not results:
                 return None
             
             # Reconstruct document
-            chunks = sorted(results[0], key=lambda x: x.payload.get("chunk_index", 0))
-            content = " ".join([chunk.payload.get("content", "") for chunk in chunks])
+            chunks = sorted((r["payload"] for r in results), key=lambda x: x.get("chunk_index", 0))
+            content = " ".join([chunk.get("content", "") for chunk in chunks])
             
             return {
                 "id": document_id,
                 "content": content,
-                "metadata": chunks[0].payload.get("metadata", {}),
-                "document_type": chunks[0].payload.get("document_type", "general"),
+                "metadata": chunks[0].get("metadata", {}),
+                "document_type": chunks[0].get("document_type", "general"),
                 "total_chunks": len(chunks)
             }
             
@@ -284,24 +571,15 @@ class VectorStore:
     async def delete_document(self, document_id: str) -> bool:
         """Delete document by ID"""
         
-        if not self.qdrant_client:
+        if not self.backend:
             return False
         
         try:
             # Delete all chunks of the document
-            self.qdrant_client.delete(
-                collection_name=self.collection_name,
-                points_selector=models.FilterSelector(
-                    filter=models.Filter(
-                        must=[
-                            models.FieldCondition(
-                                key="document_id",
-                                match=models.MatchValue(value=document_id)
-                            )
-                        ]
-                    )
-                )
-            )
+            await self._run_blocking(self.backend.delete, {"document_id": document_id})
+            if self.lexical_index is not None:
+                await self._run_blocking(self.lexical_index.remove_document, document_id)
+            self._invalidate_results()
             
             self.logger.info(f"Deleted document {document_id}")
             return True
@@ -366,59 +644,25 @@ class VectorStore:
         
         return chunks
     
-    def _build_filter(self, filters: Dict[str, Any]) -> models.Filter:
-        """Build Qdrant filter from dictionary"""
-        
-        conditions = []
-        
-        for key, value in filters.items():
-            if isinstance(value, str):
-                conditions.append(
-                    models.FieldCondition(
-                        key=key,
-                        match=models.MatchValue(value=value)
-                    )
-                )
-            elif isinstance(value, list):
-                conditions.append(
-                    models.FieldCondition(
-                        key=key,
-                        match=models.MatchAny(any=value)
-                    )
-                )
-            elif isinstance(value, dict):
-                # Handle range queries
-                if "gte" in value or "lte" in value:
-                    range_dict = {}
-                    if "gte" in value:
-                        range_dict["gte"] = value["gte"]
-                    if "lte" in value:
-                        range_dict["lte"] = value["lte"]
-                    
-                    conditions.append(
-                        models.FieldCondition(
-                            key=key,
-                            range=models.DatetimeRange(**range_dict)
-                        )
-                    )
-        
-        return models.Filter(must=conditions) if conditions else None
-    
     async def get_collection_stats(self) -> Dict[str, Any]:
         """Get collection statistics"""
         
-        if not self.qdrant_client:
+        if not self.backend:
             return {"error": "Vector store not available"}
         
         try:
-            collection_info = self.qdrant_client.get_collection(self.collection_name)
+            backend_stats = await self._run_blocking(self.backend.stats)
             
             return {
                 "collection_name": self.collection_name,
                 "vector_size": self.vector_size,
-                "points_count": collection_info.points_count,
-                "segments_count": collection_info.segments_count,
-                "status": collection_info.status.value
+                "backend": type(self.backend).__name__,
+                **backend_stats,
+                "embedding_cache": self.embedding_cache.stats() if self.embedding_cache else None,
+                "query_embedding_cache": self._query_embeddings.stats(),
+                "result_cache": self._result_cache.stats(),
+                "lexical_index": self.lexical_index.stats() if self.lexical_index is not None else None,
+                "retrieval_mode": self.retrieval_mode
             }
             
         except Exception as e:
@@ -428,16 +672,14 @@ class VectorStore:
     async def clear_collection(self) -> bool:
         """Clear all documents from collection"""
         
-        if not self.qdrant_client:
+        if not self.backend:
             return False
         
         try:
-            self.qdrant_client.delete(
-                collection_name=self.collection_name,
-                points_selector=models.PointIdsList(
-                    points=[]
-                )
-            )
+            await self._run_blocking(self.backend.delete, None)
+            if self.lexical_index is not None:
+                await self._run_blocking(self.lexical_index.clear)
+            self._invalidate_results()
             
             self.logger.info(f"Cleared collection {self.collection_name}")
             return True
@@ -516,34 +758,78 @@ class RAGSystem:
             if context_type:
                 filters = {"document_type": context_type}
             
-            # Search vector store
-            results = await self.vector_store.search_similar(
+            # Search vector store (fused with the lexical index in hybrid mode)
+            search = (
+                self.vector_store.hybrid_search
+                if self.vector_store.retrieval_mode == "hybrid"
+                else self.vector_store.search_similar
+            )
+            results = await search(
                 query=query,
                 limit=limit,
                 score_threshold=score_threshold,
                 filters=filters
             )
             
-            # Format response
-            response = {
-                "query": query,
-                "results": results,
-                "total_found": len(results),
-                "query_timestamp": datetime.now().isoformat()
-            }
+            return self._build_query_response(query, results)
             
-            # Add context if results found
-            if results:
-                context = self._build_context(results)
-                response["context"] = context
-                response["sources"] = [r["metadata"].get("source", "") for r in results]
+        except Exception as e:
+            self.logger.error(f"Knowledge query failed: {str(e)}")
+            raise
+    
+    async def query_knowledge_batch(
+        self,
+        queries: List[str],
+        context_type: Optional[str] = None,
+        limit: int = 5,
+        score_threshold: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """Query knowledge base with several queries in one round trip"""
+        
+        try:
+            filters = {"document_type": context_type} if context_type else None
+            
+            if self.vector_store.retrieval_mode == "hybrid":
+                # One embedding batch up front; each hybrid search then hits the query cache
+                await self.vector_store.embed_queries(queries)
+                batch_results = await asyncio.gather(*[
+                    self.vector_store.hybrid_search(
+                        query=query, limit=limit, score_threshold=score_threshold, filters=filters
+                    )
+                    for query in queries
+                ])
+            else:
+                batch_results = await self.vector_store.search_similar_batch(
+                    queries=queries,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    filters=filters
+                )
             
-            return response
+            return [self._build_query_response(query, results) for query, results in zip(queries, batch_results)]
             
         except Exception as e:
-            self.logger.error(f"Knowledge query failed: {str(e)}")
+            self.logger.error(f"Batch knowledge query failed: {str(e)}")
             raise
     
+    def _build_query_response(self, query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Format search results as a query_knowledge response"""
+        
+        response = {
+            "query": query,
+            "results": results,
+            "total_found": len(results),
+            "query_timestamp": datetime.now().isoformat()
+        }
+        
+        # Add context if results found
+        if results:
+            context = self._build_context(results)
+            response["context"] = context
+            response["sources"] = [r["metadata"].get("source", "") for r in results]
+        
+        return response
+    
     async def get_knowledge_stats(self) -> Dict[str, Any]:
         """Get knowledge base statistics"""
         
@@ -4,16 +4,24 @@ Real-time threat detection, analysis, and automated response system
 """
 
 import asyncio
-import json
 import hashlib
 import requests
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, AsyncIterator, Iterable, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import numpy as np
 import uuid
-import re
+
+from .detection_engine import CompiledRuleSet
+from .ip_reputation import ip_reputation
+from .behavior_windows import EntityWindowStore, event_entity, event_time
+
+try:
+    from ..utils.ttl_cache import TTLCache
+except ImportError:  # imported as the top-level ``security`` package
+    from utils.ttl_cache import TTLCache
+
 
 class ThreatLevel(Enum):
     LOW = "low"
@@ -84,6 +92,13 @@ class AdvancedThreatIntelligence:
         # Initialize threat intelligence feeds
         self._initialize_threat_feeds()
         self._initialize_detection_rules()
+        
+        # Compiled form of detection_rules, rebuilt when the rules change
+        self._compiled_rules: Optional[CompiledRuleSet] = None
+        self._compiled_signature = None
+        
+        # CIDR-indexed blocklists, shared with the zero-trust engine
+        self.ip_reputation = ip_reputation
     
     def _initialize_threat_feeds(self):
         """Initialize threat intelligence feeds"""
@@ -187,19 +202,18 @@ class AdvancedThreatIntelligence:
                 "analysis_timestamp": datetime.now().isoformat()
             }
             
-            # Process each event
+            # Threat detection over the whole batch
+            threats = await self._detect_threats_batch(events)
+            analysis_results["threats_detected"].extend(threats)
+            
+            # Behavioral analysis
             for event in events:
-                # Threat detection
-                threats = await self._detect_threats(event)
-                analysis_results["threats_detected"].extend(threats)
-                
-                # Behavioral analysis
                 anomalies = await self.behavior_analyzer.analyze_event(event)
                 analysis_results["anomalies_found"].extend(anomalies)
-                
-                # Threat hunting
-                hunting_results = await self.threat_hunter.hunt_threats([event])
-                analysis_results["threats_detected"].extend(hunting_results.get("threats", []))
+            
+            # Threat hunting
+            hunting_results = await self.threat_hunter.hunt_threats(events)
+            analysis_results["threats_detected"].extend(hunting_results.get("threats", []))
             
             # Calculate overall risk score
             analysis_results["risk_score"] = await self._calculate_risk_score(
@@ -227,16 +241,113 @@ class AdvancedThreatIntelligence:
                 "analysis_timestamp": datetime.now().isoformat()
             }
     
-    async def _detect_threats(self, event: Dict[str, Any]) -> List[ThreatIndicator]:
-        """Detect threats in security events"""
+    async def analyze_event_stream(self, source: Union[Iterable[Dict[str, Any]], AsyncIterator[Dict[str, Any]], asyncio.Queue],
+                                   batch_size: int = 500,
+                                   flush_interval: float = 1.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze a continuous stream of security events, yielding findings as they are detected.
+        
+        ``source`` is an iterable, an async iterator or an ``asyncio.Queue`` (a ``None``
+        item ends the stream). Events are processed in micro-batches of up to
+        ``batch_size``; a partial batch is flushed after ``flush_interval`` seconds
+        without new events. Behavior baselines are kept per entity in bounded
+        sliding windows, so memory does not grow with the length of the stream.
+        
+        Each finding is a dict with ``kind`` (threat, anomaly, hunting_detection
+        or incident), ``finding`` and ``events_processed`` (stream offset at the
+        end of the batch it came from).
+        """
+        events_processed = 0
+        async for batch in self._micro_batches(source, batch_size, flush_interval):
+            events_processed += len(batch)
+            
+            threats = await self._detect_threats_batch(batch)
+            for threat in threats:
+                yield {"kind": "threat", "finding": threat, "events_processed": events_processed}
+            
+            for event in batch:
+                for anomaly in await self.behavior_analyzer.analyze_stream_event(event):
+                    yield {"kind": "anomaly", "finding": anomaly, "events_processed": events_processed}
+            
+            for detection in await self.threat_hunter.hunt_stream(batch):
+                yield {"kind": "hunting_detection", "finding": detection, "events_processed": events_processed}
+            
+            for incident in await self._create_security_incidents(threats):
+                yield {"kind": "incident", "finding": incident, "events_processed": events_processed}
+            
+            await self._trigger_automated_responses(threats)
+    
+    async def _micro_batches(self, source, batch_size: int, flush_interval: float) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Group a stream source into lists of at most ``batch_size`` events"""
+        if isinstance(source, asyncio.Queue):
+            source = self._drain_queue(source)
+        
+        if not hasattr(source, "__aiter__"):
+            batch = []
+            for event in source:
+                batch.append(event)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+        
+        iterator = source.__aiter__()
+        batch = []
+        pending = asyncio.ensure_future(iterator.__anext__())
+        loop = asyncio.get_running_loop()
+        flush_at = None
+        try:
+            while True:
+                timeout = None if flush_at is None else max(0.0, flush_at - loop.time())
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    # quiet stream: flush what we have, keep waiting for the same item
+                    yield batch
+                    batch, flush_at = [], None
+                    continue
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    break
+                batch.append(event)
+                if flush_at is None:
+                    flush_at = loop.time() + flush_interval
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch, flush_at = [], None
+                pending = asyncio.ensure_future(iterator.__anext__())
+            if batch:
+                yield batch
+        finally:
+            if not pending.done():
+                pending.cancel()
+    
+    @staticmethod
+    async def _drain_queue(queue: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            yield event
+    
+    def _get_compiled_rules(self) -> CompiledRuleSet:
+        """Compiled detection rules, recompiled only when detection_rules changed"""
+        signature = CompiledRuleSet.signature(self.detection_rules)
+        if self._compiled_rules is None or signature != self._compiled_signature:
+            self._compiled_rules = CompiledRuleSet(self.detection_rules)
+            self._compiled_signature = signature
+        return self._compiled_rules
+    
+    async def _detect_threats_batch(self, events: List[Dict[str, Any]]) -> List[ThreatIndicator]:
+        """Detect threats across a batch of events with the compiled rule set"""
         detected_threats = []
+        compiled = self._get_compiled_rules()
         
-        for rule_name, rule in self.detection_rules.items():
-            if not rule["active"]:
-                continue
-            
-            threat_detected = await self._apply_detection_rule(event, rule)
-            if threat_detected:
+        for event, rule_names in zip(events, compiled.match_batch(events)):
+            for rule_name in rule_names:
+                rule = self.detection_rules[rule_name]
                 indicator = ThreatIndicator(
                     id=str(uuid.uuid4()),
                     type=rule["threat_type"],
@@ -256,33 +367,6 @@ class AdvancedThreatIntelligence:
         
         return detected_threats
     
-    async def _apply_detection_rule(self, event: Dict[str, Any], rule: Dict[str, Any]) -> bool:
-        """Apply detection rule to event"""
-        try:
-            pattern = rule["pattern"]
-            
-            # Pattern-based detection
-            if isinstance(pattern, str) and pattern.startswith("r"):
-                # Regex pattern
-                text_data = json.dumps(event)
-                return bool(re.search(pattern[1:], text_data, re.IGNORECASE))
-            
-            # Threshold-based detection
-            elif pattern == "data_transfer_size":
-                return event.get("data_size", 0) > rule["threshold"]
-            
-            elif pattern == "multiple_host_access":
-                return len(event.get("accessed_hosts", [])) > rule["threshold"]
-            
-            # Login failure detection
-            elif pattern == "failed_login_attempts":
-                return event.get("failed_logins", 0) > rule["threshold"]
-            
-            return False
-            
-        except Exception:
-            return False
-    
     async def _calculate_confidence_score(self, event: Dict[str, Any], rule: Dict[str, Any]) -> float:
         """Calculate confidence score for threat detection"""
         base_confidence = 0.7
@@ -324,14 +408,8 @@ class AdvancedThreatIntelligence:
     
     async def _is_known_malicious_ip(self, ip_address: str) -> bool:
         """Check if IP is known to be malicious"""
-        # Mock implementation - would query threat intelligence feeds
-        malicious_ranges = [
-            "192.168.100.",  # Example malicious range
-            "10.0.10.",      # Example suspicious range
-            "203.0.113."     # RFC5737 test range
-        ]
-        
-        return any(ip_address.startswith(range_prefix) for range_prefix in malicious_ranges)
+        await self.ip_reputation.refresh_if_changed()
+        return self.ip_reputation.reputation(ip_address) != "clean"
     
     async def _calculate_risk_score(self, threats: List[ThreatIndicator], 
                                    anomalies: List[Dict[str, Any]]) -> float:
@@ -381,7 +459,8 @@ class AdvancedThreatIntelligence:
             incident = SecurityIncident(
                 incident_id=str(uuid.uuid4()),
                 threat_indicators=high_severity_threats,
-                severity=max(t.severity for t in high_severity_threats),
+                # ThreatLevel members are declared from lowest to highest
+                severity=max((t.severity for t in high_severity_threats), key=list(ThreatLevel).index),
                 status="open",
                 created_at=datetime.now(),
                 updated_at=datetime.now(),
@@ -479,9 +558,14 @@ class AdvancedThreatIntelligence:
 class BehaviorAnalyzer:
     """Analyzes user and system behavior for anomalies"""
     
-    def __init__(self):
-        self.baseline_behaviors = {}
+    def __init__(self, window_seconds: Optional[float] = None, max_entities: Optional[int] = None,
+                 max_events_per_entity: Optional[int] = None):
+        # Per-entity sliding windows used by streaming analysis
+        self.baseline_behaviors = EntityWindowStore(window_seconds, max_entities, max_events_per_entity)
         self.anomaly_threshold = 0.7
+        self.min_baseline_events = 20
+        self.rare_hour_share = 0.02
+        self.volume_z_threshold = 3.0
     
     async def analyze_event(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze event for behavioral anomalies"""
@@ -504,6 +588,60 @@ class BehaviorAnalyzer:
         
         return anomalies
     
+    async def analyze_stream_event(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Analyze an event against its entity's sliding-window baseline, then add it
+        to the window. Until the entity has ``min_baseline_events`` observations the
+        static checks of ``analyze_event`` are used instead.
+        """
+        entity = event_entity(event)
+        timestamp = event_time(event)
+        epoch = timestamp.timestamp()
+        hour = timestamp.hour
+        resource = str(event.get("resource", "unknown"))
+        try:
+            volume = float(event.get("data_size", 0) or 0)
+        except (TypeError, ValueError):
+            volume = 0.0
+        
+        window = self.baseline_behaviors.get(entity)
+        window.expire(epoch)
+        
+        if len(window) < self.min_baseline_events:
+            anomalies = await self.analyze_event(event)
+        else:
+            anomalies = []
+            
+            if window.hour_share(hour, spread=1) < self.rare_hour_share:
+                anomalies.append({
+                    "type": "time_anomaly",
+                    "description": f"Unusual access time for {entity}: {hour}:00",
+                    "severity_score": 0.6,
+                    "details": {"access_hour": hour, "typical_hours": window.typical_hours()}
+                })
+            
+            if resource not in window.resource_counts and event.get("user_id") != "system":
+                anomalies.append({
+                    "type": "access_pattern_anomaly",
+                    "description": f"Unusual resource access for {entity}: {resource}",
+                    "severity_score": 0.5,
+                    "details": {"accessed_resource": resource, "typical_resources": window.typical_resources()}
+                })
+            
+            mean, std = window.volume_stats()
+            if volume > mean and std > 0 and (volume - mean) / std > self.volume_z_threshold:
+                anomalies.append({
+                    "type": "volume_anomaly",
+                    "description": f"Data transfer far above baseline for {entity}: {volume / (1024*1024):.1f}MB",
+                    "severity_score": 0.7,
+                    "details": {"transfer_size": volume, "baseline_mean": mean, "baseline_std": std}
+                })
+        
+        window.add(epoch, hour, resource, volume)
+        for anomaly in anomalies:
+            anomaly["entity"] = entity
+        return anomalies
+    
     async def _detect_time_anomaly(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Detect unusual access times"""
         event_time = event.get("timestamp", datetime.now())
@@ -559,8 +697,10 @@ class BehaviorAnalyzer:
 class ThreatHunter:
     """Proactive threat hunting capabilities"""
     
-    def __init__(self):
+    def __init__(self, dedup_window_seconds: float = 3600, max_tracked_detections: int = 100000):
         self.hunting_rules = self._load_hunting_rules()
+        # (rule, entity) pairs already reported by hunt_stream within the window
+        self._recent_detections = TTLCache(max_tracked_detections, dedup_window_seconds)
     
     def _load_hunting_rules(self) -> Dict[str, Any]:
         """Load threat hunting rules"""
@@ -610,6 +750,17 @@ class ThreatHunter:
         
         return hunting_results
     
+    async def hunt_stream(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Hunt over one micro-batch of a continuous stream. A rule firing again for
+        the same entity within the dedup window is not reported twice.
+        """
+        results = await self.hunt_threats(events)
+        return [
+            threat for threat in results["threats"]
+            if self._recent_detections.add((threat["rule"], event_entity(threat["event"])))
+        ]
+    
     async def _hunt_with_rule(self, events: List[Dict[str, Any]], rule: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Hunt for threats using specific rule"""
         threats = []
@@ -0,0 +1,153 @@
+"""
+Behavior Windows - bounded per-entity sliding-window baselines
+Time-of-day, resource access and transfer volume statistics over the most
+recent events of each user or source IP, for streaming behavior analysis
+"""
+
+import math
+import os
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+def event_time(event: Dict[str, Any]) -> datetime:
+    """Event timestamp as a datetime; events without one are taken as happening now"""
+    value = event.get("timestamp")
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    elif isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    return datetime.now()
+
+
+def event_entity(event: Dict[str, Any]) -> str:
+    """Entity a behavior baseline is kept for: the user, else the source IP"""
+    return str(event.get("user_id") or event.get("source_ip") or "unknown")
+
+
+class EntityWindow:
+    """
+    Sliding window of one entity's recent events.
+
+    Keeps at most ``max_events`` observations no older than ``window_seconds``
+    (measured in event time) together with incrementally maintained aggregates:
+    an hour-of-day histogram, per-resource counts and the running sum and sum
+    of squares of transfer sizes. Evicting an observation subtracts it from
+    the aggregates, so reading a statistic never rescans the window.
+    """
+
+    __slots__ = ("window_seconds", "max_events", "events", "hour_counts",
+                 "resource_counts", "volume_sum", "volume_sq_sum", "last_seen")
+
+    def __init__(self, window_seconds: float, max_events: int):
+        self.window_seconds = window_seconds
+        self.max_events = max_events
+        self.events: Deque[Tuple[float, int, str, float]] = deque()
+        self.hour_counts = [0] * 24
+        self.resource_counts: Counter = Counter()
+        self.volume_sum = 0.0
+        self.volume_sq_sum = 0.0
+        self.last_seen = 0.0
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _evict_oldest(self):
+        _, hour, resource, volume = self.events.popleft()
+        self.hour_counts[hour] -= 1
+        self.resource_counts[resource] -= 1
+        if self.resource_counts[resource] <= 0:
+            del self.resource_counts[resource]
+        self.volume_sum -= volume
+        self.volume_sq_sum -= volume * volume
+
+    def expire(self, now: float):
+        """Drop observations older than the window"""
+        cutoff = now - self.window_seconds
+        while self.events and self.events[0][0] < cutoff:
+            self._evict_oldest()
+
+    def add(self, timestamp: float, hour: int, resource: str, volume: float):
+        self.events.append((timestamp, hour, resource, volume))
+        self.hour_counts[hour] += 1
+        self.resource_counts[resource] += 1
+        self.volume_sum += volume
+        self.volume_sq_sum += volume * volume
+        self.last_seen = max(self.last_seen, timestamp)
+        while len(self.events) > self.max_events:
+            self._evict_oldest()
+
+    def hour_share(self, hour: int, spread: int = 0) -> float:
+        """Share of observations within ``spread`` hours of ``hour`` (wrapping at midnight)"""
+        if not self.events:
+            return 0.0
+        count = sum(self.hour_counts[(hour + offset) % 24] for offset in range(-spread, spread + 1))
+        return count / len(self.events)
+
+    def typical_hours(self, top: int = 3) -> List[int]:
+        return sorted(range(24), key=lambda h: self.hour_counts[h], reverse=True)[:top]
+
+    def typical_resources(self, top: int = 3) -> List[str]:
+        return [resource for resource, _ in self.resource_counts.most_common(top)]
+
+    def volume_stats(self) -> Tuple[float, float]:
+        """Mean and standard deviation of transfer sizes in the window"""
+        count = len(self.events)
+        if not count:
+            return 0.0, 0.0
+        mean = self.volume_sum / count
+        variance = max(0.0, self.volume_sq_sum / count - mean * mean)
+        return mean, math.sqrt(variance)
+
+
+class EntityWindowStore:
+    """
+    LRU-bounded map of entity -> EntityWindow.
+
+    Memory is capped at ``max_entities`` windows of ``max_events`` observations
+    each; the least recently active entity is dropped when a new one arrives.
+    """
+
+    def __init__(self, window_seconds: Optional[float] = None, max_entities: Optional[int] = None,
+                 max_events: Optional[int] = None):
+        self.window_seconds = float(
+            window_seconds if window_seconds is not None else os.getenv("SECURITY_STREAM_WINDOW_SECONDS", "3600")
+        )
+        self.max_entities = int(
+            max_entities if max_entities is not None else os.getenv("SECURITY_STREAM_MAX_ENTITIES", "50000")
+        )
+        self.max_events = int(
+            max_events if max_events is not None else os.getenv("SECURITY_STREAM_MAX_EVENTS_PER_ENTITY", "1000")
+        )
+        self._windows: "OrderedDict[str, EntityWindow]" = OrderedDict()
+        self.evicted_entities = 0
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def get(self, entity: str) -> EntityWindow:
+        window = self._windows.get(entity)
+        if window is None:
+            window = self._windows[entity] = EntityWindow(self.window_seconds, self.max_events)
+            while len(self._windows) > self.max_entities:
+                self._windows.popitem(last=False)
+                self.evicted_entities += 1
+        else:
+            self._windows.move_to_end(entity)
+        return window
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entities": len(self._windows),
+            "observations": sum(len(window) for window in self._windows.values()),
+            "evicted_entities": self.evicted_entities,
+            "window_seconds": self.window_seconds,
+            "max_entities": self.max_entities,
+            "max_events_per_entity": self.max_events
+        }
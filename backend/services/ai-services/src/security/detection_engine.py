@@ -0,0 +1,232 @@
+"""
+Compiled Detection Engine
+Batch evaluation of threat detection rules: regex rules are compiled once
+behind a literal prefilter and threshold rules are evaluated column-wise per batch
+
+Rules are evaluated exactly as AdvancedThreatIntelligence always has: a pattern
+is a regex only when marked with a leading "r" (stripped before compiling) and
+is searched in json.dumps(event); other patterns name a threshold rule.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import re._parser as sre_parse
+    from re._constants import BRANCH, LITERAL, SUBPATTERN
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import BRANCH, LITERAL, SUBPATTERN
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# Threshold columns use NaN for values the threshold cannot be compared with; NaN never exceeds it
+_NOT_COMPARABLE = float("nan")
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _NOT_COMPARABLE
+
+
+def _data_size(event: Dict[str, Any]) -> float:
+    return _number(event.get("data_size", 0))
+
+
+def _accessed_host_count(event: Dict[str, Any]) -> float:
+    try:
+        return float(len(event.get("accessed_hosts", [])))
+    except TypeError:
+        return _NOT_COMPARABLE
+
+
+def _failed_logins(event: Dict[str, Any]) -> float:
+    return _number(event.get("failed_logins", 0))
+
+
+# Threshold rules: pattern name -> extractor of the numeric column compared to the rule threshold
+THRESHOLD_EXTRACTORS: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    "data_transfer_size": _data_size,
+    "multiple_host_access": _accessed_host_count,
+    "failed_login_attempts": _failed_logins,
+}
+
+
+# Above this many alternatives a literal prefilter stops paying for itself
+MAX_PREFILTER_LITERALS = 32
+
+# Leading character that marks a rule pattern as a regex
+REGEX_MARKER = "r"
+
+
+def serialize_event(event: Dict[str, Any]) -> str:
+    """Text form of an event that regex rules are matched against (always ASCII)"""
+    return json.dumps(event)
+
+
+def _prefix_literals(items) -> Tuple[List[str], bool]:
+    """Literal prefixes one of which every match of ``items`` must start with"""
+    prefixes = [""]
+    for op, av in items:
+        if op is LITERAL:
+            prefixes = [prefix + chr(av) for prefix in prefixes]
+            continue
+        if op is SUBPATTERN or op is BRANCH:
+            alternatives = [av[-1]] if op is SUBPATTERN else av[1]
+            extended, complete = [], True
+            for alternative in alternatives:
+                alt_prefixes, alt_complete = _prefix_literals(list(alternative))
+                extended.extend(prefix + alt for prefix in prefixes for alt in alt_prefixes)
+                complete = complete and alt_complete
+            prefixes = extended
+            if not complete or len(prefixes) > MAX_PREFILTER_LITERALS:
+                return prefixes, False
+            continue
+        return prefixes, False
+    return prefixes, True
+
+
+def required_literals(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    Lower-cased literals of which at least one occurs in any text the pattern
+    matches, or None when the pattern has no usable literal prefix.
+    """
+    try:
+        prefixes, _ = _prefix_literals(list(sre_parse.parse(pattern, re.IGNORECASE)))
+    except Exception:
+        return None
+    if not prefixes or len(prefixes) > MAX_PREFILTER_LITERALS:
+        return None
+    if any(not prefix or not prefix.isascii() for prefix in prefixes):
+        return None
+    return tuple(sorted({prefix.lower() for prefix in prefixes}))
+
+
+class CompiledRuleSet:
+    """
+    Detection rules compiled for batch evaluation.
+
+    Each regex rule is compiled once. Rules whose matches must start with one
+    of a few literals (``(union|select|...)``, ``Failed password for``) are
+    gated on a substring check against the lower-cased event text, so the
+    regex engine only runs on events that can match. Rules without such a
+    prefix share one combined alternation with a named group per rule; because
+    alternatives consume text, a hit there can hide an overlapping match of
+    another rule, so when it finds anything the remaining rules are confirmed
+    individually.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]]):
+        self.rule_order: List[str] = []
+        self.threshold_rules: List[Tuple[str, Callable[[Dict[str, Any]], float], float]] = []
+        self.regex_rules: Dict[str, "re.Pattern"] = {}
+        self.prefiltered_rules: List[Tuple[str, "re.Pattern", Tuple[str, ...]]] = []
+        self._group_to_rule: Dict[str, str] = {}
+        self.invalid_rules: Dict[str, str] = {}
+
+        alternatives = []
+        for rule_name, rule in rules.items():
+            if not rule.get("active", True):
+                continue
+            pattern = rule.get("pattern")
+            if not isinstance(pattern, str):
+                continue
+
+            if pattern in THRESHOLD_EXTRACTORS:
+                try:
+                    threshold = float(rule["threshold"])
+                except (KeyError, TypeError, ValueError) as e:
+                    self.invalid_rules[rule_name] = f"invalid threshold: {e}"
+                    continue
+                self.threshold_rules.append((rule_name, THRESHOLD_EXTRACTORS[pattern], threshold))
+                self.rule_order.append(rule_name)
+                continue
+
+            # Unmarked patterns that name no threshold rule match nothing
+            if not pattern.startswith(REGEX_MARKER):
+                continue
+            pattern = pattern[len(REGEX_MARKER):]
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                self.invalid_rules[rule_name] = str(e)
+                continue
+            self.regex_rules[rule_name] = compiled
+            self.rule_order.append(rule_name)
+
+            literals = required_literals(pattern)
+            if literals:
+                self.prefiltered_rules.append((rule_name, compiled, literals))
+                continue
+            group = f"r{len(self._group_to_rule)}"
+            self._group_to_rule[group] = rule_name
+            # rules may use their own (unnamed) capture groups; wrap each in a named group
+            alternatives.append(f"(?P<{group}>{pattern})")
+
+        self._combined: Optional["re.Pattern"] = (
+            re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        )
+
+    @staticmethod
+    def signature(rules: Dict[str, Dict[str, Any]]) -> Tuple:
+        """Cheap fingerprint of the rule set; recompile when it changes"""
+        return tuple(
+            (name, rule.get("active", True), rule.get("pattern"), rule.get("threshold"))
+            for name, rule in rules.items()
+        )
+
+    def match_text(self, text: str) -> List[str]:
+        """Regex rules matching an already-serialized event"""
+        found = set()
+
+        if self.prefiltered_rules:
+            # serialize_event output is ASCII, so lower() agrees with IGNORECASE matching
+            lowered = text.lower()
+            for rule_name, compiled, literals in self.prefiltered_rules:
+                if any(literal in lowered for literal in literals) and compiled.search(text):
+                    found.add(rule_name)
+
+        if self._combined is not None:
+            combined_hits = {
+                self._group_to_rule[m.lastgroup] for m in self._combined.finditer(text) if m.lastgroup
+            }
+            if combined_hits:
+                found |= combined_hits
+                for rule_name in self._group_to_rule.values():
+                    if rule_name not in found and self.regex_rules[rule_name].search(text):
+                        found.add(rule_name)
+
+        return list(found)
+
+    def match_batch(self, events: List[Dict[str, Any]]) -> List[List[str]]:
+        """Names of the rules each event triggers, in rule declaration order"""
+        hits: List[set] = [set() for _ in events]
+
+        # Threshold rules, one column per rule
+        for rule_name, extractor, threshold in self.threshold_rules:
+            column = [extractor(event) for event in events]
+            if NUMPY_AVAILABLE:
+                indices = np.flatnonzero(np.asarray(column, dtype=float) > threshold)
+            else:
+                indices = [i for i, value in enumerate(column) if value > threshold]
+            for i in indices:
+                hits[int(i)].add(rule_name)
+
+        # Regex rules, each event serialized exactly once
+        if self.regex_rules:
+            for i, event in enumerate(events):
+                try:
+                    text = serialize_event(event)
+                except (TypeError, ValueError):
+                    continue
+                hits[i].update(self.match_text(text))
+
+        return [[name for name in self.rule_order if name in event_hits] for event_hits in hits]
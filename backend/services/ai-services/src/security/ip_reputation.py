@@ -0,0 +1,309 @@
+"""
+IP Reputation - CIDR-indexed blocklists shared by the security engines
+Feeds are plain-text IPv4/IPv6 address and CIDR lists loaded from a local
+directory and hot-reloaded when they change on disk
+"""
+
+import asyncio
+import bisect
+import ipaddress
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:
+    from ..utils.ttl_cache import TTLCache
+except ImportError:  # imported as the top-level ``security`` package
+    from utils.ttl_cache import TTLCache
+
+
+MALICIOUS = "malicious"
+SUSPICIOUS = "suspicious"
+VPN = "vpn"
+
+FEED_SUFFIXES = (".txt", ".netset", ".ipset", ".cidr", ".list")
+
+# Example ranges used when no feed files are present (previously hardcoded in the engines)
+DEFAULT_FEEDS: Dict[str, List[str]] = {
+    MALICIOUS: ["192.168.100.0/24", "10.0.10.0/24", "192.168.1.100", "10.0.0.50"],
+    SUSPICIOUS: ["203.0.113.0/24", "198.51.100.1"],
+    VPN: ["192.168.0.0/16", "10.0.0.0/8"],
+}
+
+_FIELD_SEPARATORS = re.compile(r"[\s,;|]+")
+_IPV4_TYPECODE = "I" if array("I").itemsize >= 4 else "L"
+
+
+class CIDRSet:
+    """
+    Sorted, merged interval index over IPv4 and IPv6 networks.
+
+    Overlapping and adjacent networks are coalesced at build time, so a lookup
+    is a single binary search, O(log n). IPv4 bounds are stored in compact
+    unsigned int arrays; IPv6 bounds as Python ints.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, int]] = ()):
+        """``intervals`` are (ip version, first address, last address) as ints"""
+        v4: List[Tuple[int, int]] = []
+        v6: List[Tuple[int, int]] = []
+        for version, start, end in intervals:
+            (v4 if version == 4 else v6).append((start, end))
+        v4_starts, v4_ends = self._merge(v4)
+        self._v4_starts = array(_IPV4_TYPECODE, v4_starts)
+        self._v4_ends = array(_IPV4_TYPECODE, v4_ends)
+        self._v6_starts, self._v6_ends = self._merge(v6)
+
+    @staticmethod
+    def _merge(intervals: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+        starts: List[int] = []
+        ends: List[int] = []
+        for start, end in sorted(intervals):
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    def contains(self, address: ipaddress._BaseAddress) -> bool:
+        if address.version == 4:
+            starts, ends = self._v4_starts, self._v4_ends
+        else:
+            starts, ends = self._v6_starts, self._v6_ends
+        value = int(address)
+        i = bisect.bisect_right(starts, value) - 1
+        return i >= 0 and value <= ends[i]
+
+    def __len__(self) -> int:
+        return len(self._v4_starts) + len(self._v6_starts)
+
+
+@dataclass
+class _Snapshot:
+    """Immutable view swapped in as a whole on reload"""
+    categories: Dict[str, CIDRSet]
+    cache: TTLCache
+    signature: Tuple = ()
+    loaded_at: float = field(default_factory=time.time)
+    entries: int = 0
+    invalid_lines: int = 0
+    sources: List[str] = field(default_factory=list)
+
+
+def parse_address(ip_address: str) -> Optional[ipaddress._BaseAddress]:
+    """Parse an address, unwrapping IPv4-mapped IPv6 addresses"""
+    try:
+        address = ipaddress.ip_address(str(ip_address).strip())
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped is not None:
+        return address.ipv4_mapped
+    return address
+
+
+def network_interval(token: str) -> Tuple[int, int, int]:
+    """(ip version, first address, last address) of an address or CIDR; raises ValueError"""
+    address, _, prefix = token.partition("/")
+    try:
+        # fast path for plain IPv4, the bulk of most feeds
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except OSError:
+        pass
+    else:
+        prefixlen = int(prefix) if prefix else 32
+        if not 0 <= prefixlen <= 32:
+            raise ValueError(f"invalid prefix length in {token}")
+        host_bits = 32 - prefixlen
+        start = value >> host_bits << host_bits
+        return 4, start, start | ((1 << host_bits) - 1)
+
+    network = ipaddress.ip_network(token, strict=False)
+    if network.version == 6 and network.network_address.ipv4_mapped is not None and network.prefixlen >= 96:
+        network = ipaddress.ip_network(
+            f"{network.network_address.ipv4_mapped}/{network.prefixlen - 96}", strict=False
+        )
+    return network.version, int(network.network_address), int(network.broadcast_address)
+
+
+def parse_feed_line(line: str) -> Optional[Tuple[int, int, int]]:
+    """First field of a feed line as an interval; comments and blank lines give None"""
+    line = line.split("#", 1)[0].strip()
+    if not line:
+        return None
+    return network_interval(_FIELD_SEPARATORS.split(line, 1)[0])
+
+
+class IPReputationService:
+    """
+    IP reputation lookups against local blocklist feeds.
+
+    Every file in ``feed_dir`` with a known suffix is a feed; the part of the
+    file name before the first dot is its category, so ``malicious.abuseipdb.txt``
+    and ``malicious.txt`` both feed ``malicious`` and ``vpn.netset`` feeds ``vpn``.
+    Reloads build a complete new index off the event loop and swap it in with
+    a single assignment, so lookups never see a half-loaded feed. Lookup
+    results are cached per IP; the cache belongs to the index it was filled from.
+    """
+
+    def __init__(self, feed_dir: Optional[str] = None, reload_interval: Optional[float] = None,
+                 cache_size: Optional[int] = None, cache_ttl: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.feed_dir = feed_dir if feed_dir is not None else os.getenv("IP_REPUTATION_FEED_DIR", "data/ip_reputation")
+        self.reload_interval = float(
+            reload_interval if reload_interval is not None else os.getenv("IP_REPUTATION_RELOAD_INTERVAL", "60")
+        )
+        self.cache_size = int(cache_size if cache_size is not None else os.getenv("IP_REPUTATION_CACHE_SIZE", "100000"))
+        self.cache_ttl = float(cache_ttl if cache_ttl is not None else os.getenv("IP_REPUTATION_CACHE_TTL", "300"))
+
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self.reload_count = 0
+        self.last_error: Optional[str] = None
+
+        self._snapshot = _Snapshot(categories={}, cache=TTLCache(self.cache_size, self.cache_ttl))
+        self.reload()
+
+    # Loading
+
+    def _feed_files(self) -> List[str]:
+        if not self.feed_dir or not os.path.isdir(self.feed_dir):
+            return []
+        return sorted(
+            os.path.join(self.feed_dir, name)
+            for name in os.listdir(self.feed_dir)
+            if name.lower().endswith(FEED_SUFFIXES) and not name.startswith(".")
+        )
+
+    def _signature(self) -> Tuple:
+        signature = []
+        for path in self._feed_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _build(self, signature: Tuple) -> _Snapshot:
+        networks: Dict[str, List[Tuple[int, int, int]]] = {}
+        invalid_lines = 0
+        sources = []
+
+        if signature:
+            for path, _, _ in signature:
+                category = os.path.basename(path).split(".", 1)[0].lower()
+                bucket = networks.setdefault(category, [])
+                with open(path, "r", encoding="utf-8", errors="replace") as feed:
+                    for line in feed:
+                        try:
+                            interval = parse_feed_line(line)
+                        except ValueError:
+                            invalid_lines += 1
+                            continue
+                        if interval is not None:
+                            bucket.append(interval)
+                sources.append(path)
+        else:
+            for category, entries in DEFAULT_FEEDS.items():
+                networks[category] = [network_interval(entry) for entry in entries]
+            sources.append("builtin")
+
+        return _Snapshot(
+            categories={category: CIDRSet(items) for category, items in networks.items()},
+            cache=TTLCache(self.cache_size, self.cache_ttl),
+            signature=signature,
+            entries=sum(len(items) for items in networks.values()),
+            invalid_lines=invalid_lines,
+            sources=sources
+        )
+
+    def reload(self, force: bool = True) -> bool:
+        """Rebuild the index from the feed files; returns True if a new index was swapped in"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False  # another reload is already building
+        try:
+            signature = self._signature()
+            if not force and signature == self._snapshot.signature:
+                return False
+            snapshot = self._build(signature)
+            self._snapshot = snapshot
+            self.reload_count += 1
+            self.last_error = None
+            self.logger.info(
+                f"IP reputation index loaded: {snapshot.entries} entries from {len(snapshot.sources)} feed(s)"
+                + (f", {snapshot.invalid_lines} invalid lines skipped" if snapshot.invalid_lines else "")
+            )
+            return True
+        except Exception as e:
+            # keep serving the previous index
+            self.last_error = str(e)
+            self.logger.error(f"IP reputation reload failed: {e}")
+            return False
+        finally:
+            self._reload_lock.release()
+
+    async def refresh_if_changed(self) -> bool:
+        """Reload in a worker thread if the feeds changed; checks at most every ``reload_interval`` seconds"""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return False
+        self._last_check = now
+        return await asyncio.to_thread(self.reload, False)
+
+    # Lookups
+
+    def lookup(self, ip_address: str) -> FrozenSet[str]:
+        """Categories whose feeds contain ``ip_address``"""
+        snapshot = self._snapshot
+        key = str(ip_address)
+        cached = snapshot.cache.get(key)
+        if cached is not None:
+            return cached
+
+        address = parse_address(key)
+        if address is None:
+            result: FrozenSet[str] = frozenset()
+        else:
+            result = frozenset(
+                category for category, cidrs in snapshot.categories.items() if cidrs.contains(address)
+            )
+        snapshot.cache.set(key, result)
+        return result
+
+    def reputation(self, ip_address: str) -> str:
+        """``malicious``, ``suspicious`` or ``clean``"""
+        categories = self.lookup(ip_address)
+        if MALICIOUS in categories:
+            return MALICIOUS
+        if SUSPICIOUS in categories:
+            return SUSPICIOUS
+        return "clean"
+
+    def is_vpn(self, ip_address: str) -> bool:
+        return VPN in self.lookup(ip_address)
+
+    def get_stats(self) -> Dict[str, object]:
+        snapshot = self._snapshot
+        return {
+            "feed_dir": self.feed_dir,
+            "sources": list(snapshot.sources),
+            "entries": snapshot.entries,
+            "ranges": {category: len(cidrs) for category, cidrs in snapshot.categories.items()},
+            "invalid_lines": snapshot.invalid_lines,
+            "loaded_at": snapshot.loaded_at,
+            "reload_count": self.reload_count,
+            "last_error": self.last_error,
+            "cache": snapshot.cache.stats()
+        }
+
+
+# Shared by AdvancedThreatIntelligence and ZeroTrustEngine
+ip_reputation = IPReputationService()
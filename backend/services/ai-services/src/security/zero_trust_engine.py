@@ -12,6 +12,8 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
 
+from .ip_reputation import ip_reputation
+
 class ThreatLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -75,6 +77,7 @@ class ZeroTrustEngine:
         self.policies = []
         self.active_sessions = {}
         self.threat_intel = {}
+        self.ip_reputation = ip_reputation
         self.behavioral_analyzer = BehavioralAnalyzer()
         self.threat_hunter = ThreatHunter()
         self._initialize_default_policies()
@@ -301,23 +304,13 @@ class ZeroTrustEngine:
     
     async def _check_ip_reputation(self, ip_address: str) -> str:
         """Check IP reputation against threat intelligence"""
-        # Mock implementation - would integrate with real threat intel feeds
-        malicious_ips = ["192.168.1.100", "10.0.0.50"]  # Example
-        suspicious_ips = ["203.0.113.1", "198.51.100.1"]  # Example
-        
-        if ip_address in malicious_ips:
-            return "malicious"
-        elif ip_address in suspicious_ips:
-            return "suspicious"
-        else:
-            return "clean"
+        await self.ip_reputation.refresh_if_changed()
+        return self.ip_reputation.reputation(ip_address)
     
     async def _detect_vpn_usage(self, ip_address: str) -> bool:
         """Detect if IP is from VPN/proxy service"""
-        # Mock implementation - would use real VPN detection service
-        vpn_ranges = ["192.168.0.0/16", "10.0.0.0/8"]  # Example
-        return any(ip_address.startswith(range_prefix.split('/')[0][:7]) 
-                  for range_prefix in vpn_ranges)
+        await self.ip_reputation.refresh_if_changed()
+        return self.ip_reputation.is_vpn(ip_address)
     
     async def _evaluate_policies(self, request: AccessRequest, user: User, 
                                 device: Device, risk_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -0,0 +1,36 @@
+"""
+Tests for memoized tool results in the LangGraph checkpoint stores
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.agents.langgraph.checkpoint_store import InMemoryCheckpointStore, SQLiteCheckpointStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request):
+    if request.param == "memory":
+        return InMemoryCheckpointStore()
+    return SQLiteCheckpointStore(":memory:")
+
+
+def test_memoized_none_is_a_hit(store):
+    assert asyncio.run(store.get_tool_result("exec-1", "scan")) == (False, None)
+
+    asyncio.run(store.put_tool_result("exec-1", "scan", None))
+
+    assert asyncio.run(store.get_tool_result("exec-1", "scan")) == (True, None)
+
+
+def test_tool_results_read_back_as_json_in_every_store(store):
+    result = {"findings": ("a", "b"), "scanned_at": datetime(2024, 1, 2, 3, 4, 5)}
+
+    asyncio.run(store.put_tool_result("exec-1", "scan", result))
+    result["findings"] = ()
+
+    found, cached = asyncio.run(store.get_tool_result("exec-1", "scan"))
+    assert found is True
+    assert cached == {"findings": ["a", "b"], "scanned_at": "2024-01-02 03:04:05"}
@@ -0,0 +1,51 @@
+"""
+Tests for the compiled detection rule set
+"""
+
+from src.security.advanced_threat_intelligence import AdvancedThreatIntelligence
+from src.security.detection_engine import CompiledRuleSet
+
+
+def _shipped_rules():
+    return AdvancedThreatIntelligence().detection_rules
+
+
+def test_shipped_regex_rules_do_not_flag_benign_events():
+    event = {
+        "eventName": "UpdateInstanceInformation",
+        "eventSource": "ssm.amazonaws.com",
+        "message": "request received from agent",
+        "userIdentity": {"userName": "sudo-user", "role": "administrator"},
+    }
+
+    assert CompiledRuleSet(_shipped_rules()).match_batch([event]) == [[]]
+
+
+def test_shipped_threshold_rules():
+    events = [
+        {"data_size": 2 * 1073741824},
+        {"accessed_hosts": [f"host-{n}" for n in range(8)]},
+        {"data_size": "2147483648", "accessed_hosts": None},  # not comparable with the threshold
+    ]
+
+    assert CompiledRuleSet(_shipped_rules()).match_batch(events) == [
+        ["data_exfiltration_detection"],
+        ["lateral_movement_detection"],
+        [],
+    ]
+
+
+def test_only_regex_marked_patterns_are_searched():
+    rules = {
+        "marked": {"pattern": r"rFailed password for \w+", "active": True},
+        "marked_no_literal": {"pattern": r"r\bunion\s+select\b", "active": True},
+        "unmarked": {"pattern": r"Failed password for \w+", "active": True},
+        "inactive": {"pattern": r"rFailed", "active": False},
+    }
+    events = [
+        {"message": "Failed password for admin from 10.0.0.1"},
+        {"message": "q=1 UNION  SELECT password"},
+        {"message": "ok"},
+    ]
+
+    assert CompiledRuleSet(rules).match_batch(events) == [["marked"], ["marked_no_literal"], []]
@@ -0,0 +1,66 @@
+"""
+Tests for checkpointed, resumable LangGraph workflow execution
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+graph = pytest.importorskip("langgraph.graph")
+
+from src.agents.langgraph import langgraph_orchestrator
+from src.agents.langgraph.checkpoint_store import InMemoryCheckpointStore
+from src.agents.langgraph.langgraph_orchestrator import LangGraphOrchestrator, WorkflowState, WorkflowType
+
+
+def _orchestrator(calls, fail_once):
+    orchestrator = LangGraphOrchestrator.__new__(LangGraphOrchestrator)
+    orchestrator.logger = logging.getLogger(__name__)
+    orchestrator.checkpoint_store = InMemoryCheckpointStore()
+    orchestrator.node_retry_attempts = 1
+
+    def make_node(name):
+        async def node_fn(state: WorkflowState) -> WorkflowState:
+            calls[name] = calls.get(name, 0) + 1
+            state.current_step = name
+            if name in fail_once:
+                fail_once.discard(name)
+                raise RuntimeError(f"{name} exploded")
+            state.results[name] = "done"
+            return state
+        return node_fn
+
+    workflow = graph.StateGraph(WorkflowState)
+    for name in ("first", "middle", "last"):
+        workflow.add_node(name, orchestrator._checkpointed(name, make_node(name)))
+    workflow.set_entry_point("first")
+    workflow.add_edge("first", "middle")
+    workflow.add_edge("middle", "last")
+    workflow.add_edge("last", graph.END)
+    orchestrator.workflows = {WorkflowType.ROOT_CAUSE_ANALYSIS: workflow.compile()}
+    return orchestrator
+
+
+def test_resume_skips_nodes_completed_before_failure(monkeypatch):
+    monkeypatch.setattr(langgraph_orchestrator, "LANGGRAPH_AVAILABLE", True)
+    calls = {}
+    orchestrator = _orchestrator(calls, fail_once={"middle"})
+
+    failed = asyncio.run(orchestrator.execute_workflow(
+        WorkflowType.ROOT_CAUSE_ANALYSIS, {}, "investigate", execution_id="exec-1"
+    ))
+
+    assert failed["failed_node"] == "middle"
+    assert failed["completed_nodes"] == ["first"]
+    latest = asyncio.run(orchestrator.checkpoint_store.load_latest("exec-1"))
+    assert latest["node"] == "middle:failed"
+    assert latest["state"]["metadata"]["status"] == "failed"
+
+    resumed = asyncio.run(orchestrator.resume_workflow("exec-1"))
+
+    assert resumed["success"] is True
+    assert resumed["results"] == {"first": "done", "middle": "done", "last": "done"}
+    assert calls == {"first": 1, "middle": 2, "last": 1}
+    seqs = [cp["seq"] for cp in asyncio.run(orchestrator.checkpoint_store.list_checkpoints("exec-1"))]
+    assert seqs == sorted(set(seqs))
@@ -0,0 +1,52 @@
+"""
+Tests for DAG execution in the multi-agent workflow orchestrator
+"""
+
+import asyncio
+
+from src.orchestrator.multi_agent_workflow_orchestrator import (
+    AgentStep,
+    MultiAgentWorkflow,
+    MultiAgentWorkflowOrchestrator,
+    WorkflowComplexity,
+    WorkflowStatus,
+)
+
+
+def _step(name: str, *dependencies: str) -> AgentStep:
+    return AgentStep(agent_name=name, agent_type="infrastructure", task_description=name,
+                     dependencies=list(dependencies))
+
+
+def test_cyclic_dependencies_fail_without_hanging():
+    orchestrator = MultiAgentWorkflowOrchestrator()
+    workflow = MultiAgentWorkflow(
+        workflow_id="wf-cycle",
+        user_request="cycle",
+        complexity=list(WorkflowComplexity)[0],
+        steps=[_step("a", "b"), _step("b", "a"), _step("c", "b")],
+    )
+
+    result = asyncio.run(orchestrator._execute_workflow(workflow))
+
+    assert result["status"] == WorkflowStatus.FAILED
+    statuses = {step.agent_name: step.status for step in workflow.steps}
+    assert statuses == {"a": "failed", "b": "failed", "c": "failed"}
+    assert result["critical_path"] == {"steps": [], "duration": 0.0}
+
+
+def test_critical_path_follows_completed_steps():
+    orchestrator = MultiAgentWorkflowOrchestrator()
+    workflow = MultiAgentWorkflow(
+        workflow_id="wf-dag",
+        user_request="dag",
+        complexity=list(WorkflowComplexity)[0],
+        steps=[_step("plan"), _step("build", "plan"), _step("scan", "plan"), _step("deploy", "build", "scan")],
+    )
+
+    result = asyncio.run(orchestrator._execute_workflow(workflow))
+
+    assert result["status"] == WorkflowStatus.COMPLETED
+    assert result["critical_path"]["steps"][0] == "plan"
+    assert result["critical_path"]["steps"][-1] == "deploy"
+    assert len(result["critical_path"]["steps"]) == 3
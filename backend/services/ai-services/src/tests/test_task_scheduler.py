@@ -0,0 +1,47 @@
+"""
+Tests for the queued-task scheduler and the orchestrator's dispatcher
+"""
+
+import time
+
+from src.agents.base_agent import AgentTask, TaskStatus
+from src.config.settings import AgentType
+from src.orchestrator.agent_orchestrator import AgentOrchestrator
+from src.orchestrator.task_scheduler import TaskScheduler
+
+
+def _task(deadline: float, tenant_id: str = "default") -> AgentTask:
+    return AgentTask(task_type="analysis", metadata={"deadline": deadline, "tenant_id": tenant_id})
+
+
+def test_expire_removes_overdue_tasks_of_every_agent_type():
+    scheduler = TaskScheduler()
+    agent_types = list(AgentType)[:2]
+    overdue = _task(time.time() - 1)
+    pending = _task(time.time() + 60, tenant_id="other")
+    scheduler.push(agent_types[0], overdue)
+    scheduler.push(agent_types[1], pending)
+
+    expired = scheduler.expire()
+
+    assert [entry.task for entry in expired] == [overdue]
+    assert overdue.status == TaskStatus.TIMEOUT
+    assert len(scheduler) == 1
+    assert scheduler.pending_types() == [agent_types[1]]
+    assert scheduler.next_deadline() == pending.metadata["deadline"]
+
+
+def test_expired_task_is_swept_while_every_slot_is_busy():
+    orchestrator = AgentOrchestrator()
+    orchestrator._select_available_agent = lambda agent_type: None  # every agent is at capacity
+    agent_type = list(AgentType)[0]
+    task = _task(time.time() - 1)
+    orchestrator.task_queue.push(agent_type, task)
+
+    assert orchestrator._dispatch_queued_tasks() == 0
+
+    # Nothing overdue stays queued, so the dispatcher's wait timeout is no longer zero
+    assert len(orchestrator.task_queue) == 0
+    assert orchestrator.task_queue.next_deadline() == float("inf")
+    assert task.status == TaskStatus.TIMEOUT
+    assert orchestrator.completed_tasks[-1].task is task
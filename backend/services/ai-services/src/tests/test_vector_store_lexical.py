@@ -0,0 +1,72 @@
+"""
+Tests for keeping the BM25 index in step with a Qdrant-backed VectorStore
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from src.rag import vector_store
+from src.rag.vector_backends import QdrantBackend
+from src.rag.vector_store import VectorStore
+
+
+class FakeQdrantClient:
+    """Just enough of QdrantClient for scroll-based paging and empty dense search"""
+
+    def __init__(self, points):
+        self.points = points
+
+    def scroll(self, collection_name, scroll_filter=None, limit=10, offset=None,
+               with_payload=True, with_vectors=False):
+        start = offset or 0
+        page = self.points[start:start + limit]
+        next_offset = start + limit if start + limit < len(self.points) else None
+        return [SimpleNamespace(id=p["id"], payload=p["payload"]) for p in page], next_offset
+
+    def search(self, **kwargs):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeEmbeddingModel:
+    def encode(self, texts, **kwargs):
+        return [SimpleNamespace(tolist=lambda: [0.0] * 384) for _ in texts]
+
+
+def _qdrant_backend(client) -> QdrantBackend:
+    backend = QdrantBackend.__new__(QdrantBackend)
+    backend.logger = logging.getLogger(__name__)
+    backend.client = client
+    backend.collection_name = "ai_ops_knowledge"
+    backend.vector_size = 384
+    return backend
+
+
+def test_restart_rebuilds_lexical_index_from_qdrant(monkeypatch):
+    points = [
+        {"id": f"00000000-0000-0000-0000-00000000000{i}",
+         "payload": {"content": f"routine maintenance note {i}", "document_id": f"doc-{i}"}}
+        for i in range(4)
+    ]
+    points.append({
+        "id": "00000000-0000-0000-0000-000000000009",
+        "payload": {"content": "xz backdoor CVE-2024-3094 found on build hosts", "document_id": "doc-cve"}
+    })
+    client = FakeQdrantClient(points)
+    monkeypatch.setattr(vector_store.settings, "rag_embedding_cache_path", "", raising=False)
+    monkeypatch.setattr(vector_store.settings, "rag_lexical_index_path", "", raising=False)
+    monkeypatch.setattr(vector_store.settings, "rag_retrieval_mode", "hybrid", raising=False)
+    monkeypatch.setattr(vector_store.settings, "rag_upsert_batch_size", 2, raising=False)
+    monkeypatch.setattr(VectorStore, "_create_backend", lambda self: _qdrant_backend(client))
+
+    store = VectorStore()
+    store.embedding_model = FakeEmbeddingModel()
+
+    assert len(store.lexical_index) == len(points)
+    results = asyncio.run(store.hybrid_search("CVE-2024-3094", limit=3))
+    assert results[0]["content"].startswith("xz backdoor")
+    assert results[0]["dense_score"] is None
+    assert results[0]["lexical_score"] > 0
@@ -255,7 +255,7 @@ class BulkCleanupEngine:
         
         try:
             # Get all volume resources for the cloud provider
-            resources = await self.cmdb_store.search_resources(
+            resources = self.cmdb_store.search_resources_iter(
                 search=ResourceSearch(
                     tenant_id=policy.tenant_id,
                     cloud_provider=policy.cloud_provider,
@@ -263,7 +263,7 @@ class BulkCleanupEngine:
                 )
             )
             
-            for resource in resources:
+            async for resource in resources:
                 # Check if volume is attached
                 is_attached = resource.cloud_attributes.get("attached", False)
                 if is_attached:
@@ -322,7 +322,7 @@ class BulkCleanupEngine:
         
         try:
             # Get all snapshot resources
-            resources = await self.cmdb_store.search_resources(
+            resources = self.cmdb_store.search_resources_iter(
                 search=ResourceSearch(
                     tenant_id=policy.tenant_id,
                     cloud_provider=policy.cloud_provider,
@@ -330,7 +330,7 @@ class BulkCleanupEngine:
                 )
             )
             
-            for resource in resources:
+            async for resource in resources:
                 # Check if it's a snapshot
                 if "snapshot" not in resource.name.lower() and "snap" not in resource.name.lower():
                     continue
@@ -382,7 +382,7 @@ class BulkCleanupEngine:
         
         try:
             # Get all managed disk resources
-            resources = await self.cmdb_store.search_resources(
+            resources = self.cmdb_store.search_resources_iter(
                 search=ResourceSearch(
                     tenant_id=policy.tenant_id,
                     cloud_provider=policy.cloud_provider,
@@ -390,7 +390,7 @@ class BulkCleanupEngine:
                 )
             )
             
-            for resource in resources:
+            async for resource in resources:
                 # Check if disk is attached
                 is_attached = resource.cloud_attributes.get("attached", False)
                 if is_attached:
@@ -452,14 +452,14 @@ class BulkCleanupEngine:
             instance_types = [ResourceType.EC2_INSTANCE, ResourceType.VM, ResourceType.GCE_INSTANCE]
             
             for instance_type in instance_types:
-                resources = await self.cmdb_store.search_resources(
+                resources = self.cmdb_store.search_resources_iter(
                     search=ResourceSearch(
                         tenant_id=policy.tenant_id,
                         resource_type=instance_type
                     )
                 )
                 
-                for resource in resources:
+                async for resource in resources:
                     # Check if instance is running
                     if resource.status != "running":
                         continue
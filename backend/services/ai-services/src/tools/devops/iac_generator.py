@@ -4,8 +4,9 @@ Supports Terraform, Pulumi, CloudFormation with advanced validation
 """
 
 import asyncio
+import copy
+import hashlib
 import json
-import subprocess
 import tempfile
 import os
 from pathlib import Path
@@ -15,6 +16,8 @@ from enum import Enum
 import logging
 
 from ...config.settings import settings
+from ...utils.async_subprocess import run_command
+from ...utils.ttl_cache import TTLCache
 
 
 class IaCProvider(str, Enum):
@@ -50,6 +53,7 @@ class IaCValidationResult:
     compliance_violations: List[str]
     cost_estimate: float
     deployment_time: str
+    incomplete: bool = False  # a tool failed or timed out; the result is not cached
 
 
 class IaCGenerator:
@@ -71,6 +75,26 @@ class IaCGenerator:
             "trivy": self._run_trivy_scan
         }
         
+        self.scanner_timeouts = {
+            "checkov": getattr(settings, "iac_checkov_timeout_seconds", 180.0),
+            "tfsec": getattr(settings, "iac_tfsec_timeout_seconds", 120.0),
+            "trivy": getattr(settings, "iac_trivy_timeout_seconds", 120.0)
+        }
+        self.terraform_timeout = getattr(settings, "iac_terraform_timeout_seconds", 300.0)
+        
+        # Providers are downloaded once into a shared plugin cache instead of per validation;
+        # terraform does not guarantee concurrent writes to it are safe, so inits are serialized
+        plugin_cache_dir = getattr(settings, "iac_plugin_cache_dir", "data/terraform-plugin-cache")
+        self.plugin_cache_dir = os.path.abspath(plugin_cache_dir) if plugin_cache_dir else None
+        self._terraform_init_lock = asyncio.Lock()
+        
+        # Validation results keyed by a hash of the generated files and the validation level
+        self.validation_cache_ttl = getattr(settings, "iac_validation_cache_ttl_seconds", 3600.0)
+        self._validation_cache = TTLCache(
+            max_size=getattr(settings, "iac_validation_cache_size", 256),
+            ttl_sec=self.validation_cache_ttl
+        )
+        
         # Cost estimation models
         self.cost_estimators = {
             "aws": self._estimate_aws_cost,
@@ -431,13 +455,22 @@ export const databaseEndpoint = dbInstance.endpoint;
         compliance_violations = []
         
         try:
+            files = {
+                filename: content for filename, content in iac_code.items()
+                if filename.endswith('.tf') or filename.endswith('.ts')
+            }
+            cache_key = self._validation_cache_key(files, provider, validation_level)
+            if self.validation_cache_ttl > 0:
+                cached = self._validation_cache.get(cache_key)
+                if cached is not None:
+                    return copy.deepcopy(cached)
+            
             # Create temporary directory for validation
             with tempfile.TemporaryDirectory() as temp_dir:
                 # Write IaC files
-                for filename, content in iac_code.items():
-                    if filename.endswith('.tf') or filename.endswith('.ts'):
-                        filepath = Path(temp_dir) / filename
-                        filepath.write_text(content)
+                for filename, content in files.items():
+                    filepath = Path(temp_dir) / filename
+                    filepath.write_text(content)
                 
                 # Run provider-specific validation
                 if provider == IaCProvider.TERRAFORM:
@@ -455,6 +488,8 @@ export const databaseEndpoint = dbInstance.endpoint;
                         deployment_time="5 minutes"
                     )
                 
+                if self.validation_cache_ttl > 0 and not validation_result.incomplete:
+                    self._validation_cache.set(cache_key, copy.deepcopy(validation_result))
                 return validation_result
                 
         except Exception as e:
@@ -469,6 +504,29 @@ export const databaseEndpoint = dbInstance.endpoint;
                 deployment_time="Unknown"
             )
     
+    @staticmethod
+    def _validation_cache_key(
+        files: Dict[str, str],
+        provider: IaCProvider,
+        validation_level: IaCValidationLevel
+    ) -> str:
+        """Content hash of the file set, provider and validation level"""
+        digest = hashlib.sha256(f"{provider.value}\0{validation_level.value}".encode())
+        for filename in sorted(files):
+            content = files[filename].encode()
+            digest.update(f"\0{filename}\0{len(content)}\0".encode())
+            digest.update(content)
+        return digest.hexdigest()
+    
+    def _terraform_env(self) -> Dict[str, str]:
+        env = {"TF_IN_AUTOMATION": "1"}
+        if self.plugin_cache_dir:
+            os.makedirs(self.plugin_cache_dir, exist_ok=True)
+            env["TF_PLUGIN_CACHE_DIR"] = self.plugin_cache_dir
+            # validation directories have no lock file, which otherwise bypasses the cache
+            env["TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE"] = "true"
+        return env
+    
     async def _validate_terraform(self, temp_dir: str, validation_level: IaCValidationLevel) -> IaCValidationResult:
         """Validate Terraform configuration"""
         
@@ -476,37 +534,47 @@ export const databaseEndpoint = dbInstance.endpoint;
         warnings = []
         security_issues = []
         compliance_violations = []
+        incomplete = False
         
         try:
-            # Initialize Terraform
-            result = subprocess.run(
-                ["terraform", "init"],
-                cwd=temp_dir,
-                capture_output=True,
-                text=True
-            )
+            env = self._terraform_env()
+            
+            # Initialize Terraform (providers only; no backend is configured for validation)
+            async with self._terraform_init_lock:
+                result = await run_command(
+                    ["terraform", "init", "-backend=false", "-input=false", "-no-color"],
+                    cwd=temp_dir,
+                    timeout=self.terraform_timeout,
+                    env=env
+                )
             
             if result.returncode != 0:
+                # init fails on registry or network trouble, not just bad code, so don't cache it
+                incomplete = True
                 errors.append(f"Terraform init failed: {result.stderr}")
             
             # Validate Terraform syntax
-            result = subprocess.run(
-                ["terraform", "validate"],
+            result = await run_command(
+                ["terraform", "validate", "-no-color"],
                 cwd=temp_dir,
-                capture_output=True,
-                text=True
+                timeout=self.terraform_timeout,
+                env=env
             )
             
             if result.returncode != 0:
+                incomplete = incomplete or result.timed_out
                 errors.append(f"Terraform validation failed: {result.stderr}")
             
             # Run security scanning
             if validation_level in [IaCValidationLevel.STANDARD, IaCValidationLevel.STRICT]:
-                security_result = await self._run_checkov_scan(temp_dir)
-                security_issues.extend(security_result.get('issues', []))
-                
-                tfsec_result = await self._run_tfsec_scan(temp_dir)
-                security_issues.extend(tfsec_result.get('issues', []))
+                for scan_result in await self._run_security_scans(temp_dir):
+                    security_issues.extend(scan_result.get('issues', []))
+                    if scan_result.get('skipped'):
+                        # a missing scanner stays missing, so the result is still worth caching
+                        warnings.append(f"{scan_result['scanner']} scan skipped: {scan_result['skipped']}")
+                    elif scan_result.get('error'):
+                        incomplete = True
+                        warnings.append(f"{scan_result['scanner']} scan failed: {scan_result['error']}")
             
             # Run compliance checks
             if validation_level == IaCValidationLevel.STRICT:
@@ -520,7 +588,8 @@ export const databaseEndpoint = dbInstance.endpoint;
                 security_issues=security_issues,
                 compliance_violations=compliance_violations,
                 cost_estimate=await self._estimate_terraform_cost(temp_dir),
-                deployment_time="10-15 minutes"
+                deployment_time="10-15 minutes",
+                incomplete=incomplete
             )
             
         except Exception as e:
@@ -532,74 +601,69 @@ export const databaseEndpoint = dbInstance.endpoint;
                 security_issues=[],
                 compliance_violations=[],
                 cost_estimate=0.0,
-                deployment_time="Unknown"
+                deployment_time="Unknown",
+                incomplete=True
             )
     
-    async def _run_checkov_scan(self, directory: str) -> Dict[str, Any]:
-        """Run Checkov security scan"""
+    async def _run_security_scans(self, directory: str) -> List[Dict[str, Any]]:
+        """Run all security scanners concurrently, each under its own timeout"""
+        return await asyncio.gather(*[scan(directory) for scan in self.security_scanners.values()])
+    
+    async def _run_scanner(self, scanner: str, args: List[str], parse) -> Dict[str, Any]:
+        """Run a scanner CLI with JSON output; ``parse`` maps the report to (issues, passed checks).
+
+        A scanner that is not installed is reported as skipped rather than failed.
+        """
         try:
-            result = subprocess.run(
-                ["checkov", "-d", directory, "--output", "json"],
-                capture_output=True,
-                text=True
-            )
+            result = await run_command(args, timeout=self.scanner_timeouts.get(scanner))
+            if result.timed_out:
+                return {"scanner": scanner, "issues": [], "error": result.stderr, "timed_out": True}
             
-            if result.returncode == 0:
+            # Scanners exit non-zero when they find issues, so the report decides, not the exit code
+            try:
                 scan_results = json.loads(result.stdout)
-                return {
-                    "scanner": "checkov",
-                    "issues": scan_results.get('results', {}).get('failed_checks', []),
-                    "passed_checks": scan_results.get('results', {}).get('passed_checks', [])
-                }
-            else:
-                return {"scanner": "checkov", "issues": [], "error": result.stderr}
+            except ValueError:
+                return {"scanner": scanner, "issues": [], "error": result.stderr}
+            
+            issues, passed_checks = parse(scan_results)
+            return {
+                "scanner": scanner,
+                "issues": issues,
+                "passed_checks": passed_checks,
+                "duration": result.duration
+            }
                 
+        except FileNotFoundError:
+            return {"scanner": scanner, "issues": [], "skipped": "not installed"}
         except Exception as e:
-            return {"scanner": "checkov", "issues": [], "error": str(e)}
+            return {"scanner": scanner, "issues": [], "error": str(e)}
+    
+    async def _run_checkov_scan(self, directory: str) -> Dict[str, Any]:
+        """Run Checkov security scan"""
+        return await self._run_scanner(
+            "checkov",
+            ["checkov", "-d", directory, "--output", "json"],
+            lambda report: (
+                report.get('results', {}).get('failed_checks', []),
+                report.get('results', {}).get('passed_checks', [])
+            )
+        )
     
     async def _run_tfsec_scan(self, directory: str) -> Dict[str, Any]:
         """Run tfsec security scan"""
-        try:
-            result = subprocess.run(
-                ["tfsec", directory, "--format", "json"],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                scan_results = json.loads(result.stdout)
-                return {
-                    "scanner": "tfsec",
-                    "issues": scan_results.get('results', []),
-                    "passed_checks": []
-                }
-            else:
-                return {"scanner": "tfsec", "issues": [], "error": result.stderr}
-                
-        except Exception as e:
-            return {"scanner": "tfsec", "issues": [], "error": str(e)}
+        return await self._run_scanner(
+            "tfsec",
+            ["tfsec", directory, "--format", "json"],
+            lambda report: (report.get('results') or [], [])
+        )
     
     async def _run_trivy_scan(self, directory: str) -> Dict[str, Any]:
         """Run Trivy security scan"""
-        try:
-            result = subprocess.run(
-                ["trivy", "config", directory, "--format", "json"],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                scan_results = json.loads(result.stdout)
-                return {
-                    "scanner": "trivy",
-                    "issues": scan_results.get('results', []),
-                    "passed_checks": []
-                }
-            else:
-                return {"scanner": "trivy", "issues": [], "error": result.stderr}
-                
-        except Exception as e:
-            return {"scanner": "trivy", "issues": [], "error": str(e)}
+        return await self._run_scanner(
+            "trivy",
+            ["trivy", "config", directory, "--format", "json"],
+            lambda report: (report.get('results', []), [])
+        )
     
     async def _estimate_costs(self, iac_code: Dict[str, str], requirements: Dict[str, Any]) -> Dict[str, Any]:
         """Estimate infrastructure costs"""
@@ -4,12 +4,13 @@ Contains logging, metrics, and other utility functions
 """
 
 from .logging import setup_logging, get_logger, AgentLogger
-from .metrics import AgentMetrics, SystemMetrics
+from .metrics import AgentMetrics, SystemMetrics, LatencyHistogram
 
 __all__ = [
     "setup_logging",
     "get_logger", 
     "AgentLogger",
     "AgentMetrics",
-    "SystemMetrics"
+    "SystemMetrics",
+    "LatencyHistogram"
 ]
@@ -0,0 +1,81 @@
+"""
+Async subprocess runner.
+Runs external tools (terraform, scanners) without blocking the event loop,
+with a timeout that kills the process instead of leaving it running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill the process group, so children holding the output pipes die too"""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+@dataclass
+class CommandResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+
+
+async def run_command(
+    args: Sequence[str],
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> CommandResult:
+    """Run ``args`` and capture its output.
+
+    ``env`` entries are added to the current environment. On timeout the
+    process and any children it spawned are killed and the result has
+    ``timed_out`` set and returncode -1.
+    A missing executable raises FileNotFoundError, like ``subprocess.run``.
+    """
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        cwd=cwd,
+        env={**os.environ, **env} if env else None,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=os.name == "posix",
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        _kill(process)
+        stdout, stderr = await process.communicate()
+        return CommandResult(
+            returncode=-1,
+            stdout=stdout.decode(errors="replace"),
+            stderr=f"{args[0]} timed out after {timeout}s",
+            duration=time.perf_counter() - started,
+            timed_out=True,
+        )
+    except asyncio.CancelledError:
+        _kill(process)
+        await process.wait()
+        raise
+    return CommandResult(
+        returncode=process.returncode,
+        stdout=stdout.decode(errors="replace"),
+        stderr=stderr.decode(errors="replace"),
+        duration=time.perf_counter() - started,
+    )
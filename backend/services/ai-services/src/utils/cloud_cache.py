@@ -0,0 +1,289 @@
+"""
+Cloud read cache and boto3 client pool.
+Read-only cloud API results (costs, inventory listings, findings) are cached
+with a TTL per API and served stale while a background refresh runs; boto3
+clients are created once per (service, region) and shared by every thread.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+    BOTO3_AVAILABLE = True
+except Exception:  # optional dependency
+    boto3 = None  # type: ignore
+    BotoConfig = None  # type: ignore
+    BOTO3_AVAILABLE = False
+
+# api -> (ttl_sec, max_stale_sec). Within the TTL entries are served as-is;
+# for max_stale_sec after it they are served stale while a refresh runs.
+DEFAULT_POLICIES: Dict[str, Tuple[float, float]] = {
+    'costs': (6 * 3600.0, 24 * 3600.0),  # Cost Explorer updates a few times a day and bills per request
+    'ec2_instances': (60.0, 900.0),
+    's3_buckets': (300.0, 3600.0),
+    'security': (300.0, 3600.0),
+    'monitoring': (60.0, 300.0),
+}
+FALLBACK_POLICY: Tuple[float, float] = (60.0, 300.0)
+
+
+def _env_policy(api: str) -> Optional[Tuple[float, float]]:
+    """CLOUD_CACHE_TTL_<API>="ttl[,max_stale]" overrides an API's policy"""
+    raw = os.getenv(f"CLOUD_CACHE_TTL_{api.upper()}")
+    if not raw:
+        return None
+    try:
+        parts = [float(p) for p in raw.split(',')]
+    except ValueError:
+        return None
+    ttl = parts[0]
+    return ttl, parts[1] if len(parts) > 1 else ttl
+
+
+class BotoClientPool:
+    """One boto3 client per (service, region), created lazily and shared by every caller.
+
+    Clients are thread-safe once built but building them is not, so creation
+    happens under a lock on a private session. Each client keeps its own
+    HTTP connection pool of ``max_pool_connections``.
+    """
+
+    def __init__(self, max_pool_connections: Optional[int] = None, max_attempts: Optional[int] = None) -> None:
+        self.max_pool_connections = max_pool_connections or int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "32"))
+        self.max_attempts = max_attempts or int(os.getenv("AWS_MAX_ATTEMPTS", "5"))
+        self._lock = threading.Lock()
+        self._session = None
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._clients_created = 0
+
+    def client(self, service: str, region: Optional[str] = None):
+        key = (service, region or None)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if not BOTO3_AVAILABLE:
+                    raise RuntimeError("boto3 not available")
+                if self._session is None:
+                    self._session = boto3.session.Session()
+                client = self._session.client(
+                    service,
+                    region_name=region or None,
+                    config=BotoConfig(
+                        max_pool_connections=self.max_pool_connections,
+                        retries={"mode": "adaptive", "max_attempts": self.max_attempts},
+                    ),
+                )
+                self._clients[key] = client
+                self._clients_created += 1
+        return client
+
+    def stats(self) -> Dict[str, int]:
+        return {"clients": len(self._clients), "clients_created": self._clients_created}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._session = None
+
+
+@dataclass
+class CachedRead:
+    value: Any
+    fetched_at: float  # epoch seconds
+    stale: bool = False
+    refreshing: bool = False
+
+    @property
+    def age_sec(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    def freshness(self) -> Dict[str, Any]:
+        return {
+            "fetched_at": datetime.fromtimestamp(self.fetched_at, tz=timezone.utc).isoformat(),
+            "age_sec": round(self.age_sec, 1),
+            "stale": self.stale,
+            "refreshing": self.refreshing,
+        }
+
+
+class CloudReadCache:
+    """Stale-while-revalidate cache for cloud read APIs.
+
+    Loads are single-flight per (api, key): concurrent misses wait for one
+    call instead of all hitting the provider. A cold or expired-past-stale
+    entry is loaded by the calling thread; a stale entry is returned at once
+    and refreshed on a background thread. Results rejected by ``cache_if``
+    (e.g. error payloads) are returned but never stored, so a failing
+    refresh keeps serving the last good value until it is too stale.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, Tuple[float, float]]] = None,
+                 refresh_workers: Optional[int] = None) -> None:
+        self.policies: Dict[str, Tuple[float, float]] = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        for api in list(self.policies):
+            override = _env_policy(api)
+            if override:
+                self.policies[api] = override
+        self._entries: Dict[Tuple[str, Hashable], Tuple[Any, float]] = {}
+        self._loading: Dict[Tuple[str, Hashable], Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(
+            max_workers=refresh_workers or int(os.getenv("CLOUD_CACHE_REFRESH_WORKERS", "4")),
+            thread_name_prefix="cloud-cache-refresh",
+        )
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def policy(self, api: str) -> Tuple[float, float]:
+        policy = self.policies.get(api)
+        if policy is None:
+            policy = _env_policy(api) or FALLBACK_POLICY
+        return policy
+
+    def read(self, api: str, loader: Callable[[], Any], key: Hashable = (),
+             cache_if: Optional[Callable[[Any], bool]] = None, force: bool = False) -> CachedRead:
+        """Cached result of ``loader()`` for (api, key); ``force`` bypasses the cache"""
+        full_key = (api, key)
+        with self._lock:
+            entry = None if force else self._entries.get(full_key)
+            if entry is not None:
+                value, fetched_at = entry
+                ttl, max_stale = self.policy(api)
+                age = time.time() - fetched_at
+                if age < ttl:
+                    self.hits += 1
+                    return CachedRead(value, fetched_at)
+                if age < ttl + max_stale:
+                    self.stale_hits += 1
+                    future, owner = self._claim(full_key)
+                    if owner:
+                        self._refresher.submit(self._load, full_key, loader, cache_if, future)
+                    return CachedRead(value, fetched_at, stale=True, refreshing=True)
+            self.misses += 1
+            future, owner = self._claim(full_key)
+        if owner:
+            self._load(full_key, loader, cache_if, future)
+        value, fetched_at = future.result()
+        return CachedRead(value, fetched_at)
+
+    def refresh(self, api: str, loader: Callable[[], Any], key: Hashable = (),
+                cache_if: Optional[Callable[[Any], bool]] = None) -> Future:
+        """Reload (api, key) in the background, e.g. to warm the cache at startup"""
+        with self._lock:
+            future, owner = self._claim((api, key))
+        if owner:
+            self._refresher.submit(self._load, (api, key), loader, cache_if, future)
+        return future
+
+    def invalidate(self, api: Optional[str] = None) -> None:
+        """Drop cached entries of ``api`` (all APIs when None); loads already running are not stored"""
+        with self._lock:
+            for full_key in [k for k in self._entries if api is None or k[0] == api]:
+                del self._entries[full_key]
+            for name in ([api] if api is not None else list(self._generations)):
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def _claim(self, full_key: Tuple[str, Hashable]) -> Tuple[Future, bool]:
+        """The in-flight load of ``full_key`` and whether the caller must run it; call with the lock held"""
+        future = self._loading.get(full_key)
+        if future is not None:
+            return future, False
+        future = Future()
+        future.generation = self._generations.get(full_key[0], 0)  # type: ignore[attr-defined]
+        self._loading[full_key] = future
+        return future, True
+
+    def _load(self, full_key: Tuple[str, Hashable], loader: Callable[[], Any],
+              cache_if: Optional[Callable[[Any], bool]], future: Future) -> None:
+        with self._lock:
+            self.refreshes += 1
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self.refresh_failures += 1
+                self._loading.pop(full_key, None)
+            future.set_exception(e)
+            return
+        fetched_at = time.time()
+        with self._lock:
+            keep = cache_if is None or cache_if(value)
+            if not keep:
+                self.refresh_failures += 1
+            elif future.generation == self._generations.get(full_key[0], 0):  # type: ignore[attr-defined]
+                self._entries[full_key] = (value, fetched_at)
+            self._loading.pop(full_key, None)
+        future.set_result((value, fetched_at))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "loading": len(self._loading),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
+
+    def shutdown(self) -> None:
+        self._refresher.shutdown(wait=False)
+
+
+_fan_out_executor: Optional[ThreadPoolExecutor] = None
+_fan_out_lock = threading.Lock()
+
+
+def fan_out(fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Tuple[Any, Any, Optional[BaseException]]]:
+    """Call ``fn(item)`` for every item in parallel; returns (item, result, error) in input order.
+
+    Runs on a shared pool (CLOUD_FANOUT_WORKERS threads) so per-region calls
+    from concurrent requests stay bounded. ``fn`` must not call fan_out itself.
+    """
+    global _fan_out_executor
+    items = list(items)
+    if len(items) <= 1:
+        results = []
+        for item in items:
+            try:
+                results.append((item, fn(item), None))
+            except Exception as e:
+                results.append((item, None, e))
+        return results
+    if _fan_out_executor is None:
+        with _fan_out_lock:
+            if _fan_out_executor is None:
+                _fan_out_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("CLOUD_FANOUT_WORKERS", "16")),
+                    thread_name_prefix="cloud-fanout",
+                )
+    futures = [(item, _fan_out_executor.submit(fn, item)) for item in items]
+    results = []
+    for item, future in futures:
+        try:
+            results.append((item, future.result(), None))
+        except Exception as e:
+            results.append((item, None, e))
+    return results
+
+
+# Global pool and cache shared by the whole process
+boto_client_pool = BotoClientPool()
+cloud_read_cache = CloudReadCache()
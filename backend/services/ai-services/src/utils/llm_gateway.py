@@ -0,0 +1,557 @@
+"""
+Process-wide LLM gateway.
+One pooled async OpenAI client shared by every caller, with global and
+per-tenant concurrency limits, retries with jittered backoff, coalescing of
+identical in-flight requests, an exact-match (and optional semantic) response
+cache, and token/latency accounting per caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextlib
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+try:
+    import httpx
+    import openai
+    OPENAI_AVAILABLE = True
+except Exception:  # optional dependency
+    httpx = None  # type: ignore
+    openai = None  # type: ignore
+    OPENAI_AVAILABLE = False
+
+from .metrics import LatencyHistogram
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Tenant of the request being served; set by the HTTP layer with llm_tenant_scope()
+_current_tenant: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_tenant", default=None)
+
+
+@contextlib.contextmanager
+def llm_tenant_scope(tenant_id: Optional[str]):
+    """Attribute LLM calls made inside the block (including tasks and threads started from it) to ``tenant_id``"""
+    token = _current_tenant.set(tenant_id)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def _retryable(error: BaseException) -> bool:
+    if not OPENAI_AVAILABLE:
+        return False
+    return isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError))
+
+
+def _retry_after(error: BaseException) -> float:
+    """Seconds the server asked us to wait (Retry-After header), 0 when absent"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _CallerStats:
+    """Counters of one caller; only mutated on the gateway loop"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.upstream_calls = 0
+        self.cache_hits = 0
+        self.semantic_hits = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.saved_tokens = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "cache_hits": self.cache_hits,
+            "semantic_hits": self.semantic_hits,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "saved_tokens": self.saved_tokens,
+            "latency_p50_ms": round(self.latency.quantile(0.5) * 1000, 1),
+            "latency_p95_ms": round(self.latency.quantile(0.95) * 1000, 1),
+        }
+
+
+class _SemanticCache:
+    """Responses keyed by the embedding of the last message.
+
+    A lookup only matches entries whose model, parameters, tenant and earlier
+    messages are identical, and whose last message embeds within
+    ``threshold`` cosine similarity; each such scope keeps its newest entries.
+    """
+
+    def __init__(self, embed: Callable[[str], Any], threshold: float,
+                 ttl_sec: float, max_entries_per_scope: int = 256) -> None:
+        import numpy as np  # only needed when the semantic cache is enabled
+
+        self._np = np
+        self._embed = embed
+        self.threshold = threshold
+        self.ttl_sec = ttl_sec
+        self.max_entries_per_scope = max_entries_per_scope
+        self._scopes: Dict[str, List[Tuple[Any, Any, float]]] = {}
+
+    def _vector(self, text: str):
+        vector = self._np.asarray(self._embed(text), dtype=self._np.float32).reshape(-1)
+        norm = float(self._np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    async def lookup(self, scope: str, text: str) -> Tuple[Any, Any]:
+        """(cached response or None, embedding of ``text`` for a later store)"""
+        vector = await asyncio.get_running_loop().run_in_executor(None, self._vector, text)
+        entries = self._scopes.get(scope)
+        if not entries:
+            return None, vector
+        now = time.monotonic()
+        entries[:] = [entry for entry in entries if entry[2] > now]
+        best, best_score = None, self.threshold
+        for cached_vector, response, _ in entries:
+            score = float(self._np.dot(cached_vector, vector))
+            if score >= best_score:
+                best, best_score = response, score
+        return best, vector
+
+    def store(self, scope: str, vector: Any, response: Any) -> None:
+        entries = self._scopes.setdefault(scope, [])
+        entries.append((vector, response, time.monotonic() + self.ttl_sec))
+        if len(entries) > self.max_entries_per_scope:
+            del entries[0]
+
+    def clear(self) -> None:
+        self._scopes.clear()
+
+
+class _Completions:
+    def __init__(self, gateway: "LLMGateway", caller: str) -> None:
+        self._gateway = gateway
+        self._caller = caller
+
+    async def create(self, *, model: str, messages: List[Dict[str, Any]], stream: bool = False, **params: Any):
+        if stream:
+            return self._gateway.stream_chat_completion(messages, model=model, caller=self._caller, **params)
+        return await self._gateway.chat_completion(messages, model=model, caller=self._caller, **params)
+
+
+class _Chat:
+    def __init__(self, completions: _Completions) -> None:
+        self.completions = completions
+
+
+class GatewayClient:
+    """OpenAI-compatible facade (``await client.chat.completions.create(...)``) bound to one caller name"""
+
+    def __init__(self, gateway: "LLMGateway", caller: str) -> None:
+        self.caller = caller
+        self.chat = _Chat(_Completions(gateway, caller))
+
+
+class LLMGateway:
+    """Shared async chat-completion client.
+
+    Requests run on a private event loop thread that owns the HTTP connection
+    pool, the semaphores and the in-flight table, so callers on any thread or
+    event loop share the same limits and connections. Tenant slots are taken
+    before global ones, so one tenant's backlog never holds global capacity
+    while it waits.
+
+    Identical requests (same tenant, model, messages and parameters) that
+    overlap are sent upstream once. Responses are cached only for requests at
+    or below ``cache_max_temperature``; streamed requests are neither cached
+    nor coalesced.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        tenant_max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_base_delay: Optional[float] = None,
+        retry_max_delay: Optional[float] = None,
+        request_timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl_sec: Optional[float] = None,
+        cache_max_temperature: Optional[float] = None,
+        semantic_cache: Optional[bool] = None,
+        semantic_threshold: Optional[float] = None,
+        embedder: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+        self.tenant_max_concurrency = tenant_max_concurrency or int(os.getenv("LLM_TENANT_MAX_CONCURRENCY", "8"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.retry_base_delay = retry_base_delay if retry_base_delay is not None else float(
+            os.getenv("LLM_RETRY_BASE_DELAY_SEC", "0.5"))
+        self.retry_max_delay = retry_max_delay if retry_max_delay is not None else float(
+            os.getenv("LLM_RETRY_MAX_DELAY_SEC", "8"))
+        self.request_timeout = request_timeout or float(os.getenv("LLM_REQUEST_TIMEOUT_SEC", "60"))
+        self.max_connections = max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", "64"))
+        self.cache_max_temperature = cache_max_temperature if cache_max_temperature is not None else float(
+            os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.5"))
+        self.cache_ttl_sec = cache_ttl_sec if cache_ttl_sec is not None else float(
+            os.getenv("LLM_CACHE_TTL_SEC", "600"))
+        cache_size = cache_size if cache_size is not None else int(os.getenv("LLM_CACHE_SIZE", "2048"))
+        self._cache = TTLCache(max_size=cache_size, ttl_sec=self.cache_ttl_sec) if cache_size > 0 else None
+
+        if semantic_cache is None:
+            semantic_cache = os.getenv("LLM_SEMANTIC_CACHE", "false").lower() == "true"
+        self.semantic_threshold = semantic_threshold or float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        self._embedder = embedder
+        self._semantic: Optional[_SemanticCache] = None
+        self._semantic_requested = semantic_cache
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client = None
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._tenant_slots: Dict[str, List[Any]] = {}  # tenant -> [semaphore, holders + waiters]
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, _CallerStats] = {}
+
+    @property
+    def available(self) -> bool:
+        return OPENAI_AVAILABLE and bool(self.api_key)
+
+    def client(self, caller: str) -> Optional[GatewayClient]:
+        """OpenAI-compatible client for ``caller``, or None when no LLM is configured"""
+        return GatewayClient(self, caller) if self.available else None
+
+    # --- Gateway loop -------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _serve() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_serve, name="llm-gateway", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro) -> "asyncio.Future":
+        """Schedule ``coro`` on the gateway loop; returns a concurrent future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _get_client(self):
+        # Created on the gateway loop so the connection pool is bound to it
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.request_timeout, connect=min(10.0, self.request_timeout)),
+            )
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,  # retries are done here, with jitter and shared accounting
+                http_client=http_client,
+            )
+            self._global_slots = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def _get_semantic_cache(self) -> Optional[_SemanticCache]:
+        if self._semantic is None and self._semantic_requested:
+            self._semantic_requested = False  # only try once
+            embed = self._embedder
+            if embed is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    model = SentenceTransformer(os.getenv("LLM_SEMANTIC_CACHE_MODEL", "all-MiniLM-L6-v2"))
+                    embed = model.encode
+                except Exception as e:
+                    logger.warning(f"Semantic LLM cache disabled: {e}")
+                    return None
+            try:
+                self._semantic = _SemanticCache(embed, self.semantic_threshold, self.cache_ttl_sec)
+            except ImportError as e:
+                logger.warning(f"Semantic LLM cache disabled: {e}")
+        return self._semantic
+
+    def _caller_stats(self, caller: str) -> _CallerStats:
+        stats = self._stats.get(caller)
+        if stats is None:
+            stats = self._stats[caller] = _CallerStats()
+        return stats
+
+    @contextlib.asynccontextmanager
+    async def _slots(self, tenant: str):
+        slot = self._tenant_slots.get(tenant)
+        if slot is None:
+            slot = self._tenant_slots[tenant] = [asyncio.Semaphore(self.tenant_max_concurrency), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                async with self._global_slots:
+                    yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                self._tenant_slots.pop(tenant, None)
+
+    async def _with_retries(self, stats: _CallerStats, call: Callable[[], Any]):
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    raise
+                # full jitter: spread retries of concurrent callers instead of retrying in lockstep
+                delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+                delay = max(delay, min(_retry_after(e), self.retry_max_delay))
+                attempt += 1
+                stats.retries += 1
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _request_key(tenant: str, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        payload = json.dumps([tenant, model, messages, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _cacheable(self, params: Dict[str, Any]) -> bool:
+        if params.get("n", 1) != 1:
+            return False
+        temperature = params.get("temperature")
+        return float(1.0 if temperature is None else temperature) <= self.cache_max_temperature
+
+    async def _complete(self, caller: str, tenant: str, model: str,
+                        messages: List[Dict[str, Any]], params: Dict[str, Any]):
+        stats = self._caller_stats(caller)
+        stats.requests += 1
+        started = time.perf_counter()
+        try:
+            key = self._request_key(tenant, model, messages, params)
+            cacheable = self._cacheable(params)
+            if cacheable and self._cache is not None:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    stats.cache_hits += 1
+                    stats.saved_tokens += _total_tokens(cached)
+                    return cached
+
+            fetch = self._in_flight.get(key)
+            if fetch is not None:
+                stats.coalesced += 1
+                response = await asyncio.shield(fetch)
+                stats.saved_tokens += _total_tokens(response)
+                return response
+
+            fetch = asyncio.ensure_future(self._fetch(stats, key, cacheable, tenant, model, messages, params))
+            self._in_flight[key] = fetch
+
+            def _finished(done: asyncio.Future) -> None:
+                self._in_flight.pop(key, None)
+                if not done.cancelled():
+                    done.exception()  # retrieved here so a fetch nobody awaits anymore does not log
+
+            fetch.add_done_callback(_finished)
+            # shielded: a caller going away does not abort the request the others are waiting on
+            return await asyncio.shield(fetch)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latency.observe(time.perf_counter() - started)
+
+    async def _fetch(self, stats: _CallerStats, key: str, cacheable: bool, tenant: str,
+                     model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]):
+        semantic = self._get_semantic_cache() if cacheable else None
+        vector = scope = None
+        if semantic is not None and messages and isinstance(messages[-1].get("content"), str):
+            scope = self._request_key(tenant, model, messages[:-1], params)
+            cached, vector = await semantic.lookup(scope, messages[-1]["content"])
+            if cached is not None:
+                stats.semantic_hits += 1
+                stats.saved_tokens += _total_tokens(cached)
+                return cached
+
+        client = self._get_client()
+        async with self._slots(tenant):
+            response = await self._with_retries(
+                stats, lambda: client.chat.completions.create(model=model, messages=messages, **params)
+            )
+        stats.upstream_calls += 1
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            stats.prompt_tokens += usage.prompt_tokens or 0
+            stats.completion_tokens += usage.completion_tokens or 0
+
+        if cacheable and self._cache is not None:
+            self._cache.set(key, response)
+        if vector is not None:
+            semantic.store(scope, vector, response)
+        return response
+
+    async def _stream(self, caller: str, tenant: str, model: str, messages: List[Dict[str, Any]],
+                      params: Dict[str, Any], emit: Callable[[str, Any], None]) -> None:
+        stats = self._caller_stats(caller)
+        stats.requests += 1
+        started = time.perf_counter()
+        client = self._get_client()
+        try:
+            async with self._slots(tenant):
+                # retries only cover opening the stream; once tokens flowed a failure is final
+                stream = await self._with_retries(
+                    stats, lambda: client.chat.completions.create(model=model, messages=messages, stream=True, **params)
+                )
+                stats.upstream_calls += 1
+                try:
+                    async for chunk in stream:
+                        usage = getattr(chunk, "usage", None)
+                        if usage is not None:
+                            stats.prompt_tokens += usage.prompt_tokens or 0
+                            stats.completion_tokens += usage.completion_tokens or 0
+                        elif chunk.choices and chunk.choices[0].delta.content:
+                            stats.completion_tokens += 1  # one content delta is one token
+                        if chunk.choices:
+                            emit("chunk", chunk)
+                finally:
+                    close = getattr(stream, "close", None)
+                    if close is not None:
+                        await close()
+                    else:
+                        await stream.response.aclose()
+            emit("end", None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats.errors += 1
+            emit("error", e)
+        finally:
+            stats.latency.observe(time.perf_counter() - started)
+
+    # --- Public API ---------------------------------------------------------
+
+    async def chat_completion(self, messages: List[Dict[str, Any]], model: str = "gpt-3.5-turbo",
+                              caller: str = "default", tenant_id: Optional[str] = None, **params: Any):
+        """Chat completion from any event loop; returns the OpenAI response object"""
+        if not self.available:
+            raise RuntimeError("LLM gateway is not configured (openai not installed or OPENAI_API_KEY unset)")
+        tenant = tenant_id or _current_tenant.get() or "default"
+        return await asyncio.wrap_future(self._submit(self._complete(caller, tenant, model, messages, params)))
+
+    def chat_completion_sync(self, messages: List[Dict[str, Any]], model: str = "gpt-3.5-turbo",
+                             caller: str = "default", tenant_id: Optional[str] = None, **params: Any):
+        """Blocking chat completion for synchronous code; must not be called from the gateway loop"""
+        if not self.available:
+            raise RuntimeError("LLM gateway is not configured (openai not installed or OPENAI_API_KEY unset)")
+        tenant = tenant_id or _current_tenant.get() or "default"
+        future = self._submit(self._complete(caller, tenant, model, messages, params))
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def stream_chat_completion(self, messages: List[Dict[str, Any]], model: str = "gpt-3.5-turbo",
+                                     caller: str = "default", tenant_id: Optional[str] = None,
+                                     **params: Any) -> AsyncIterator[Any]:
+        """Streamed chat completion; yields the OpenAI chunk objects as they arrive"""
+        if not self.available:
+            raise RuntimeError("LLM gateway is not configured (openai not installed or OPENAI_API_KEY unset)")
+        tenant = tenant_id or _current_tenant.get() or "default"
+        caller_loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def emit(kind: str, value: Any) -> None:
+            caller_loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+
+        producer = self._submit(self._stream(caller, tenant, model, messages, params, emit))
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "chunk":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            producer.cancel()  # closes the upstream stream when the consumer stops early
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-caller accounting plus cache and concurrency state"""
+        return {
+            "available": self.available,
+            "max_concurrency": self.max_concurrency,
+            "tenant_max_concurrency": self.tenant_max_concurrency,
+            "active_tenants": len(self._tenant_slots),
+            "in_flight": len(self._in_flight),
+            "cache": self._cache.stats() if self._cache is not None else None,
+            "semantic_cache": self._semantic is not None,
+            "callers": {caller: stats.snapshot() for caller, stats in list(self._stats.items())},
+        }
+
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+        if self._semantic is not None:
+            self._semantic.clear()
+
+    def close(self) -> None:
+        """Close the connection pool and stop the gateway loop. Safe to call more than once."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None or loop.is_closed():
+            return
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+            except Exception:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        loop.close()
+
+
+def _total_tokens(response: Any) -> int:
+    usage = getattr(response, "usage", None)
+    return (getattr(usage, "total_tokens", 0) or 0) if usage is not None else 0
+
+
+# Global gateway shared by the whole process
+llm_gateway = LLMGateway()
+atexit.register(llm_gateway.close)
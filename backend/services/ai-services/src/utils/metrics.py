@@ -234,6 +234,75 @@ class AgentMetrics:
         }
 
 
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (Prometheus-style cumulative buckets)"""
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets: Optional[tuple] = None):
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one observation in seconds"""
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                idx = i
+                break
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative bucket counts plus sum/count/mean"""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, c in zip(list(self.buckets) + ['+Inf'], counts):
+            running += c
+            cumulative[str(bound)] = running
+        return {
+            'buckets': cumulative,
+            'sum': total,
+            'count': count,
+            'mean': total / count if count else 0.0
+        }
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0..1) by interpolating within its bucket"""
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+        if not count:
+            return 0.0
+        rank = q * count
+        running = 0
+        lower = 0.0
+        for bound, c in zip(self.buckets, counts):
+            if c and running + c >= rank:
+                return lower + (bound - lower) * (rank - running) / c
+            running += c
+            lower = bound
+        return self.buckets[-1]  # in the +Inf bucket; the largest finite bound is the best estimate
+
+    def prometheus_lines(self, name: str, labels: Optional[Dict[str, str]] = None) -> List[str]:
+        """Render as Prometheus text exposition lines (without HELP/TYPE)"""
+        snap = self.snapshot()
+        base = ','.join(f'{k}="{v}"' for k, v in (labels or {}).items())
+        sep = ',' if base else ''
+        lines = [f'{name}_bucket{{{base}{sep}le="{le}"}} {c}' for le, c in snap['buckets'].items()]
+        lines.append(f'{name}_sum{{{base}}} {snap["sum"]}')
+        lines.append(f'{name}_count{{{base}}} {snap["count"]}')
+        return lines
+
+
 class SystemMetrics:
     """System-wide metrics for all agents"""
     
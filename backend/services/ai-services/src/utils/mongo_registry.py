@@ -0,0 +1,179 @@
+"""
+Process-wide MongoDB client registry.
+One pooled MongoClient per URI, created lazily and shared by every caller.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    from pymongo import MongoClient
+    from pymongo import monitoring
+    PYMONGO_AVAILABLE = True
+except Exception:  # optional dependency
+    MongoClient = None  # type: ignore
+    monitoring = None  # type: ignore
+    PYMONGO_AVAILABLE = False
+
+
+class _PoolEventCounter(monitoring.ConnectionPoolListener if PYMONGO_AVAILABLE else object):  # type: ignore[misc]
+    """Counts driver pool events so connection churn can be observed."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "pools_cleared": 0,
+        }
+
+    def _inc(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    # pymongo.monitoring.ConnectionPoolListener interface
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        self._inc("pools_cleared")
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        self._inc("connections_created")
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self._inc("connections_closed")
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        self._inc("checkout_failures")
+
+    def connection_checked_out(self, event) -> None:
+        self._inc("checkouts")
+
+    def connection_checked_in(self, event) -> None:
+        pass
+
+
+class MongoClientRegistry:
+    """Lazily creates and caches one MongoClient per connection URI.
+
+    Pool sizing comes from the MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE,
+    MONGODB_MAX_IDLE_TIME_MS and MONGODB_SERVER_SELECTION_TIMEOUT_MS
+    environment variables unless overridden in the constructor.
+    """
+
+    def __init__(
+        self,
+        max_pool_size: Optional[int] = None,
+        min_pool_size: Optional[int] = None,
+        max_idle_time_ms: Optional[int] = None,
+        server_selection_timeout_ms: Optional[int] = None,
+    ) -> None:
+        self.max_pool_size = max_pool_size or int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+        self.min_pool_size = min_pool_size if min_pool_size is not None else int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+        self.max_idle_time_ms = max_idle_time_ms or int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+        self.server_selection_timeout_ms = server_selection_timeout_ms or int(
+            os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")
+        )
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Any] = {}
+        self._pool_events = _PoolEventCounter()
+        self._clients_created = 0
+        self._lookups = 0
+        self._last_health: Dict[str, Dict[str, Any]] = {}
+
+    def get_client(self, mongo_uri: Optional[str] = None):
+        """Return the shared client for ``mongo_uri`` (defaults to MONGODB_URI)."""
+        mongo_uri = mongo_uri or os.getenv("MONGODB_URI")
+        if not mongo_uri or not PYMONGO_AVAILABLE:
+            return None
+        client = self._clients.get(mongo_uri)
+        if client is not None:
+            self._lookups += 1
+            return client
+        with self._lock:
+            client = self._clients.get(mongo_uri)
+            if client is None:
+                client = MongoClient(
+                    mongo_uri,
+                    maxPoolSize=self.max_pool_size,
+                    minPoolSize=self.min_pool_size,
+                    maxIdleTimeMS=self.max_idle_time_ms,
+                    serverSelectionTimeoutMS=self.server_selection_timeout_ms,
+                    event_listeners=[self._pool_events],
+                )
+                self._clients[mongo_uri] = client
+                self._clients_created += 1
+            self._lookups += 1
+            return client
+
+    def get_collection(self, name: str, database: Optional[str] = None, mongo_uri: Optional[str] = None):
+        """Return ``database[name]`` on the shared client, or None if Mongo is not configured."""
+        client = self.get_client(mongo_uri)
+        if client is None:
+            return None
+        return client[database or os.getenv("MONGODB_DB", "inframind")][name]
+
+    def health_check(self, mongo_uri: Optional[str] = None) -> Dict[str, Any]:
+        """Ping the server behind ``mongo_uri`` and record the result."""
+        mongo_uri = mongo_uri or os.getenv("MONGODB_URI")
+        client = self.get_client(mongo_uri)
+        if client is None:
+            return {"ok": False, "error": "mongodb_not_configured"}
+        started = time.perf_counter()
+        try:
+            client.admin.command("ping")
+            result = {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        result["checked_at"] = time.time()
+        self._last_health[mongo_uri] = result
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Connection churn counters; connections_created should plateau once pools are warm."""
+        return {
+            "clients_open": len(self._clients),
+            "clients_created": self._clients_created,
+            "client_lookups": self._lookups,
+            **self._pool_events.snapshot(),
+        }
+
+    def close_all(self) -> None:
+        """Close every pooled client. Safe to call more than once."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+# Global registry shared by the whole process
+mongo_registry = MongoClientRegistry()
+atexit.register(mongo_registry.close_all)
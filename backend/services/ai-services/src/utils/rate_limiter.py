@@ -0,0 +1,160 @@
+"""
+Rate limiting primitives shared by the HTTP services and background jobs.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    ``rate`` tokens are added per second up to ``capacity``; every check is
+    O(1) and the bucket holds no per-request state.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available; never blocks."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``tokens`` are available (or ``timeout`` seconds pass)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate if self.rate > 0 else 1.0
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class SlidingWindowRateLimiter:
+    """Keyed sliding-window limiter with O(1) checks and bounded memory.
+
+    Each key keeps two fixed-window counters (current and previous); the
+    sliding count is the current count plus the previous one weighted by how
+    much of it still overlaps the window. Keys are kept in LRU order and idle
+    keys are evicted as new ones arrive, so memory is capped at ``max_keys``.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._state: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, limit: int, window_sec: float) -> bool:
+        now = time.time()
+        idx = int(now // window_sec)
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                # [window index, current count, previous count, window length, last seen]
+                state = [idx, 0, 0, window_sec, now]
+                self._state[key] = state
+            else:
+                self._state.move_to_end(key)
+                if idx != state[0]:
+                    state[2] = state[1] if idx == state[0] + 1 else 0
+                    state[1] = 0
+                    state[0] = idx
+            overlap = 1.0 - (now - idx * window_sec) / window_sec
+            allowed = state[1] + state[2] * overlap < limit
+            if allowed:
+                state[1] += 1
+            state[4] = now
+            self._evict(now)
+            return allowed
+
+    def _evict(self, now: float) -> None:
+        while len(self._state) > self.max_keys:
+            self._state.popitem(last=False)
+        # drop a few idle keys per call; LRU order means the oldest are at the front
+        for _ in range(2):
+            if not self._state:
+                break
+            _, state = next(iter(self._state.items()))
+            if now - state[4] < 2 * state[3]:
+                break
+            self._state.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+class RedisSlidingWindowRateLimiter:
+    """Same algorithm as SlidingWindowRateLimiter, with counters in Redis so replicas share limits.
+
+    Falls back to a local limiter whenever Redis is unreachable.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit", fallback: Optional[SlidingWindowRateLimiter] = None) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.fallback = fallback or SlidingWindowRateLimiter()
+
+    def allow(self, key: str, limit: int, window_sec: float) -> bool:
+        now = time.time()
+        idx = int(now // window_sec)
+        cur_key = f"{self.prefix}:{key}:{idx}"
+        prev_key = f"{self.prefix}:{key}:{idx - 1}"
+        try:
+            pipe = self.client.pipeline()
+            pipe.incr(cur_key)
+            pipe.expire(cur_key, int(window_sec * 2) + 1)
+            pipe.get(prev_key)
+            current, _, previous = pipe.execute()
+            overlap = 1.0 - (now - idx * window_sec) / window_sec
+            if (int(current) - 1) + int(previous or 0) * overlap < limit:
+                return True
+            self.client.decr(cur_key)
+            return False
+        except Exception:
+            return self.fallback.allow(key, limit, window_sec)
+
+
+def build_rate_limiter(backend: Optional[str] = None, redis_url: Optional[str] = None):
+    """Create the limiter selected by RATE_LIMIT_BACKEND (``memory`` or ``redis``)."""
+    backend = (backend or os.getenv("RATE_LIMIT_BACKEND", "memory")).lower()
+    max_keys = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    if backend == "redis":
+        redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        try:
+            import redis
+            return RedisSlidingWindowRateLimiter(
+                redis.Redis.from_url(redis_url, socket_timeout=0.5),
+                fallback=SlidingWindowRateLimiter(max_keys=max_keys),
+            )
+        except Exception:
+            pass
+    return SlidingWindowRateLimiter(max_keys=max_keys)
@@ -0,0 +1,146 @@
+"""
+Bounded, thread-safe TTL caches.
+Used for idempotency keys and for memoizing expensive lookups.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after a TTL.
+
+    Expiry times are kept in a min-heap, so purging expired entries only
+    touches entries that are actually due; when the cache is full the least
+    recently used entry is evicted. All operations take a single lock.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_sec: float = 300.0) -> None:
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._expiry_heap: list = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _purge(self, now: float) -> None:
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            # heap entries are lazily invalidated when a key is overwritten
+            if entry is not None and entry[1] == expires_at:
+                del self._data[key]
+                self.expirations += 1
+        if len(heap) > 2 * len(self._data) + 64:
+            self._expiry_heap = [(exp, k) for k, (_, exp) in self._data.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def _store(self, key: Hashable, value: Any, ttl_sec: Optional[float], now: float) -> None:
+        expires_at = now + (self.ttl_sec if ttl_sec is None else ttl_sec)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl_sec: Optional[float] = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            self._store(key, value, ttl_sec, now)
+
+    def add(self, key: Hashable, value: Any = True, ttl_sec: Optional[float] = None) -> bool:
+        """Store ``key`` only if it is absent (or expired). Returns True if it was stored."""
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            if key in self._data:
+                return False
+            self._store(key, value, ttl_sec, now)
+            return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._expiry_heap = []
+
+    def __contains__(self, key: Hashable) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class RedisIdempotencyStore:
+    """Idempotency keys in Redis (SET NX EX) so every replica sees the same keys.
+
+    Falls back to a local TTLCache whenever Redis is unreachable.
+    """
+
+    def __init__(self, client, prefix: str = "idem", fallback: Optional[TTLCache] = None) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.fallback = fallback or TTLCache()
+
+    def add(self, key: str, value: Any = True, ttl_sec: Optional[float] = None) -> bool:
+        ttl = int(ttl_sec if ttl_sec is not None else self.fallback.ttl_sec)
+        try:
+            return bool(self.client.set(f"{self.prefix}:{key}", 1, nx=True, ex=max(1, ttl)))
+        except Exception:
+            return self.fallback.add(key, value, ttl_sec)
+
+
+def build_idempotency_store(backend: Optional[str] = None, redis_url: Optional[str] = None):
+    """Create the store selected by IDEMPOTENCY_BACKEND (``memory`` or ``redis``)."""
+    backend = (backend or os.getenv("IDEMPOTENCY_BACKEND", "memory")).lower()
+    local = TTLCache(max_size=int(os.getenv("IDEMPOTENCY_MAX_KEYS", "100000")), ttl_sec=300.0)
+    if backend == "redis":
+        redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        try:
+            import redis
+            return RedisIdempotencyStore(redis.Redis.from_url(redis_url, socket_timeout=0.5), fallback=local)
+        except Exception:
+            pass
+    return local